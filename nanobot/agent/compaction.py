@@ -0,0 +1,151 @@
+"""In-turn compaction of tool results in the agent transcript."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+from nanobot.utils.helpers import estimate_message_tokens, estimate_tokens
+
+if TYPE_CHECKING:
+    from nanobot.agent.tools.output import ToolOutputManager
+    from nanobot.config.schema import CompactionConfig
+
+COMPACTED_PREFIX = "[Compacted "
+
+_SUMMARY_PROMPT = (
+    "Summarize this tool output for an agent that is still working on its task. "
+    "Keep facts, numbers, names, paths, URLs, errors and anything the agent may need later. "
+    "Be brief; no preamble."
+)
+
+
+@dataclass
+class CompactionStats:
+    """What compaction saved during one turn."""
+
+    compacted: int = 0
+    tokens_saved: int = 0
+
+
+class TranscriptCompactor:
+    """
+    Shrinks older tool results once the current turn's transcript grows past a budget.
+
+    The most recent tool results stay intact; older ones are replaced by a
+    summary from a cheap model, or by a head excerpt when no model is set.
+    Compaction happens in batches so the rewritten prefix stays stable (and
+    cacheable by the provider) until the budget is exceeded again.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = 24000,
+        keep_recent: int = 4,
+        summary_chars: int = 600,
+        provider: LLMProvider | None = None,
+        model: str | None = None,
+        store: "ToolOutputManager | None" = None,
+    ):
+        self.budget_tokens = budget_tokens
+        self.keep_recent = keep_recent
+        self.summary_chars = summary_chars
+        self.provider = provider
+        self.model = model
+        self.store = store
+
+    async def maybe_compact(
+        self,
+        messages: list[dict[str, Any]],
+        start: int = 0,
+        stats: CompactionStats | None = None,
+    ) -> int:
+        """
+        Compact tool results in messages[start:] if they exceed the budget.
+
+        Args:
+            messages: Transcript, modified in place.
+            start: Index of the first message of the current turn.
+            stats: The turn's running totals, updated in place.
+
+        Returns:
+            Estimated tokens saved by this call.
+        """
+        if estimate_message_tokens(messages[start:]) <= self.budget_tokens:
+            return 0
+
+        tool_msgs = [m for m in messages[start:] if m.get("role") == "tool"]
+        candidates = [
+            m for m in tool_msgs[:max(0, len(tool_msgs) - self.keep_recent)]
+            if isinstance(m.get("content"), str)
+            and not m["content"].startswith(COMPACTED_PREFIX)
+            and len(m["content"]) > self.summary_chars
+        ]
+        if not candidates:
+            return 0
+
+        summaries = await asyncio.gather(*(self._summarize(m) for m in candidates))
+        saved = 0
+        for m, summary in zip(candidates, summaries):
+            saved += estimate_tokens(m["content"]) - estimate_tokens(summary)
+            m["content"] = summary
+
+        if stats:
+            stats.tokens_saved += saved
+            stats.compacted += len(candidates)
+        logger.debug(f"Compacted {len(candidates)} tool results, saved ~{saved} tokens")
+        return saved
+
+    async def _summarize(self, message: dict[str, Any]) -> str:
+        content: str = message["content"]
+        name = message.get("name", "tool")
+        artifact_id = self.store.save(name, content) if self.store else None
+        where = f"; full output in artifact '{artifact_id}' (use read_artifact)" if artifact_id else ""
+
+        summary = await self._model_summary(content) if self.provider and self.model else None
+        if summary:
+            return f"{COMPACTED_PREFIX}{name} result, {len(content)} chars{where}. Summary:]\n{summary}"
+
+        head = content[:self.summary_chars]
+        return (f"{COMPACTED_PREFIX}{name} result, {len(content)} chars{where}. "
+                f"First {len(head)} chars:]\n{head}")
+
+    async def _model_summary(self, content: str) -> str | None:
+        try:
+            response = await self.provider.chat(
+                messages=[
+                    {"role": "system", "content": _SUMMARY_PROMPT},
+                    {"role": "user", "content": content[:self.budget_tokens * 4]},
+                ],
+                model=self.model,
+                max_tokens=max(64, self.summary_chars // 4),
+                temperature=0,
+            )
+        except Exception as e:
+            logger.warning(f"Tool result summary failed, using truncation: {e}")
+            return None
+        text = (response.content or "").strip()
+        # Fall back to truncation when the model errored or did not actually shorten
+        if not text or response.finish_reason == "error" or len(text) >= len(content):
+            return None
+        return text
+
+
+def make_compactor(
+    config: "CompactionConfig",
+    provider: LLMProvider,
+    store: "ToolOutputManager | None" = None,
+) -> TranscriptCompactor | None:
+    """Create the transcript compactor from config, or None if disabled."""
+    if not config.enabled:
+        return None
+    return TranscriptCompactor(
+        budget_tokens=config.budget_tokens,
+        keep_recent=config.keep_recent,
+        summary_chars=config.summary_chars,
+        provider=provider,
+        model=config.model,
+        store=store,
+    )
@@ -0,0 +1,286 @@
+"""Memory consolidation: keeps MEMORY.md and daily notes from growing without bound."""
+
+import difflib
+import re
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import LLMProvider
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, estimate_tokens, file_lock
+
+# Cron system event that triggers consolidation
+CONSOLIDATION_EVENT = "memory_consolidation"
+
+_DAILY_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.md$")
+_WEEKLY_RE = re.compile(r"^(\d{4})-W(\d{2})\.md$")
+_BULLET_RE = re.compile(r"^\s*(?:[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)")
+
+_DIGEST_PROMPT = """Condense these notes into a digest for long-term reference.
+Keep facts, decisions, names, dates, numbers and open tasks; drop chatter and repetition.
+Use short markdown bullet points, no preamble."""
+
+_CONDENSE_PROMPT = """Rewrite this long-term memory file to fit in about {words} words.
+Merge duplicate or overlapping facts, drop stale or trivial ones, keep the markdown section structure.
+Output only the new file content."""
+
+
+@dataclass
+class ConsolidationReport:
+    """What a consolidation run changed."""
+    duplicates_removed: int = 0
+    digests: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+    overflow_file: str | None = None
+    tokens_before: int = 0
+    tokens_after: int = 0
+    diff: str = ""
+
+    def render(self) -> str:
+        lines = [
+            f"Memory consolidation {datetime.now().isoformat(timespec='seconds')}",
+            f"MEMORY.md: ~{self.tokens_before} -> ~{self.tokens_after} tokens, "
+            f"{self.duplicates_removed} duplicate lines removed",
+        ]
+        if self.overflow_file:
+            lines.append(f"Moved over-budget content to {self.overflow_file}")
+        lines += [f"Digest updated: {d}" for d in self.digests]
+        lines += [f"Archived: {a}" for a in self.archived]
+        if self.diff:
+            lines += ["", self.diff]
+        return "\n".join(lines) + "\n"
+
+
+def _fact_key(line: str) -> str:
+    """Normalized form of a note line for duplicate detection."""
+    text = _BULLET_RE.sub("", line).strip().lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.rstrip(".;:!")
+
+
+def dedupe_lines(text: str) -> tuple[str, int]:
+    """
+    Remove repeated facts (same line modulo bullets, case and punctuation).
+
+    Headings and blank lines are kept; the first occurrence of a fact wins.
+
+    Returns:
+        (new_text, lines_removed)
+    """
+    seen: set[str] = set()
+    out: list[str] = []
+    removed = 0
+    for line in text.splitlines():
+        key = _fact_key(line)
+        if not key or line.lstrip().startswith("#"):
+            out.append(line)
+        elif key in seen:
+            removed += 1
+        else:
+            seen.add(key)
+            out.append(line)
+    result = re.sub(r"\n{3,}", "\n\n", "\n".join(out)).strip()
+    return (result + "\n" if result else ""), removed
+
+
+def merge_added_lines(base: str, edited: str, rewritten: str) -> str:
+    """
+    Carry lines added to base in edited over into rewritten.
+
+    Used when MEMORY.md changed while it was being rewritten: new facts are
+    appended (unless rewritten already has them); other edits are superseded.
+    """
+    known = {_fact_key(line) for line in rewritten.splitlines()}
+    added = [
+        line[2:] for line in difflib.ndiff(base.splitlines(), edited.splitlines())
+        if line.startswith("+ ") and _fact_key(line[2:]) not in known
+    ]
+    if not added:
+        return rewritten
+    return rewritten.rstrip("\n") + "\n" + "\n".join(added) + "\n"
+
+
+class MemoryConsolidator:
+    """
+    Bounds the size of workspace memory.
+
+    A run (normally from a nightly cron system event) will:
+    1. dedupe MEMORY.md,
+    2. roll daily notes older than keep_days into weekly digests, and weekly
+       digests older than keep_weeks into monthly ones (memory/digests/),
+    3. move the rolled-up raw files to memory/archive/,
+    4. keep MEMORY.md within budget_tokens, moving the overflow to an archive file,
+    5. write a report with a diff of MEMORY.md to memory/reports/.
+
+    Archived and digest files stay searchable through memory_search. Without
+    a model, digests are deduped concatenations and the budget is enforced by
+    moving trailing content out.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        provider: LLMProvider | None = None,
+        model: str | None = None,
+        budget_tokens: int = 2000,
+        keep_days: int = 7,
+        keep_weeks: int = 8,
+    ):
+        self.store = store
+        self.provider = provider
+        self.model = model
+        self.budget_tokens = budget_tokens
+        self.keep_days = keep_days
+        self.keep_weeks = keep_weeks
+        self.digests_dir = store.memory_dir / "digests"
+        self.archive_dir = store.memory_dir / "archive"
+        self.reports_dir = store.memory_dir / "reports"
+
+    async def run(self, today: date | None = None) -> ConsolidationReport:
+        """Run the full pipeline and write the report."""
+        today = today or date.today()
+        report = ConsolidationReport()
+
+        before = self.store.read_long_term()
+        text, report.duplicates_removed = dedupe_lines(before)
+        report.tokens_before = estimate_tokens(before)
+
+        await self._roll_daily(today, report)
+        await self._roll_weekly(today, report)
+
+        if estimate_tokens(text) > self.budget_tokens:
+            text = await self._fit_budget(text, today, report)
+
+        # The model calls above may take a while: keep edits made meanwhile
+        with file_lock(self.store.memory_file):
+            current = self.store.read_long_term()
+            if current != before:
+                text = merge_added_lines(before, current, text)
+            if text != current:
+                atomic_write_text(self.store.memory_file, text)
+        report.tokens_after = estimate_tokens(text)
+        report.diff = "".join(difflib.unified_diff(
+            before.splitlines(keepends=True), text.splitlines(keepends=True),
+            fromfile="MEMORY.md (before)", tofile="MEMORY.md (after)",
+        ))
+
+        ensure_dir(self.reports_dir)
+        report_path = self.reports_dir / f"consolidation-{today.isoformat()}.txt"
+        atomic_write_text(report_path, report.render())
+        logger.info(
+            f"Memory consolidated: MEMORY.md ~{report.tokens_before} -> ~{report.tokens_after} tokens, "
+            f"{len(report.archived)} files archived (report: {report_path.name})"
+        )
+        return report
+
+    async def _roll_daily(self, today: date, report: ConsolidationReport) -> None:
+        cutoff = today - timedelta(days=self.keep_days)
+        weeks: dict[str, list[tuple[date, Path]]] = {}
+        for path in self.store.memory_dir.glob("????-??-??.md"):
+            m = _DAILY_RE.match(path.name)
+            try:
+                day = date.fromisoformat(m.group(1)) if m else None
+            except ValueError:
+                day = None
+            if day and day < cutoff:
+                year, week, _ = day.isocalendar()
+                weeks.setdefault(f"{year}-W{week:02d}", []).append((day, path))
+
+        for key, days in sorted(weeks.items()):
+            days.sort()
+            sections = []
+            for day, path in days:
+                # Read and archive under the lock append_today takes, so no note is lost
+                with file_lock(path):
+                    body = path.read_text(encoding="utf-8")
+                    self._archive(path, self.archive_dir / "daily", report)
+                body = re.sub(rf"^#\s*{day.isoformat()}\s*\n", "", body).strip()
+                if body:
+                    sections.append(f"## {day.isoformat()}\n\n{body}")
+            await self._append_digest(self.digests_dir / f"{key}.md", f"# Week {key}", sections, report)
+
+    async def _roll_weekly(self, today: date, report: ConsolidationReport) -> None:
+        cutoff = today - timedelta(weeks=self.keep_weeks)
+        if not self.digests_dir.exists():
+            return
+        months: dict[str, list[Path]] = {}
+        for path in sorted(self.digests_dir.glob("????-W??.md")):
+            m = _WEEKLY_RE.match(path.name)
+            if not m:
+                continue
+            try:
+                monday = date.fromisocalendar(int(m.group(1)), int(m.group(2)), 1)
+            except ValueError:
+                continue
+            if monday + timedelta(days=6) < cutoff:
+                months.setdefault(monday.strftime("%Y-%m"), []).append(path)
+
+        for key, paths in sorted(months.items()):
+            sections = [p.read_text(encoding="utf-8").replace("# Week ", "## Week ", 1).strip() for p in paths]
+            await self._append_digest(self.digests_dir / f"{key}.md", f"# Month {key}", sections, report)
+            for path in paths:
+                self._archive(path, self.archive_dir / "digests", report)
+
+    async def _append_digest(
+        self, path: Path, title: str, sections: list[str], report: ConsolidationReport
+    ) -> None:
+        if not sections:
+            return
+        raw = "\n\n".join(sections)
+        summary = await self._ask(_DIGEST_PROMPT, raw)
+        body = summary if summary else dedupe_lines(raw)[0].strip()
+        existing = path.read_text(encoding="utf-8").rstrip() if path.exists() else title
+        ensure_dir(path.parent)
+        atomic_write_text(path, f"{existing}\n\n{body}\n")
+        report.digests.append(str(path.relative_to(self.store.memory_dir)))
+
+    def _archive(self, path: Path, dest_dir: Path, report: ConsolidationReport) -> None:
+        ensure_dir(dest_dir)
+        dest = dest_dir / path.name
+        if dest.exists():
+            dest = dest_dir / f"{path.stem}-{datetime.now().strftime('%H%M%S')}{path.suffix}"
+        shutil.move(str(path), dest)
+        report.archived.append(str(path.relative_to(self.store.memory_dir)))
+
+    async def _fit_budget(self, text: str, today: date, report: ConsolidationReport) -> str:
+        condensed = await self._ask(_CONDENSE_PROMPT.format(words=int(self.budget_tokens * 0.75)), text)
+        if condensed and estimate_tokens(condensed) <= self.budget_tokens:
+            overflow = text
+            kept = condensed.strip() + "\n"
+        else:
+            # Keep the top of the file (usually the most important facts) line by line
+            lines = text.splitlines(keepends=True)
+            used, cut = 0, 0
+            for i, line in enumerate(lines):
+                used += estimate_tokens(line)
+                if used > self.budget_tokens:
+                    break
+                cut = i + 1
+            kept, overflow = "".join(lines[:cut]), "".join(lines[cut:])
+
+        path = ensure_dir(self.archive_dir) / f"MEMORY-overflow-{today.isoformat()}.md"
+        previous = path.read_text(encoding="utf-8") if path.exists() else ""
+        atomic_write_text(path, previous + f"# Moved out of MEMORY.md on {today.isoformat()}\n\n{overflow}\n")
+        report.overflow_file = str(path.relative_to(self.store.memory_dir))
+        return kept
+
+    async def _ask(self, prompt: str, content: str) -> str | None:
+        """Run a one-shot LLM rewrite, or return None if no model is configured or it fails."""
+        if not (self.provider and self.model):
+            return None
+        try:
+            response = await self.provider.chat(
+                messages=[{"role": "system", "content": prompt}, {"role": "user", "content": content}],
+                model=self.model,
+                temperature=0,
+            )
+        except Exception as e:
+            logger.warning(f"Memory consolidation model call failed: {e}")
+            return None
+        if response.finish_reason == "error":
+            return None
+        return (response.content or "").strip() or None
@@ -4,11 +4,17 @@ import base64
 import mimetypes
 import platform
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
 
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.skill_router import SkillRouter
 from nanobot.agent.skills import SkillsLoader
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import MemoryConfig, SkillsConfig
+
 
 class ContextBuilder:
     """
@@ -20,10 +26,30 @@ class ContextBuilder:
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        memory_config: "MemoryConfig | None" = None,
+        skills_config: "SkillsConfig | None" = None,
+    ):
+        from nanobot.config.schema import MemoryConfig, SkillsConfig
         self.workspace = workspace
-        self.memory = MemoryStore(workspace)
+        self.memory_config = memory_config or MemoryConfig()
+        self.memory = MemoryStore(
+            workspace,
+            chunk_chars=self.memory_config.chunk_chars,
+            embeddings=self.memory_config.embeddings,
+        )
         self.skills = SkillsLoader(workspace)
+        skills_config = skills_config or SkillsConfig()
+        self.skill_router: SkillRouter | None = None
+        if skills_config.routing:
+            self.skill_router = SkillRouter(
+                self.skills,
+                top_k=skills_config.top_k,
+                preload=skills_config.preload,
+                min_score=skills_config.min_score,
+            )
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -46,7 +72,8 @@ class ContextBuilder:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        # With retrieval on, daily notes come per message (see build_messages)
+        memory = self.memory.get_memory_context(include_today=not self.memory_config.retrieval)
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
@@ -59,8 +86,17 @@ class ContextBuilder:
                 parts.append(f"# Active Skills\n\n{always_content}")
         
         # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary()
-        if skills_summary:
+        if self.skill_router:
+            # Relevant skills come with each message (see build_messages); keep this part stable
+            index = "\n".join(f"- {e.name}: {e.path}" for e in self.skills.entries())
+            if index:
+                parts.append(f"""# Skills
+
+Skills extend your capabilities. The ones relevant to a message are listed (or already loaded) with it.
+To use any other skill, read its SKILL.md file using the read_file tool.
+
+{index}""")
+        elif skills_summary := self.skills.build_skills_summary():
             parts.append(f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
@@ -126,6 +162,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        summary: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
@@ -137,6 +174,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            summary: Rolling summary of the conversation before history.
 
         Returns:
             List of messages including system prompt.
@@ -147,11 +185,23 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         system_prompt = self.build_system_prompt(skill_names)
         if channel and chat_id:
             system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+        if summary:
+            system_prompt += f"\n\n## Earlier in This Conversation\n{summary}"
         messages.append({"role": "system", "content": system_prompt})
 
         # History
         messages.extend(history)
 
+        # Relevant notes and skills go with the message so the system prompt and history stay cacheable
+        if self.memory_config.retrieval and current_message:
+            relevant = self.memory.get_relevant_memories(current_message, self.memory_config.top_k)
+            if relevant:
+                current_message = f"<relevant_memory>\n{relevant}\n</relevant_memory>\n\n{current_message}"
+        if self.skill_router and current_message:
+            routed = self.skill_router.render(self.skill_router.route(current_message))
+            if routed:
+                current_message = f"<relevant_skills>\n{routed}\n</relevant_skills>\n\n{current_message}"
+
         # Current message (with optional image attachments)
         user_content = self._build_user_content(current_message, media)
         messages.append({"role": "user", "content": user_content})
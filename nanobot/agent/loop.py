@@ -11,15 +11,21 @@ from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.compaction import CompactionStats, make_compactor
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import make_web_cache
+from nanobot.agent.tools.memory import MemorySearchTool
 from nanobot.agent.tools.message import MessageTool
-from nanobot.agent.tools.spawn import SpawnTool
+from nanobot.agent.tools.spawn import SpawnTool, SubagentsTool
 from nanobot.agent.tools.cron import CronTool
+from nanobot.agent.tools.selector import LoadToolsTool, ToolSelection, ToolSelector
+from nanobot.agent.tools.output import ReadArtifactTool, make_output_manager
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.agent.summarizer import SessionSummarizer
+from nanobot.session.manager import Session, SessionManager
 
 
 class AgentLoop:
@@ -43,12 +49,25 @@ class AgentLoop:
         max_iterations: int = 20,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        tool_selection_config: "ToolSelectionConfig | None" = None,
+        tool_output_config: "ToolOutputConfig | None" = None,
+        compaction_config: "CompactionConfig | None" = None,
+        history_config: "HistoryConfig | None" = None,
+        memory_config: "MemoryConfig | None" = None,
+        skills_config: "SkillsConfig | None" = None,
+        subagent_config: "SubagentConfig | None" = None,
         cron_service: "CronService | None" = None,
+        task_journal: "TaskJournal | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import (
+            CompactionConfig, ExecToolConfig, HistoryConfig, ToolOutputConfig, ToolSelectionConfig,
+            WebFetchConfig,
+        )
         from nanobot.cron.service import CronService
+        from nanobot.agent.task_journal import TaskJournal
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
@@ -56,10 +75,17 @@ class AgentLoop:
         self.max_iterations = max_iterations
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_cache = make_web_cache(self.web_fetch_config)
+        self.tool_output_config = tool_output_config or ToolOutputConfig()
+        self.tool_output = make_output_manager(workspace, self.tool_output_config)
+        self.compaction_config = compaction_config or CompactionConfig()
+        self.compactor = make_compactor(self.compaction_config, provider, store=self.tool_output)
+        self.history_config = history_config or HistoryConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(workspace, memory_config=memory_config, skills_config=skills_config)
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
@@ -69,11 +95,34 @@ class AgentLoop:
             model=self.model,
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
+            web_fetch_config=self.web_fetch_config,
+            web_cache=self.web_cache,
+            tool_output_config=self.tool_output_config,
+            compaction_config=self.compaction_config,
+            subagent_config=subagent_config,
+            journal=task_journal,
             restrict_to_workspace=restrict_to_workspace,
         )
         
+        self.summarizer: SessionSummarizer | None = None
+        if self.history_config.summarize:
+            self.summarizer = SessionSummarizer(
+                provider,
+                model=self.history_config.summary_model or self.model,
+                trigger_tokens=self.history_config.summary_trigger_tokens,
+                keep_messages=self.history_config.summary_keep_messages,
+                on_update=self.sessions.save,
+            )
+        
         self._running = False
         self._register_default_tools()
+        
+        # Optional per-turn tool selection (registered last so load_tools sees every tool)
+        selection = tool_selection_config or ToolSelectionConfig()
+        self.tool_selector: ToolSelector | None = None
+        if selection.enabled:
+            self.tool_selector = ToolSelector(self.tools, always=selection.always, channel_tools=selection.channels)
+            self.tools.register(LoadToolsTool(self.tool_selector))
     
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
@@ -93,15 +142,28 @@ class AgentLoop:
         
         # Web tools
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebFetchTool(
+            max_chars=self.web_fetch_config.max_chars,
+            cache=self.web_cache,
+            max_html_chars=self.web_fetch_config.max_html_chars,
+            extract_workers=self.web_fetch_config.extract_workers,
+            max_bytes=self.web_fetch_config.max_bytes,
+        ))
+        
+        # Memory search tool
+        self.tools.register(MemorySearchTool(self.context.memory))
+        
+        # Artifact tool (pages through oversized tool output)
+        self.tools.register(ReadArtifactTool(self.tool_output))
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
         self.tools.register(message_tool)
         
-        # Spawn tool (for subagents)
+        # Spawn tool (for subagents) and subagent list/status/cancel
         spawn_tool = SpawnTool(manager=self.subagents)
         self.tools.register(spawn_tool)
+        self.tools.register(SubagentsTool(manager=self.subagents))
         
         # Cron tool (for scheduling)
         if self.cron_service:
@@ -141,10 +203,133 @@ class AgentLoop:
         self._running = False
         logger.info("Agent loop stopping")
     
+    def _start_tool_selection(self, content: str, channel: str, session: Session) -> ToolSelection | None:
+        """Pick the tools offered this turn (None unless tool selection is enabled)."""
+        if not self.tool_selector:
+            return None
+        selection = self.tool_selector.start_turn(
+            content,
+            channel=channel,
+            pinned=session.metadata.get("tools"),
+            recent=session.metadata.get("recent_tools"),
+        )
+        load_tools = self.tools.get("load_tools")
+        if isinstance(load_tools, LoadToolsTool):
+            load_tools.set_context(selection)
+        return selection
+    
+    def _end_tool_selection(self, session: Session, selection: ToolSelection | None) -> None:
+        """Record tool selection and skill routing stats; remember used tools for the next turn."""
+        if self.context.skill_router:
+            self.context.skill_router.end_turn()
+        if self.tool_selector and selection:
+            self.tool_selector.end_turn(selection)
+            session.metadata["recent_tools"] = sorted(selection.used - {"load_tools"})
+    
+    def _save_turn(
+        self,
+        session: Session,
+        user_content: str,
+        transcript: list[dict[str, Any]],
+        final_content: str,
+    ) -> None:
+        """
+        Append a finished turn to the session and persist it.
+        
+        With history.persist_tool_calls the tool calls and results of the turn
+        are stored too, so the next turn replays the same prefix.
+        """
+        cfg = self.history_config
+        session.add_message("user", user_content)
+        if cfg.persist_tool_calls:
+            session.add_transcript(transcript, max_result_chars=cfg.tool_result_chars)
+        session.add_message("assistant", final_content)
+        if cfg.persist_tool_calls:
+            session.trim_tool_history(cfg.tool_turns)
+        self.sessions.save(session)
+        if self.summarizer:
+            self.summarizer.maybe_schedule(session)
+    
+    async def _run_agent_loop(
+        self,
+        messages: list[dict[str, Any]],
+        selection: ToolSelection | None = None,
+    ) -> str | None:
+        """
+        Run the LLM/tool-call loop until the model answers without tool calls.
+        
+        Args:
+            messages: Initial message list; extended in place with the transcript.
+            selection: Tools offered this turn; all registered tools if None.
+        
+        Returns:
+            The final response text, or None if max_iterations was reached.
+        """
+        iteration = 0
+        turn_start = len(messages) - 1
+        output_budget = self.tool_output.new_budget()
+        compaction = CompactionStats()
+        
+        while iteration < self.max_iterations:
+            iteration += 1
+            
+            if self.compactor:
+                await self.compactor.maybe_compact(messages, turn_start, compaction)
+            
+            # Call LLM
+            response = await self.provider.chat(
+                messages=messages,
+                tools=self.tool_selector.definitions(selection) if selection else self.tools.get_definitions(),
+                model=self.model
+            )
+            
+            # No tool calls, we're done
+            if not response.has_tool_calls:
+                if compaction.tokens_saved:
+                    logger.info(
+                        f"Compacted {compaction.compacted} tool results this turn, "
+                        f"saved ~{compaction.tokens_saved} tokens"
+                    )
+                return response.content
+            
+            # Add assistant message with tool calls
+            tool_call_dicts = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.name,
+                        "arguments": json.dumps(tc.arguments)  # Must be JSON string
+                    }
+                }
+                for tc in response.tool_calls
+            ]
+            self.context.add_assistant_message(
+                messages, response.content, tool_call_dicts,
+                reasoning_content=response.reasoning_content,
+            )
+            
+            # Execute tools
+            for tool_call in response.tool_calls:
+                args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+                if selection:
+                    selection.note_call(tool_call.name)
+                if self.context.skill_router and tool_call.name == "read_file":
+                    self.context.skill_router.note_file_read(str(tool_call.arguments.get("path", "")))
+                result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                result = self.tool_output.process(tool_call.name, result, output_budget)
+                self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
+        
+        return None
+    
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
+        Turns may run concurrently (e.g. cron jobs); the chat context given to
+        tools below is kept per asyncio task, so each turn sees its own.
+        
         Args:
             msg: The inbound message to process.
         
@@ -167,9 +352,10 @@ class AgentLoop:
         if isinstance(message_tool, MessageTool):
             message_tool.set_context(msg.channel, msg.chat_id)
         
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
+        for name in ("spawn", "subagents"):
+            tool = self.tools.get(name)
+            if isinstance(tool, (SpawnTool, SubagentsTool)):
+                tool.set_context(msg.channel, msg.chat_id)
         
         cron_tool = self.tools.get("cron")
         if isinstance(cron_tool, CronTool):
@@ -177,7 +363,8 @@ class AgentLoop:
         
         # Build initial messages (use get_history for LLM-formatted messages)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=session.get_history(self.history_config.max_messages),
+            summary=session.metadata.get("summary"),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
@@ -185,50 +372,10 @@ class AgentLoop:
         )
         
         # Agent loop
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
-                
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                break
+        turn_start = len(messages)
+        selection = self._start_tool_selection(msg.content, msg.channel, session)
+        final_content = await self._run_agent_loop(messages, selection)
+        self._end_tool_selection(session, selection)
         
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -238,9 +385,7 @@ class AgentLoop:
         logger.info(f"Response to {msg.channel}:{msg.sender_id}: {preview}")
         
         # Save to session
-        session.add_message("user", msg.content)
-        session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._save_turn(session, msg.content, messages[turn_start:], final_content)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -272,14 +417,22 @@ class AgentLoop:
         session_key = f"{origin_channel}:{origin_chat_id}"
         session = self.sessions.get_or_create(session_key)
         
+        # Subagent results in direct delivery mode skip the rephrasing LLM turn
+        subagent = msg.metadata.get("subagent") or {}
+        if subagent.get("delivery") == "direct":
+            self._save_turn(session, f"[System: {msg.sender_id}] Background task '{subagent['label']}' "
+                            f"finished ({subagent['status']})", [], subagent["text"])
+            return OutboundMessage(channel=origin_channel, chat_id=origin_chat_id, content=subagent["text"])
+        
         # Update tool contexts
         message_tool = self.tools.get("message")
         if isinstance(message_tool, MessageTool):
             message_tool.set_context(origin_channel, origin_chat_id)
         
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
+        for name in ("spawn", "subagents"):
+            tool = self.tools.get(name)
+            if isinstance(tool, (SpawnTool, SubagentsTool)):
+                tool.set_context(origin_channel, origin_chat_id)
         
         cron_tool = self.tools.get("cron")
         if isinstance(cron_tool, CronTool):
@@ -287,60 +440,23 @@ class AgentLoop:
         
         # Build messages with the announce content
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=session.get_history(self.history_config.max_messages),
+            summary=session.metadata.get("summary"),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
         )
         
-        # Agent loop (limited for announce handling)
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
-                
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                final_content = response.content
-                break
+        turn_start = len(messages)
+        selection = self._start_tool_selection(msg.content, origin_channel, session)
+        final_content = await self._run_agent_loop(messages, selection)
+        self._end_tool_selection(session, selection)
         
         if final_content is None:
             final_content = "Background task completed."
         
         # Save to session (mark as system message in history)
-        session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
-        session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._save_turn(session, f"[System: {msg.sender_id}] {msg.content}", messages[turn_start:], final_content)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -3,7 +3,8 @@
 from pathlib import Path
 from datetime import datetime
 
-from nanobot.utils.helpers import ensure_dir, today_date
+from nanobot.agent.memory_index import MemoryChunk, MemoryIndex
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, file_lock, today_date
 
 
 class MemoryStore:
@@ -13,35 +14,63 @@ class MemoryStore:
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, chunk_chars: int = 800, embeddings: bool = False):
         self.workspace = workspace
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self._chunk_chars = chunk_chars
+        self._embeddings = embeddings
+        self._index: MemoryIndex | None = None
+        self._today_cache: tuple[tuple[Path, int, int], str] | None = None
+    
+    @property
+    def index(self) -> MemoryIndex:
+        """Retrieval index over all memory files (built on first use)."""
+        if self._index is None:
+            self._index = MemoryIndex(self.memory_dir, self._chunk_chars, self._embeddings)
+        return self._index
+    
+    def search(self, query: str, k: int = 5, include_long_term: bool = True) -> list[MemoryChunk]:
+        """
+        Find the memory chunks most relevant to a query.
+        
+        Args:
+            query: Search text.
+            k: Maximum chunks to return.
+            include_long_term: Whether to search MEMORY.md too.
+        
+        Returns:
+            Matching chunks, best first.
+        """
+        exclude = None if include_long_term else {self.memory_file}
+        return self.index.search(query, k, exclude=exclude)
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
         return self.memory_dir / f"{today_date()}.md"
     
     def read_today(self) -> str:
-        """Read today's memory notes."""
+        """Read today's memory notes (cached until the file changes)."""
         today_file = self.get_today_file()
-        if today_file.exists():
-            return today_file.read_text(encoding="utf-8")
-        return ""
+        try:
+            st = today_file.stat()
+        except FileNotFoundError:
+            return ""
+        key = (today_file, st.st_mtime_ns, st.st_size)
+        if self._today_cache and self._today_cache[0] == key:
+            return self._today_cache[1]
+        content = today_file.read_text(encoding="utf-8")
+        self._today_cache = (key, content)
+        return content
     
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
         
-        if today_file.exists():
-            existing = today_file.read_text(encoding="utf-8")
-            content = existing + "\n" + content
-        else:
-            # Add header for new day
-            header = f"# {today_date()}\n\n"
-            content = header + content
-        
-        today_file.write_text(content, encoding="utf-8")
+        with file_lock(today_file):
+            with open(today_file, "a", encoding="utf-8") as f:
+                # Add header for new day
+                f.write(f"\n{content}" if f.tell() else f"# {today_date()}\n\n{content}")
     
     def read_long_term(self) -> str:
         """Read long-term memory (MEMORY.md)."""
@@ -50,8 +79,9 @@ class MemoryStore:
         return ""
     
     def write_long_term(self, content: str) -> None:
-        """Write to long-term memory (MEMORY.md)."""
-        self.memory_file.write_text(content, encoding="utf-8")
+        """Write to long-term memory (MEMORY.md) atomically."""
+        with file_lock(self.memory_file):
+            atomic_write_text(self.memory_file, content)
     
     def get_recent_memories(self, days: int = 7) -> str:
         """
@@ -87,10 +117,13 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
-    def get_memory_context(self) -> str:
+    def get_memory_context(self, include_today: bool = True) -> str:
         """
         Get memory context for the agent.
         
+        Args:
+            include_today: Include today's notes in full (off when notes are retrieved per message).
+        
         Returns:
             Formatted memory context including long-term and recent memories.
         """
@@ -102,8 +135,22 @@ class MemoryStore:
             parts.append("## Long-term Memory\n" + long_term)
         
         # Today's notes
-        today = self.read_today()
+        today = self.read_today() if include_today else ""
         if today:
             parts.append("## Today's Notes\n" + today)
         
         return "\n\n".join(parts) if parts else ""
+    
+    def get_relevant_memories(self, query: str, k: int = 5) -> str:
+        """
+        Get the notes most relevant to a message, excluding MEMORY.md.
+        
+        Args:
+            query: The current message.
+            k: Maximum chunks to include.
+        
+        Returns:
+            Formatted chunks with their source file, or empty string.
+        """
+        chunks = self.search(query, k, include_long_term=False)
+        return "\n\n".join(f"[{c.source}]\n{c.text}" for c in chunks)
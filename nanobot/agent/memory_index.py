@@ -0,0 +1,125 @@
+"""Retrieval index over workspace memory files."""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.textindex import TextIndex
+
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.M)
+
+
+@dataclass
+class MemoryChunk:
+    """A retrievable piece of a memory file."""
+    path: Path
+    heading: str
+    text: str
+
+    @property
+    def source(self) -> str:
+        return f"{self.path.name}" + (f" › {self.heading}" if self.heading else "")
+
+
+def chunk_markdown(text: str, max_chars: int = 800) -> list[tuple[str, str]]:
+    """
+    Split markdown into (heading, text) chunks of at most about max_chars.
+
+    Sections are split at headings, then at blank lines; paragraphs are
+    packed together until the size limit.
+    """
+    chunks: list[tuple[str, str]] = []
+    starts = [m.start() for m in _HEADING_RE.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    for begin, end in zip(starts, starts[1:] + [len(text)]):
+        section = text[begin:end].strip()
+        if not section:
+            continue
+        heading = section.splitlines()[0].lstrip("#").strip() if section.startswith("#") else ""
+        current = ""
+        for para in re.split(r"\n\s*\n", section):
+            para = para.strip()
+            if not para:
+                continue
+            if current and len(current) + len(para) + 2 > max_chars:
+                chunks.append((heading, current))
+                current = ""
+            # Hard-split paragraphs that alone exceed the limit
+            while len(para) > max_chars:
+                chunks.append((heading, para[:max_chars]))
+                para = para[max_chars:]
+            current = f"{current}\n\n{para}" if current else para
+        if current:
+            chunks.append((heading, current))
+    return chunks
+
+
+class MemoryIndex:
+    """
+    Searchable index of memory/**/*.md.
+
+    refresh() re-chunks only files whose mtime or size changed and drops
+    deleted ones, so it is cheap to call before every search.
+    """
+
+    def __init__(self, memory_dir: Path, chunk_chars: int = 800, embeddings: bool = False):
+        self.memory_dir = memory_dir
+        self.chunk_chars = chunk_chars
+        self._index = TextIndex(embeddings=embeddings)
+        self._chunks: dict[tuple[str, int], MemoryChunk] = {}
+        self._files: dict[str, tuple[float, int, int]] = {}  # path -> (mtime, size, chunk count)
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the files on disk. Returns files re-indexed."""
+        seen: set[str] = set()
+        changed = 0
+        for path in sorted(self.memory_dir.rglob("*.md")):
+            key = str(path)
+            seen.add(key)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            old = self._files.get(key)
+            if old and old[:2] == (st.st_mtime, st.st_size):
+                continue
+            self._drop(key)
+            try:
+                text = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Cannot index memory file {path}: {e}")
+                continue
+            pieces = chunk_markdown(text, self.chunk_chars)
+            for i, (heading, chunk) in enumerate(pieces):
+                self._chunks[(key, i)] = MemoryChunk(path, heading, chunk)
+                self._index.add((key, i), f"{heading}\n{chunk}")
+            self._files[key] = (st.st_mtime, st.st_size, len(pieces))
+            changed += 1
+        for key in set(self._files) - seen:
+            self._drop(key)
+            changed += 1
+        return changed
+
+    def _drop(self, key: str) -> None:
+        entry = self._files.pop(key, None)
+        if not entry:
+            return
+        for i in range(entry[2]):
+            self._chunks.pop((key, i), None)
+            self._index.remove((key, i))
+
+    def search(self, query: str, k: int = 5, exclude: set[Path] | None = None) -> list[MemoryChunk]:
+        """Return the k chunks most relevant to query."""
+        self.refresh()
+        results = []
+        for key, _ in self._index.search(query, k + (len(self._chunks) if exclude else 0)):
+            chunk = self._chunks[key]
+            if exclude and chunk.path in exclude:
+                continue
+            results.append(chunk)
+            if len(results) == k:
+                break
+        return results
@@ -0,0 +1,110 @@
+"""Relevance ranking of skills against the current message."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.agent.skills import SkillEntry, SkillsLoader
+from nanobot.utils.helpers import estimate_tokens
+from nanobot.utils.textindex import TextIndex
+
+
+@dataclass
+class RoutedSkills:
+    """Skills chosen for one message."""
+    listed: list[SkillEntry]
+    preloaded: list[SkillEntry]
+
+
+class SkillRouter:
+    """
+    Ranks skills for a message with a local BM25 index over name, description and body.
+
+    Only the top-k skills are listed to the model, and the bodies of
+    confident matches are preloaded so no read_file round-trip is needed.
+    The index is rebuilt whenever the skills index changes.
+    """
+
+    def __init__(
+        self,
+        loader: SkillsLoader,
+        top_k: int = 5,
+        preload: int = 1,
+        min_score: float = 2.0,
+    ):
+        self.loader = loader
+        self.top_k = top_k
+        self.preload = preload
+        self.min_score = min_score
+        self._index = TextIndex()
+        self._indexed_version = -1
+        self._preloaded_paths: set[str] = set()
+        self._stats = {
+            "turns": 0, "listed": 0, "preloaded": 0, "tokens_saved": 0,
+            "skill_reads": 0, "skill_reads_avoidable": 0,
+        }
+
+    def _ensure_index(self) -> None:
+        version = self.loader.version
+        if self._indexed_version == version:
+            return
+        self._index = TextIndex()
+        for e in self.loader.entries():
+            # Repeat name and description so they outweigh the body
+            self._index.add(e.name, f"{e.name} {e.name} {e.name}\n{e.description}\n{e.description}\n{e.body}")
+        self._indexed_version = version
+
+    def route(self, message: str) -> RoutedSkills:
+        """Pick the skills to list and preload for a message."""
+        self._ensure_index()
+        entries = {e.name: e for e in self.loader.entries()}
+        always = set(self.loader.get_always_skills())
+        ranked = [(n, s) for n, s in self._index.search(message, self.top_k + len(always)) if n not in always]
+        listed = [entries[n] for n, _ in ranked[:self.top_k] if n in entries]
+        preloaded = [
+            entries[n] for n, score in ranked[:self.preload]
+            if score >= self.min_score and n in entries and self.loader.is_available(entries[n])
+        ]
+
+        full = estimate_tokens(self.loader.build_skills_summary())
+        routed = estimate_tokens(self.loader.render_summary(listed)) if listed else 0
+        self._preloaded_paths = {str(e.path.resolve()) for e in preloaded}
+        self._stats["turns"] += 1
+        self._stats["listed"] += len(listed)
+        self._stats["preloaded"] += len(preloaded)
+        self._stats["tokens_saved"] += full - routed
+        return RoutedSkills(listed, preloaded)
+
+    def render(self, routed: RoutedSkills) -> str:
+        """Format the routed skills for the message context."""
+        if not routed.listed and not routed.preloaded:
+            return ""
+        parts = []
+        if routed.listed:
+            parts.append(self.loader.render_summary(routed.listed))
+        for e in routed.preloaded:
+            parts.append(f"### Skill: {e.name} (already loaded, no need to read {e.path.name})\n\n{e.body}")
+        return "\n\n".join(parts)
+
+    def note_file_read(self, path: str) -> None:
+        """Record a read_file call; reading a SKILL.md is a round-trip routing could save."""
+        if not path.endswith("SKILL.md"):
+            return
+        self._stats["skill_reads"] += 1
+        if str(Path(path).expanduser().resolve()) in self._preloaded_paths:
+            # The body was already in context
+            self._stats["skill_reads_avoidable"] += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Counters since startup; preloaded skills are iterations saved when they are used."""
+        s = self._stats
+        return {**s, "avg_tokens_saved": round(s["tokens_saved"] / s["turns"], 1) if s["turns"] else 0.0}
+
+    def end_turn(self) -> None:
+        """Log routing statistics for the finished turn."""
+        s = self.stats()
+        logger.debug(
+            f"Skill routing: {s['preloaded']} preloaded, {s['skill_reads']} SKILL.md reads, "
+            f"~{s['avg_tokens_saved']} summary tokens saved per turn"
+        )
@@ -2,13 +2,172 @@
 
 import json
 import os
-import re
 import shutil
+import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.frontmatter import FrontmatterError, parse_frontmatter, split_frontmatter
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# Seconds a binary/env availability check stays cached
+REQUIREMENTS_TTL = 60.0
+
+# Values accepted in metadata.nanobot.os (sys.platform names)
+KNOWN_OS = ("darwin", "linux", "win32")
+
+
+@dataclass
+class SkillInstall:
+    """One way to install a skill's requirements (an install hint)."""
+    kind: str  # brew, apt, pip, npm, ...
+    id: str = ""
+    label: str = ""
+    package: str = ""  # Formula, package or module name
+    bins: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SkillMeta:
+    """
+    Typed skill metadata, built and validated once when a skill is indexed.
+    
+    Comes from the frontmatter and its `metadata.nanobot` map, which may be
+    nested YAML or a JSON string. Problems are collected in `errors` rather
+    than raised so one bad skill cannot break the index.
+    """
+    description: str = ""
+    homepage: str = ""
+    emoji: str = ""
+    always: bool = False
+    requires_bins: list[str] = field(default_factory=list)
+    requires_env: list[str] = field(default_factory=list)
+    os: list[str] = field(default_factory=list)  # Empty means any
+    install: list[SkillInstall] = field(default_factory=list)
+    tools: list[str] = field(default_factory=list)  # Tool whitelist; empty means no restriction
+    errors: list[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_frontmatter(cls, data: dict[str, Any]) -> "SkillMeta":
+        meta = cls()
+        meta.description = meta._str(data, "description")
+        meta.homepage = meta._str(data, "homepage")
+        
+        nanobot = data.get("metadata") or {}
+        if isinstance(nanobot, str):
+            try:
+                nanobot = json.loads(nanobot)
+            except json.JSONDecodeError as e:
+                meta.errors.append(f"metadata: invalid JSON ({e.msg})")
+                nanobot = {}
+        if not isinstance(nanobot, dict):
+            meta.errors.append("metadata: expected a mapping")
+            nanobot = {}
+        nanobot = nanobot.get("nanobot") or {}
+        if not isinstance(nanobot, dict):
+            meta.errors.append("metadata.nanobot: expected a mapping")
+            nanobot = {}
+        
+        meta.emoji = meta._str(nanobot, "emoji", "metadata.nanobot.")
+        always = nanobot.get("always", data.get("always", False))
+        if isinstance(always, bool):
+            meta.always = always
+        else:
+            meta.errors.append("always: expected true or false")
+        
+        requires = nanobot.get("requires") or {}
+        if isinstance(requires, dict):
+            meta.requires_bins = meta._str_list(requires, "bins", "metadata.nanobot.requires.")
+            meta.requires_env = meta._str_list(requires, "env", "metadata.nanobot.requires.")
+        else:
+            meta.errors.append("metadata.nanobot.requires: expected a mapping")
+        
+        meta.os = meta._str_list(nanobot, "os", "metadata.nanobot.")
+        for name in meta.os:
+            if name not in KNOWN_OS:
+                meta.errors.append(f"metadata.nanobot.os: unknown OS {name!r} (expected {', '.join(KNOWN_OS)})")
+        
+        install = nanobot.get("install") or []
+        if not isinstance(install, list):
+            meta.errors.append("metadata.nanobot.install: expected a list")
+            install = []
+        for i, hint in enumerate(install):
+            prefix = f"metadata.nanobot.install[{i}]."
+            if not isinstance(hint, dict) or not isinstance(hint.get("kind"), str):
+                meta.errors.append(f"{prefix}kind: required")
+                continue
+            meta.install.append(SkillInstall(
+                kind=hint["kind"],
+                id=meta._str(hint, "id", prefix),
+                label=meta._str(hint, "label", prefix),
+                package=meta._str(hint, "formula", prefix) or meta._str(hint, "package", prefix),
+                bins=meta._str_list(hint, "bins", prefix),
+            ))
+        
+        # AgentSkills' space-separated "allowed-tools" or a nanobot tools list
+        if "tools" in nanobot:
+            meta.tools = meta._str_list(nanobot, "tools", "metadata.nanobot.")
+        elif isinstance(data.get("allowed-tools"), str):
+            meta.tools = data["allowed-tools"].replace(",", " ").split()
+        else:
+            meta.tools = meta._str_list(data, "allowed-tools")
+        return meta
+    
+    def _str(self, data: dict, key: str, prefix: str = "") -> str:
+        value = data.get(key)
+        if value is None:
+            return ""
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return str(value)
+        self.errors.append(f"{prefix}{key}: expected a string")
+        return ""
+    
+    def _str_list(self, data: dict, key: str, prefix: str = "") -> list[str]:
+        value = data.get(key)
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            return list(value)
+        self.errors.append(f"{prefix}{key}: expected a list of strings")
+        return []
+
+
+@dataclass
+class SkillEntry:
+    """A parsed SKILL.md, cached in the skills index."""
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    content: str
+    body: str = ""  # Content without frontmatter
+    metadata: dict[str, Any] = field(default_factory=dict)  # Frontmatter fields
+    meta: SkillMeta = field(default_factory=SkillMeta)
+    stamp: tuple[int, int] = (0, 0)  # SKILL.md (mtime_ns, size) when parsed
+    
+    @property
+    def description(self) -> str:
+        return self.meta.description or self.name
+    
+    def to_info(self) -> dict[str, str]:
+        return {"name": self.name, "path": str(self.path), "source": self.source}
+
+
+def _strip_frontmatter(content: str) -> str:
+    """Remove YAML frontmatter from markdown content."""
+    return split_frontmatter(content)[1]
+
+
+def _escape_xml(s: str) -> str:
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
 
 class SkillsLoader:
     """
@@ -16,12 +175,126 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+    
+    Parsed skills are kept in an index that is rebuilt only when a skills
+    directory changes (skills added or removed) and re-parsed per skill when
+    its SKILL.md changes. Requirement checks are cached for REQUIREMENTS_TTL
+    seconds and the XML summary is reused until either changes.
     """
     
     def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self._index: dict[str, SkillEntry] = {}
+        self._roots_stamp: tuple | None = None
+        self._version = 0
+        self._available_cache: dict[tuple[str, str], tuple[float, bool]] = {}
+        self._summary_cache: tuple[tuple, str] | None = None
+    
+    # ========== Index ==========
+    
+    def _roots(self) -> list[tuple[str, Path]]:
+        roots = [("workspace", self.workspace_skills)]
+        if self.builtin_skills:
+            roots.append(("builtin", self.builtin_skills))
+        return roots
+    
+    def _stat_roots(self) -> tuple:
+        stamp = []
+        for _, root in self._roots():
+            try:
+                stamp.append(root.stat().st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+    
+    def _refresh(self) -> dict[str, SkillEntry]:
+        """Bring the index up to date and return it."""
+        roots_stamp = self._stat_roots()
+        if roots_stamp != self._roots_stamp:
+            self._rebuild()
+            self._roots_stamp = roots_stamp
+        else:
+            # Directory listing unchanged; pick up in-place edits of SKILL.md
+            for name, entry in list(self._index.items()):
+                stamp = self._stat_file(entry.path)
+                if stamp is None:
+                    self._roots_stamp = None
+                    return self._refresh()
+                if stamp != entry.stamp:
+                    self._index[name] = self._parse(name, entry.path, entry.source, stamp)
+                    self._version += 1
+        return self._index
+    
+    def _rebuild(self) -> None:
+        index: dict[str, SkillEntry] = {}
+        for source, root in self._roots():
+            if not root.is_dir():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                skill_file = skill_dir / "SKILL.md"
+                # Workspace skills take priority over built-in ones
+                if skill_dir.name in index or not skill_dir.is_dir():
+                    continue
+                stamp = self._stat_file(skill_file)
+                if stamp is None:
+                    continue
+                old = self._index.get(skill_dir.name)
+                if old and old.path == skill_file and old.stamp == stamp:
+                    index[skill_dir.name] = old
+                else:
+                    index[skill_dir.name] = self._parse(skill_dir.name, skill_file, source, stamp)
+        self._index = index
+        self._version += 1
+    
+    @staticmethod
+    def _stat_file(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _parse(self, name: str, path: Path, source: str, stamp: tuple[int, int]) -> SkillEntry:
+        content = path.read_text(encoding="utf-8")
+        try:
+            metadata, body = parse_frontmatter(content)
+            meta = SkillMeta.from_frontmatter(metadata)
+        except FrontmatterError as e:
+            metadata, body = {}, _strip_frontmatter(content)
+            meta = SkillMeta(errors=[f"frontmatter: {e}"])
+        if meta.errors:
+            logger.warning(f"Skill '{name}' ({path}) has invalid metadata: {'; '.join(meta.errors)}")
+        return SkillEntry(name, path, source, content, body, metadata, meta, stamp)
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the index changes."""
+        self._refresh()
+        return self._version
+    
+    def is_available(self, entry: SkillEntry) -> bool:
+        """Whether a skill's requirements are met."""
+        return self._check_requirements(entry.meta)
+    
+    def missing_requirements(self, entry: SkillEntry) -> str:
+        """Comma-separated unmet requirements of a skill, empty if it is available."""
+        return self._get_missing_requirements(entry.meta)
+    
+    def render_summary(self, entries: list[SkillEntry]) -> str:
+        """XML summary for a subset of skills."""
+        return self._render_summary(entries, tuple(self.is_available(e) for e in entries))
+    
+    def get_entry(self, name: str) -> SkillEntry | None:
+        """Get the indexed skill by name."""
+        return self._refresh().get(name)
+    
+    def entries(self) -> list[SkillEntry]:
+        """All indexed skills, workspace skills first."""
+        return list(self._refresh().values())
+    
+    # ========== Public API ==========
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +306,10 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
+        entries = self.entries()
         if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+            entries = [e for e in entries if self._check_requirements(e.meta)]
+        return [e.to_info() for e in entries]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +321,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        entry = self.get_entry(name)
+        return entry.content if entry else None
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -91,10 +336,9 @@ class SkillsLoader:
         """
         parts = []
         for name in skill_names:
-            content = self.load_skill(name)
-            if content:
-                content = self._strip_frontmatter(content)
-                parts.append(f"### Skill: {name}\n\n{content}")
+            entry = self.get_entry(name)
+            if entry:
+                parts.append(f"### Skill: {name}\n\n{entry.body}")
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
@@ -108,97 +352,84 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        entries = self.entries()
+        if not entries:
             return ""
         
-        def escape_xml(s: str) -> str:
-            return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        availability = tuple(self._check_requirements(e.meta) for e in entries)
+        key = (self._version, availability)
+        if self._summary_cache and self._summary_cache[0] == key:
+            return self._summary_cache[1]
         
+        summary = self._render_summary(entries, availability)
+        self._summary_cache = (key, summary)
+        return summary
+    
+    def _render_summary(self, entries: list[SkillEntry], availability: tuple[bool, ...]) -> str:
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
+        for entry, available in zip(entries, availability):
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
-            lines.append(f"    <name>{name}</name>")
-            lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+            lines.append(f"    <name>{_escape_xml(entry.name)}</name>")
+            lines.append(f"    <description>{_escape_xml(entry.description)}</description>")
+            lines.append(f"    <location>{entry.path}</location>")
             
             # Show missing requirements for unavailable skills
             if not available:
-                missing = self._get_missing_requirements(skill_meta)
+                missing = self._get_missing_requirements(entry.meta)
                 if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
+                    lines.append(f"    <requires>{_escape_xml(missing)}</requires>")
             
             lines.append(f"  </skill>")
         lines.append("</skills>")
         
         return "\n".join(lines)
     
-    def _get_missing_requirements(self, skill_meta: dict) -> str:
+    def _is_available(self, kind: str, name: str) -> bool:
+        """Check a binary on PATH or an environment variable, cached for REQUIREMENTS_TTL."""
+        now = time.monotonic()
+        cached = self._available_cache.get((kind, name))
+        if cached and now - cached[0] < REQUIREMENTS_TTL:
+            return cached[1]
+        ok = bool(shutil.which(name)) if kind == "bin" else bool(os.environ.get(name))
+        self._available_cache[(kind, name)] = (now, ok)
+        return ok
+    
+    def _get_missing_requirements(self, skill_meta: SkillMeta) -> str:
         """Get a description of missing requirements."""
-        missing = []
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                missing.append(f"CLI: {b}")
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                missing.append(f"ENV: {env}")
+        missing = [f"CLI: {b}" for b in skill_meta.requires_bins if not self._is_available("bin", b)]
+        missing += [f"ENV: {e}" for e in skill_meta.requires_env if not self._is_available("env", e)]
+        if skill_meta.os and sys.platform not in skill_meta.os:
+            missing.append(f"OS: {'/'.join(skill_meta.os)}")
         return ", ".join(missing)
     
     def _get_skill_description(self, name: str) -> str:
         """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+        entry = self.get_entry(name)
+        return entry.description if entry else name
     
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
-        if content.startswith("---"):
-            match = re.match(r"^---\n.*?\n---\n", content, re.DOTALL)
-            if match:
-                return content[match.end():].strip()
-        return content
-    
-    def _parse_nanobot_metadata(self, raw: str) -> dict:
-        """Parse nanobot metadata JSON from frontmatter."""
-        try:
-            data = json.loads(raw)
-            return data.get("nanobot", {}) if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
-    
-    def _check_requirements(self, skill_meta: dict) -> bool:
-        """Check if skill requirements are met (bins, env vars)."""
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                return False
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                return False
-        return True
-    
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
+        return _strip_frontmatter(content)
+    
+    def _check_requirements(self, skill_meta: SkillMeta) -> bool:
+        """Check if skill requirements are met (bins, env vars, OS)."""
+        return (
+            all(self._is_available("bin", b) for b in skill_meta.requires_bins)
+            and all(self._is_available("env", e) for e in skill_meta.requires_env)
+            and (not skill_meta.os or sys.platform in skill_meta.os)
+        )
+    
+    def _get_skill_meta(self, name: str) -> SkillMeta | None:
+        """Get the structured metadata for a skill (cached in the index)."""
+        entry = self.get_entry(name)
+        return entry.meta if entry else None
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [
+            e.name for e in self.entries()
+            if e.meta.always and self._check_requirements(e.meta)
+        ]
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,19 +441,7 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
+        entry = self.get_entry(name)
+        if not entry or not entry.metadata:
             return None
-        
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        return dict(entry.metadata)
@@ -2,19 +2,306 @@
 
 import asyncio
 import json
+import time
 import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from loguru import logger
 
-from nanobot.bus.events import InboundMessage
+from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.agent.compaction import make_compactor
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache
+from nanobot.agent.tools.output import ReadArtifactTool, make_output_manager
+from nanobot.agent.task_journal import TaskJournal, write_checkpoint
+
+
+# Finished tasks kept for the subagents tool
+FINISHED_HISTORY = 50
+
+# Restarts after which an interrupted task is reported as failed instead of resumed
+MAX_RESUMES = 2
+
+_STATUS_TEXT = {
+    "ok": "completed successfully",
+    "timeout": "timed out",
+    "budget": "stopped at its token budget",
+    "error": "failed",
+    "cancelled": "was cancelled before finishing",
+}
+
+
+@dataclass
+class SubagentTask:
+    """A spawned background task and its bookkeeping."""
+    id: str
+    task: str
+    label: str
+    origin: dict[str, str]
+    status: str = "pending"  # pending, running, ok, error, timeout, budget, cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    iterations: int = 0
+    tokens: int = 0
+    current_tool: str | None = None
+    result: str | None = None
+    progress_at: float | None = None  # Last progress update sent
+    group_id: str | None = None
+    resumes: int = 0  # Times resumed from the journal after a restart
+    cancel_requested: bool = False
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Journal entry for this task."""
+        data = asdict(self)
+        for transient in ("current_tool", "progress_at", "cancel_requested"):
+            data.pop(transient)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SubagentTask":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+    
+    @property
+    def session_key(self) -> str:
+        return f"{self.origin['channel']}:{self.origin['chat_id']}"
+    
+    @property
+    def active(self) -> bool:
+        return self.status in ("pending", "running")
+    
+    def describe(self) -> str:
+        """One-line status for the subagents tool."""
+        if self.status == "pending":
+            return f"[{self.id}] {self.label}: queued for {time.time() - self.created_at:.0f}s"
+        elapsed = (self.finished_at or time.time()) - (self.started_at or self.created_at)
+        line = (
+            f"[{self.id}] {self.label}: {self.status}, {elapsed:.0f}s, "
+            f"{self.iterations} iterations, {self.tokens} tokens"
+        )
+        if self.status == "running" and self.current_tool:
+            line += f", running {self.current_tool}"
+        if self.group_id:
+            line += f" (group {self.group_id})"
+        return line
+
+
+@dataclass
+class SubagentGroup:
+    """Tasks spawned together whose results are announced as one message."""
+    id: str
+    members: list[SubagentTask]
+    wait_for: int  # Successful members needed before announcing
+    timer: asyncio.TimerHandle | None = None
+    timed_out: bool = False
+
+
+class SubagentRunner:
+    """
+    Builds a subagent's tools and runs its agent loop.
+    
+    Used directly in the gateway process, and inside worker processes when
+    subagents run in process mode (see subagent_worker.py).
+    """
+    
+    def __init__(
+        self,
+        provider: LLMProvider,
+        workspace: Path,
+        model: str,
+        brave_api_key: str | None,
+        exec_config: "ExecToolConfig",
+        web_fetch_config: "WebFetchConfig",
+        web_cache: WebCache | None,
+        tool_output_config: "ToolOutputConfig",
+        compaction_config: "CompactionConfig",
+        restrict_to_workspace: bool,
+        max_iterations: int,
+        max_tokens: int,
+    ):
+        self.provider = provider
+        self.workspace = workspace
+        self.model = model
+        self.brave_api_key = brave_api_key
+        self.exec_config = exec_config
+        self.web_fetch_config = web_fetch_config
+        self.web_cache = web_cache
+        self.tool_output_config = tool_output_config
+        self.compaction_config = compaction_config
+        self.restrict_to_workspace = restrict_to_workspace
+        self.max_iterations = max_iterations
+        self.max_tokens = max_tokens
+    
+    async def run(
+        self,
+        task_id: str,
+        task: str,
+        on_progress: Callable[[dict[str, Any]], None] | None = None,
+        checkpoint_path: Path | None = None,
+        resume: dict[str, Any] | None = None,
+    ) -> tuple[str, str]:
+        """
+        Run the task to completion or until a limit is hit.
+        
+        Args:
+            task_id: Task id (for logging).
+            task: The task description.
+            on_progress: Called with {"iteration", "tokens", "tool"} as the loop advances.
+            checkpoint_path: Where to store the transcript after each iteration.
+            resume: A checkpoint to continue from instead of starting over.
+        
+        Returns:
+            (status, result) where status is "ok" or "budget".
+        """
+        iteration = resume["iteration"] if resume else 0
+        tokens = resume["tokens"] if resume else 0
+        
+        def progress(tool: str | None = None) -> None:
+            if on_progress:
+                on_progress({"iteration": iteration, "tokens": tokens, "tool": tool})
+        
+        # Build subagent tools (no message tool, no spawn tool)
+        tools = ToolRegistry()
+        allowed_dir = self.workspace if self.restrict_to_workspace else None
+        tools.register(ReadFileTool(allowed_dir=allowed_dir))
+        tools.register(WriteFileTool(allowed_dir=allowed_dir))
+        tools.register(ListDirTool(allowed_dir=allowed_dir))
+        tools.register(ExecTool(
+            working_dir=str(self.workspace),
+            timeout=self.exec_config.timeout,
+            restrict_to_workspace=self.restrict_to_workspace,
+        ))
+        tools.register(WebSearchTool(api_key=self.brave_api_key))
+        tools.register(WebFetchTool(
+            max_chars=self.web_fetch_config.max_chars,
+            cache=self.web_cache,
+            max_html_chars=self.web_fetch_config.max_html_chars,
+            extract_workers=self.web_fetch_config.extract_workers,
+            max_bytes=self.web_fetch_config.max_bytes,
+        ))
+        # The whole task counts as one turn for the output budget
+        output = make_output_manager(self.workspace, self.tool_output_config)
+        output_budget = output.new_budget()
+        tools.register(ReadArtifactTool(output))
+        compactor = make_compactor(self.compaction_config, self.provider, store=output)
+        
+        # Build messages with subagent-specific prompt
+        system_prompt = self._build_subagent_prompt(task)
+        messages: list[dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+        if resume:
+            logger.info(f"Subagent [{task_id}] resuming after iteration {iteration}")
+            messages += resume["messages"]
+        else:
+            messages.append({"role": "user", "content": task})
+        
+        last_content = ""
+        while iteration < self.max_iterations:
+            iteration += 1
+            progress()
+            
+            if compactor:
+                await compactor.maybe_compact(messages)
+            
+            response = await self.provider.chat(
+                messages=messages,
+                tools=tools.get_definitions(),
+                model=self.model,
+            )
+            usage = response.usage or {}
+            tokens += usage.get("total_tokens") or (
+                usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+            )
+            
+            if not response.has_tool_calls:
+                progress()
+                return "ok", response.content or "Task completed but no final response was generated."
+            
+            last_content = response.content or last_content
+            if self.max_tokens and tokens >= self.max_tokens:
+                progress()
+                partial = f" Last progress note: {last_content}" if last_content else ""
+                return "budget", (
+                    f"Stopped after {iteration} iterations: used {tokens} tokens "
+                    f"(budget {self.max_tokens}).{partial}"
+                )
+            
+            # Add assistant message with tool calls
+            tool_call_dicts = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.name,
+                        "arguments": json.dumps(tc.arguments),
+                    },
+                }
+                for tc in response.tool_calls
+            ]
+            messages.append({
+                "role": "assistant",
+                "content": response.content or "",
+                "tool_calls": tool_call_dicts,
+            })
+            
+            # Execute tools
+            for tool_call in response.tool_calls:
+                args_str = json.dumps(tool_call.arguments)
+                logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
+                progress(tool_call.name)
+                result = await tools.execute(tool_call.name, tool_call.arguments)
+                result = output.process(tool_call.name, result, output_budget)
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": tool_call.name,
+                    "content": result,
+                })
+            
+            if checkpoint_path:
+                write_checkpoint(checkpoint_path, iteration, tokens, messages[1:])
+        
+        progress()
+        return "ok", last_content or "Task completed but no final response was generated."
+    
+    def _build_subagent_prompt(self, task: str) -> str:
+        """Build a focused system prompt for the subagent."""
+        return f"""# Subagent
+
+You are a subagent spawned by the main agent to complete a specific task.
+
+## Your Task
+{task}
+
+## Rules
+1. Stay focused - complete only the assigned task, nothing else
+2. Your final response will be reported back to the main agent
+3. Do not initiate conversations or take on side tasks
+4. Be concise but informative in your findings
+
+## What You Can Do
+- Read and write files in the workspace
+- Execute shell commands
+- Search the web and fetch web pages
+- Complete the task thoroughly
+
+## What You Cannot Do
+- Send messages directly to users (no message tool available)
+- Spawn other subagents
+- Access the main agent's conversation history
+
+## Workspace
+Your workspace is at: {self.workspace}
+
+When you have completed the task, provide a clear summary of your findings or actions."""
 
 
 class SubagentManager:
@@ -24,6 +311,15 @@ class SubagentManager:
     Subagents are lightweight agent instances that run in the background
     to handle specific tasks. They share the same LLM provider but have
     isolated context and a focused system prompt.
+    
+    At most max_concurrent subagents run at once; further tasks wait in a
+    bounded queue, and each origin chat may only have max_per_session tasks
+    running or queued. Every task has an iteration limit, a timeout and a
+    token budget, and can be listed or cancelled through the subagents tool.
+    
+    spawn_group() fans out several tasks and announces their results in a
+    single message once all (or the first k) succeed or the join times out,
+    so the main agent needs one follow-up turn instead of one per task.
     """
     
     def __init__(
@@ -34,17 +330,35 @@ class SubagentManager:
         model: str | None = None,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_cache: WebCache | None = None,
+        tool_output_config: "ToolOutputConfig | None" = None,
+        compaction_config: "CompactionConfig | None" = None,
+        subagent_config: "SubagentConfig | None" = None,
+        journal: TaskJournal | None = None,
         restrict_to_workspace: bool = False,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import (
+            CompactionConfig, ExecToolConfig, SubagentConfig, ToolOutputConfig, WebFetchConfig,
+        )
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
         self.model = model or provider.get_default_model()
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_cache = web_cache
+        self.tool_output_config = tool_output_config or ToolOutputConfig()
+        self.compaction_config = compaction_config or CompactionConfig()
+        self.config = subagent_config or SubagentConfig()
+        self.journal = journal
         self.restrict_to_workspace = restrict_to_workspace
+        self._tasks: dict[str, SubagentTask] = {}
+        self._pending: deque[str] = deque()
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        self._groups: dict[str, SubagentGroup] = {}
+        self._announcing: set[asyncio.Task[None]] = set()
     
     async def spawn(
         self,
@@ -65,116 +379,361 @@ class SubagentManager:
         Returns:
             Status message indicating the subagent was started.
         """
-        task_id = str(uuid.uuid4())[:8]
-        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
+        origin = {
+            "channel": origin_channel,
+            "chat_id": origin_chat_id,
+        }
+        record = self._new_task(task, label, origin)
+        error = self._admit([record])
+        if error:
+            return error
+        self._enqueue([record])
         
+        if record.status == "pending":
+            logger.info(f"Queued subagent [{record.id}]: {record.label} (position {len(self._pending)})")
+            return (
+                f"Subagent [{record.label}] queued (id: {record.id}, position {len(self._pending)}). "
+                f"It will start when a slot frees up and I'll notify you when it completes."
+            )
+        return f"Subagent [{record.label}] started (id: {record.id}). I'll notify you when it completes."
+    
+    async def spawn_group(
+        self,
+        tasks: list[dict[str, str]],
+        wait_for: int | None = None,
+        timeout: int | None = None,
+        origin_channel: str = "cli",
+        origin_chat_id: str = "direct",
+    ) -> str:
+        """
+        Spawn several subagents whose results are announced together.
+        
+        Args:
+            tasks: Dicts with "task" and optional "label".
+            wait_for: Announce once this many tasks succeeded and cancel the rest (default: all).
+            timeout: Announce after this many seconds with whatever has finished
+                (default: config.group_timeout).
+            origin_channel: The channel to announce results to.
+            origin_chat_id: The chat ID to announce results to.
+        
+        Returns:
+            Status message indicating the group was started.
+        """
+        if not tasks:
+            return "Error: no tasks given"
         origin = {
             "channel": origin_channel,
             "chat_id": origin_chat_id,
         }
+        records = [self._new_task(t["task"], t.get("label"), origin) for t in tasks]
+        error = self._admit(records)
+        if error:
+            return error
         
-        # Create background task
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
+        group = SubagentGroup(
+            id=str(uuid.uuid4())[:8],
+            members=records,
+            wait_for=min(wait_for or len(records), len(records)),
         )
-        self._running_tasks[task_id] = bg_task
-        
-        # Cleanup when done
-        bg_task.add_done_callback(lambda _: self._running_tasks.pop(task_id, None))
+        for record in records:
+            record.group_id = group.id
+        self._groups[group.id] = group
+        timeout = timeout or self.config.group_timeout
+        if timeout:
+            group.timer = asyncio.get_running_loop().call_later(
+                timeout, lambda: self._finish_group(group, timed_out=True),
+            )
+        self._enqueue(records)
         
-        logger.info(f"Spawned subagent [{task_id}]: {display_label}")
-        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+        logger.info(f"Spawned subagent group [{group.id}] of {len(records)} tasks (waiting for {group.wait_for})")
+        ids = ", ".join(f"{r.label} ({r.id})" for r in records)
+        return (
+            f"Started {len(records)} subagents as group {group.id}: {ids}. "
+            f"I'll report their results together once {group.wait_for} of them have finished."
+        )
     
-    async def _run_subagent(
-        self,
-        task_id: str,
-        task: str,
-        label: str,
-        origin: dict[str, str],
-    ) -> None:
-        """Execute the subagent task and announce the result."""
-        logger.info(f"Subagent [{task_id}] starting task: {label}")
-        
+    def _new_task(self, task: str, label: str | None, origin: dict[str, str]) -> SubagentTask:
+        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
+        return SubagentTask(str(uuid.uuid4())[:8], task, display_label, origin)
+    
+    def _admit(self, records: list[SubagentTask]) -> str | None:
+        """Check the session and queue limits for new tasks. Returns an error message if over."""
+        session_key = records[0].session_key
+        active = [t for t in self._tasks.values() if t.active and t.session_key == session_key]
+        if len(active) + len(records) > self.config.max_per_session:
+            return (
+                f"Error: this chat already has {len(active)} background tasks running or queued "
+                f"and {len(records)} more would exceed the limit of {self.config.max_per_session}. "
+                f"Wait for one to finish or cancel one first."
+            )
+        free = self.config.max_concurrent - len(self._running_tasks) + self.config.max_pending - len(self._pending)
+        if len(records) > free:
+            return f"Error: the background task queue is full ({self.config.max_pending} waiting). Try again later."
+        return None
+    
+    def _enqueue(self, records: list[SubagentTask]) -> None:
+        for record in records:
+            self._tasks[record.id] = record
+            self._pending.append(record.id)
+            self._journal(record)
+        self._pump()
+    
+    def _journal(self, record: SubagentTask) -> None:
+        if self.journal:
+            self.journal.record(record.to_dict())
+    
+    def _pump(self) -> None:
+        """Start queued tasks while there are free slots."""
+        while self._pending and len(self._running_tasks) < self.config.max_concurrent:
+            record = self._tasks[self._pending.popleft()]
+            record.status = "running"
+            record.started_at = record.started_at or time.time()
+            self._journal(record)
+            bg_task = asyncio.create_task(self._run_subagent(record))
+            self._running_tasks[record.id] = bg_task
+            bg_task.add_done_callback(lambda _, task_id=record.id: self._on_done(task_id))
+            logger.info(f"Spawned subagent [{record.id}]: {record.label}")
+    
+    def _on_done(self, task_id: str) -> None:
+        self._running_tasks.pop(task_id, None)
+        record = self._tasks.get(task_id)
+        if record and record.active:
+            # Cancelled before it could record a status: on shutdown the journal
+            # entry stays unfinished, a requested cancel is final
+            record.status = "cancelled"
+            record.finished_at = time.time()
+            if record.cancel_requested:
+                self._journal(record)
+                self._member_finished(record)
+        finished = [t.id for t in self._tasks.values() if not t.active]
+        for old in finished[:max(0, len(finished) - FINISHED_HISTORY)]:
+            del self._tasks[old]
+        self._pump()
+    
+    async def _run_subagent(self, record: SubagentTask) -> None:
+        """Execute the subagent task under its limits and announce the result."""
+        logger.info(f"Subagent [{record.id}] starting task: {record.label}")
         try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            allowed_dir = self.workspace if self.restrict_to_workspace else None
-            tools.register(ReadFileTool(allowed_dir=allowed_dir))
-            tools.register(WriteFileTool(allowed_dir=allowed_dir))
-            tools.register(ListDirTool(allowed_dir=allowed_dir))
-            tools.register(ExecTool(
-                working_dir=str(self.workspace),
-                timeout=self.exec_config.timeout,
-                restrict_to_workspace=self.restrict_to_workspace,
-            ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
-            
-            # Build messages with subagent-specific prompt
-            system_prompt = self._build_subagent_prompt(task)
-            messages: list[dict[str, Any]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task},
-            ]
-            
-            # Run agent loop (limited iterations)
-            max_iterations = 15
-            iteration = 0
-            final_result: str | None = None
-            
-            while iteration < max_iterations:
-                iteration += 1
-                
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                )
-                
-                if response.has_tool_calls:
-                    # Add assistant message with tool calls
-                    tool_call_dicts = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
-                            },
-                        }
-                        for tc in response.tool_calls
-                    ]
-                    messages.append({
-                        "role": "assistant",
-                        "content": response.content or "",
-                        "tool_calls": tool_call_dicts,
-                    })
-                    
-                    # Execute tools
-                    for tool_call in response.tool_calls:
-                        args_str = json.dumps(tool_call.arguments)
-                        logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_call.name,
-                            "content": result,
-                        })
-                else:
-                    final_result = response.content
-                    break
-            
-            if final_result is None:
-                final_result = "Task completed but no final response was generated."
-            
-            logger.info(f"Subagent [{task_id}] completed successfully")
-            await self._announce_result(task_id, label, task, final_result, origin, "ok")
-            
+            status, result = await asyncio.wait_for(
+                self._execute(record), timeout=self.config.timeout or None,
+            )
+        except asyncio.TimeoutError:
+            status, result = "timeout", f"Stopped after {self.config.timeout}s without finishing."
+        except asyncio.CancelledError:
+            if not record.cancel_requested:
+                # Shutdown: the journal entry stays unfinished so the task is recovered on restart
+                raise
+            record.status = "cancelled"
+            record.finished_at = time.time()
+            logger.info(f"Subagent [{record.id}] cancelled")
+            self._journal(record)
+            self._member_finished(record)
+            return
         except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            logger.error(f"Subagent [{task_id}] failed: {e}")
-            await self._announce_result(task_id, label, task, error_msg, origin, "error")
+            status, result = "error", f"Error: {str(e)}"
+        
+        record.status, record.result = status, result
+        record.finished_at = time.time()
+        record.current_tool = None
+        self._journal(record)
+        if status == "ok":
+            logger.info(f"Subagent [{record.id}] completed successfully")
+        else:
+            logger.error(f"Subagent [{record.id}] {_STATUS_TEXT[status]}: {result[:200]}")
+        if record.group_id:
+            self._member_finished(record)
+        else:
+            await self._announce_result(record.id, record.label, record.task, result, record.origin, status)
+    
+    def _member_finished(self, record: SubagentTask) -> None:
+        """Finish the task's group once enough members are done."""
+        group = self._groups.get(record.group_id or "")
+        if not group:
+            return
+        succeeded = sum(1 for m in group.members if m.status == "ok")
+        if succeeded >= group.wait_for or all(not m.active for m in group.members):
+            self._finish_group(group)
+    
+    def _finish_group(self, group: SubagentGroup, timed_out: bool = False) -> None:
+        """Cancel unfinished members and announce the merged result (once)."""
+        if self._groups.pop(group.id, None) is None:
+            return
+        if group.timer:
+            group.timer.cancel()
+        group.timed_out = timed_out
+        stopping = []
+        for member in group.members:
+            if member.active:
+                if member.id in self._running_tasks:
+                    stopping.append(self._running_tasks[member.id])
+                self.cancel(member.id)
+        task = asyncio.create_task(self._announce_group(group, stopping))
+        self._announcing.add(task)
+        task.add_done_callback(self._announcing.discard)
+    
+    async def _announce_group(self, group: SubagentGroup, stopping: list[asyncio.Task] | None = None) -> None:
+        """Announce all of a group's results as one system message, once the cancelled members have stopped."""
+        if stopping:
+            await asyncio.gather(*stopping, return_exceptions=True)
+        members = group.members
+        done = [m for m in members if m.status == "ok"]
+        header = f"{len(done)}/{len(members)} tasks completed" + (", join timed out" if group.timed_out else "")
+        sections, texts = [], []
+        for m in members:
+            state = _STATUS_TEXT.get(m.status, _STATUS_TEXT["cancelled"])
+            body = "(no result)" if m.status == "cancelled" else m.result or "(no result)"
+            sections.append(f"### {m.label} ({state})\nTask: {m.task}\n\nResult:\n{body}")
+            texts.append(f"{'✅' if m.status == 'ok' else '⚠️'} {m.label} {state}:\n{body}")
+        
+        announce_content = (
+            f"[Subagent group {group.id} finished: {header}]\n\n" + "\n\n".join(sections) +
+            "\n\nCombine these results into one brief answer for the user. "
+            "Do not mention technical details like \"subagent\", groups or task IDs."
+        )
+        origin = members[0].origin
+        msg = InboundMessage(
+            channel="system",
+            sender_id="subagent",
+            chat_id=f"{origin['channel']}:{origin['chat_id']}",
+            content=announce_content,
+            metadata={"subagent": {
+                "task_id": group.id,
+                "label": f"group of {len(members)}",
+                "status": "ok" if len(done) >= group.wait_for else "partial",
+                "delivery": self.config.delivery,
+                "text": f"Background tasks finished ({header}):\n\n" + "\n\n".join(texts),
+            }},
+        )
+        await self.bus.publish_inbound(msg)
+        logger.info(f"Subagent group [{group.id}] announced: {header}")
+    
+    async def _execute(self, record: SubagentTask) -> tuple[str, str]:
+        """Run the subagent in this process or a worker process. Returns (status, result)."""
+        def on_progress(event: dict[str, Any]) -> None:
+            record.iterations = event["iteration"]
+            record.tokens = event["tokens"]
+            record.current_tool = event.get("tool")
+            self._publish_progress(record)
+        
+        checkpoint_path = self.journal.checkpoint_path(record.id) if self.journal else None
+        resume = self.journal.load_checkpoint(record.id) if self.journal and record.resumes else None
+        
+        if self.config.mode == "process":
+            from nanobot.agent.subagent_worker import run_in_process
+            spec = {
+                "task_id": record.id,
+                "task": record.task,
+                "runner": self._runner_kwargs(web_cache=None),
+                "checkpoint_path": checkpoint_path,
+                "resume": resume,
+                "memory_mb": self.config.worker_memory_mb,
+                "cpu_seconds": self.config.worker_cpu_seconds,
+            }
+            return await run_in_process(spec, on_progress)
+        
+        runner = SubagentRunner(**self._runner_kwargs(web_cache=self.web_cache))
+        return await runner.run(record.id, record.task, on_progress, checkpoint_path, resume)
+    
+    def _runner_kwargs(self, web_cache: WebCache | None) -> dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "workspace": self.workspace,
+            "model": self.model,
+            "brave_api_key": self.brave_api_key,
+            "exec_config": self.exec_config,
+            "web_fetch_config": self.web_fetch_config,
+            "web_cache": web_cache,
+            "tool_output_config": self.tool_output_config,
+            "compaction_config": self.compaction_config,
+            "restrict_to_workspace": self.restrict_to_workspace,
+            "max_iterations": self.config.max_iterations,
+            "max_tokens": self.config.max_tokens,
+        }
+    
+    async def recover(self) -> int:
+        """
+        Deal with tasks a previous run left queued or running (call once at startup).
+        
+        With recovery = "resume" they are queued again and continue from their
+        last checkpoint; otherwise, or once a task has been resumed MAX_RESUMES
+        times, the origin chat is told it failed. Group joins are not restored:
+        recovered members report individually.
+        
+        Returns:
+            Number of tasks recovered.
+        """
+        if not self.journal:
+            return 0
+        entries = self.journal.unfinished()
+        for data in entries:
+            record = SubagentTask.from_dict(data)
+            record.group_id = None
+            if self.config.recovery == "resume" and record.resumes < MAX_RESUMES:
+                record.resumes += 1
+                record.status = "pending"
+                logger.info(f"Resuming subagent [{record.id}] after restart: {record.label}")
+                self._enqueue([record])
+                continue
+            record.status = "error"
+            record.result = "The task was interrupted by a restart and could not be resumed."
+            record.finished_at = time.time()
+            self._tasks[record.id] = record
+            self._journal(record)
+            await self._announce_result(record.id, record.label, record.task, record.result, record.origin, "error")
+        return len(entries)
+    
+    def cancel(self, task_id: str, session_key: str | None = None) -> str:
+        """Cancel a queued or running task (optionally only if it belongs to session_key)."""
+        record = self._tasks.get(task_id)
+        if not record or (session_key and record.session_key != session_key):
+            return f"Error: no background task with id {task_id}"
+        if not record.active:
+            return f"Task [{task_id}] already finished ({record.status})"
+        logger.info(f"Cancelling subagent [{task_id}]: {record.label}")
+        record.cancel_requested = True
+        if record.status == "pending":
+            self._pending.remove(task_id)
+            record.status = "cancelled"
+            record.finished_at = time.time()
+            self._journal(record)
+            self._member_finished(record)
+        else:
+            self._running_tasks[task_id].cancel()
+        return f"Cancelled task [{task_id}] {record.label}"
+    
+    def get_task(self, task_id: str) -> SubagentTask | None:
+        """Get a task by id."""
+        return self._tasks.get(task_id)
+    
+    def list_tasks(self, session_key: str | None = None, include_finished: bool = True) -> list[SubagentTask]:
+        """Tasks in spawn order, optionally limited to one origin chat."""
+        return [
+            t for t in self._tasks.values()
+            if (not session_key or t.session_key == session_key) and (include_finished or t.active)
+        ]
+    
+    def _publish_progress(self, record: SubagentTask) -> None:
+        """Send a throttled progress update for a running task to its origin chat."""
+        interval = self.config.progress_interval
+        now = time.time()
+        if not interval or now - (record.progress_at or record.started_at or now) < interval:
+            return
+        record.progress_at = now
+        elapsed = now - (record.started_at or now)
+        activity = f"running {record.current_tool}" if record.current_tool else "thinking"
+        self.bus.publish_outbound_nowait(OutboundMessage(
+            channel=record.origin["channel"],
+            chat_id=record.origin["chat_id"],
+            content=f"⏳ {record.label}: step {record.iterations}, {activity} ({elapsed:.0f}s)",
+            metadata={"subagent_progress": {
+                "task_id": record.id,
+                "label": record.label,
+                "iteration": record.iterations,
+                "tool": record.current_tool,
+                "tokens": record.tokens,
+                "elapsed": round(elapsed, 1),
+            }},
+        ))
     
     async def _announce_result(
         self,
@@ -186,7 +745,7 @@ class SubagentManager:
         status: str,
     ) -> None:
         """Announce the subagent result to the main agent via the message bus."""
-        status_text = "completed successfully" if status == "ok" else "failed"
+        status_text = _STATUS_TEXT.get(status, "failed")
         
         announce_content = f"""[Subagent '{label}' {status_text}]
 
@@ -197,48 +756,26 @@ Result:
 
 Summarize this naturally for the user. Keep it brief (1-2 sentences). Do not mention technical details like "subagent" or task IDs."""
         
-        # Inject as system message to trigger main agent
+        # Inject as system message to trigger main agent. In direct delivery
+        # mode the loop sends `text` as-is instead of running an LLM turn.
+        icon = "✅" if status == "ok" else "⚠️"
         msg = InboundMessage(
             channel="system",
             sender_id="subagent",
             chat_id=f"{origin['channel']}:{origin['chat_id']}",
             content=announce_content,
+            metadata={"subagent": {
+                "task_id": task_id,
+                "label": label,
+                "status": status,
+                "delivery": self.config.delivery,
+                "text": f"{icon} {label} {status_text}:\n\n{result}",
+            }},
         )
         
         await self.bus.publish_inbound(msg)
         logger.debug(f"Subagent [{task_id}] announced result to {origin['channel']}:{origin['chat_id']}")
     
-    def _build_subagent_prompt(self, task: str) -> str:
-        """Build a focused system prompt for the subagent."""
-        return f"""# Subagent
-
-You are a subagent spawned by the main agent to complete a specific task.
-
-## Your Task
-{task}
-
-## Rules
-1. Stay focused - complete only the assigned task, nothing else
-2. Your final response will be reported back to the main agent
-3. Do not initiate conversations or take on side tasks
-4. Be concise but informative in your findings
-
-## What You Can Do
-- Read and write files in the workspace
-- Execute shell commands
-- Search the web and fetch web pages
-- Complete the task thoroughly
-
-## What You Cannot Do
-- Send messages directly to users (no message tool available)
-- Spawn other subagents
-- Access the main agent's conversation history
-
-## Workspace
-Your workspace is at: {self.workspace}
-
-When you have completed the task, provide a clear summary of your findings or actions."""
-    
     def get_running_count(self) -> int:
         """Return the number of currently running subagents."""
         return len(self._running_tasks)
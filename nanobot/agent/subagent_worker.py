@@ -0,0 +1,156 @@
+"""Process-isolated subagent execution.
+
+Each task runs in a fresh worker process started with the "spawn" method.
+The parent sends a spec (task, runner settings, resource limits) as the
+process argument; the worker sends messages back over a pipe:
+
+    {"type": "progress", "iteration": int, "tokens": int, "tool": str | None}
+    {"type": "result", "status": str, "result": str}
+
+A fresh process per task keeps the CPU-time limit per task and makes
+cancellation a plain terminate().
+"""
+
+import asyncio
+import multiprocessing
+import signal
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds between checks of the pipe and the worker's liveness
+_POLL_INTERVAL = 0.2
+
+
+def apply_limits(memory_mb: int = 0, cpu_seconds: int = 0) -> None:
+    """Lower this process's address-space and CPU-time limits (no-op where unsupported)."""
+    if resource is None:
+        return
+    if memory_mb:
+        _set_limit(resource.RLIMIT_AS, memory_mb * 1024 * 1024, memory_mb * 1024 * 1024)
+    if cpu_seconds:
+        # SIGXCPU at the soft limit, SIGKILL shortly after at the hard limit
+        _set_limit(resource.RLIMIT_CPU, cpu_seconds, cpu_seconds + 5)
+
+
+def _set_limit(kind: int, soft: int, hard: int) -> None:
+    _, current_hard = resource.getrlimit(kind)
+    if current_hard != resource.RLIM_INFINITY:
+        soft, hard = min(soft, current_hard), min(hard, current_hard)
+    try:
+        resource.setrlimit(kind, (soft, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Cannot set resource limit {kind}: {e}")
+
+
+def worker_main(conn: Connection, spec: dict[str, Any]) -> None:
+    """Entry point of a worker process."""
+    apply_limits(spec.get("memory_mb", 0), spec.get("cpu_seconds", 0))
+    try:
+        from nanobot.agent.subagent import SubagentRunner
+        from nanobot.agent.tools.web_cache import make_web_cache
+
+        kwargs = dict(spec["runner"])
+        kwargs["web_cache"] = make_web_cache(kwargs["web_fetch_config"])
+        runner = SubagentRunner(**kwargs)
+        status, result = asyncio.run(runner.run(
+            spec["task_id"], spec["task"],
+            on_progress=lambda event: conn.send({"type": "progress", **event}),
+            checkpoint_path=spec.get("checkpoint_path"),
+            resume=spec.get("resume"),
+        ))
+    except BaseException as e:  # MemoryError, KeyboardInterrupt, ... still get reported
+        status, result = "error", f"Error: {type(e).__name__}: {e}"
+    try:
+        conn.send({"type": "result", "status": status, "result": result})
+    finally:
+        conn.close()
+
+
+async def run_in_process(
+    spec: dict[str, Any],
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> tuple[str, str]:
+    """
+    Run a subagent task in a worker process.
+
+    Cancelling the calling task (e.g. on timeout) terminates the worker.
+
+    Returns:
+        (status, result) as reported by the worker, or ("error", ...) if it died.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=worker_main,
+        args=(child_conn, spec),
+        name=f"nanobot-subagent-{spec['task_id']}",
+        daemon=True,
+    )
+    process.start()
+    child_conn.close()
+    logger.debug(f"Subagent [{spec['task_id']}] running in worker pid {process.pid}")
+    finished = False
+    try:
+        while True:
+            message = await _receive(parent_conn, process)
+            if message is None:
+                finished = True
+                return "error", f"Error: worker process exited unexpectedly ({await _describe_exit(process)})"
+            if message["type"] == "result":
+                finished = True
+                return message["status"], message["result"]
+            if on_progress:
+                on_progress({k: v for k, v in message.items() if k != "type"})
+    finally:
+        parent_conn.close()
+        await _stop(process, graceful=finished)
+
+
+async def _receive(conn: Connection, process: multiprocessing.Process) -> dict[str, Any] | None:
+    """Next message from the worker, or None once it has exited with nothing left to read."""
+    while True:
+        if await asyncio.to_thread(conn.poll, _POLL_INTERVAL):
+            try:
+                return conn.recv()
+            except EOFError:
+                return None
+        if not process.is_alive() and not conn.poll():
+            return None
+
+
+async def _join(process: multiprocessing.Process, timeout: float) -> None:
+    """Wait for the worker to exit without blocking the event loop."""
+    await asyncio.to_thread(process.join, timeout)
+
+
+async def _describe_exit(process: multiprocessing.Process) -> str:
+    await _join(process, 1)
+    code = process.exitcode
+    if code is not None and code < 0:
+        try:
+            reason = signal.Signals(-code).name
+        except ValueError:
+            reason = f"signal {-code}"
+        if reason == "SIGXCPU":
+            reason += ", CPU-time limit reached"
+        return reason
+    return f"exit code {code}"
+
+
+async def _stop(process: multiprocessing.Process, graceful: bool) -> None:
+    if graceful:
+        # The worker exits right after sending its result
+        await _join(process, 1)
+    if process.is_alive():
+        process.terminate()
+        await _join(process, 1)
+    if process.is_alive():
+        process.kill()
+        await _join(process, 1)
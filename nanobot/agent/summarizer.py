@@ -0,0 +1,125 @@
+"""Rolling per-session conversation summaries."""
+
+import asyncio
+from typing import Any, Callable
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+from nanobot.session.manager import Session
+from nanobot.utils.helpers import estimate_message_tokens
+
+_SUMMARY_PROMPT = """You maintain the running summary of a long conversation between a user and an AI assistant.
+Merge the existing summary with the new messages into one updated summary.
+Keep durable facts about the user, decisions, open tasks, commitments and important results.
+Drop small talk and details that no longer matter. Write concise bullet points, at most {max_words} words."""
+
+
+class SessionSummarizer:
+    """
+    Folds older session messages into a running summary kept in session metadata.
+
+    metadata["summary"] holds the summary text and metadata["summary_upto"]
+    the index of the first message it does not cover; Session.get_history
+    replays only messages after it. Summarizing runs as a background task
+    after a turn is saved, so it never delays a reply.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str,
+        trigger_tokens: int = 8000,
+        keep_messages: int = 20,
+        max_words: int = 300,
+        on_update: Callable[[Session], None] | None = None,
+    ):
+        self.provider = provider
+        self.model = model
+        self.trigger_tokens = trigger_tokens
+        self.keep_messages = keep_messages
+        self.max_words = max_words
+        self.on_update = on_update
+        self._tasks: dict[str, asyncio.Task[bool]] = {}
+
+    def _fold_end(self, session: Session) -> int | None:
+        """Index to summarize up to, or None if the unsummarized history is still small."""
+        upto = session.metadata.get("summary_upto", 0)
+        if estimate_message_tokens(session.messages[upto:]) < self.trigger_tokens:
+            return None
+        # Fold up to a user message so the kept window starts a turn
+        limit = min(len(session.messages) - self.keep_messages, len(session.messages) - 1)
+        return next(
+            (i for i in range(limit, upto, -1) if session.messages[i]["role"] == "user"),
+            None,
+        )
+
+    def maybe_schedule(self, session: Session) -> asyncio.Task[bool] | None:
+        """Start a background summary of the session if it crossed the threshold."""
+        if session.key in self._tasks or self._fold_end(session) is None:
+            return None
+        task = asyncio.create_task(self.summarize(session))
+        self._tasks[session.key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(session.key, None))
+        return task
+
+    async def summarize(self, session: Session) -> bool:
+        """
+        Fold messages older than the recent window into the session summary.
+
+        Returns:
+            True if the summary was updated.
+        """
+        end = self._fold_end(session)
+        if end is None:
+            return False
+        upto = session.metadata.get("summary_upto", 0)
+        boundary = session.messages[end]
+        new_text = _format_messages(session.messages[upto:end])
+        previous = session.metadata.get("summary", "")
+
+        try:
+            response = await self.provider.chat(
+                messages=[
+                    {"role": "system", "content": _SUMMARY_PROMPT.format(max_words=self.max_words)},
+                    {"role": "user", "content": (
+                        f"Existing summary:\n{previous or '(none)'}\n\nNew messages:\n{new_text}"
+                    )},
+                ],
+                model=self.model,
+                max_tokens=max(256, self.max_words * 2),
+                temperature=0,
+            )
+        except Exception as e:
+            logger.warning(f"Session summary failed for {session.key}: {e}")
+            return False
+        summary = (response.content or "").strip()
+        if not summary or response.finish_reason == "error":
+            logger.warning(f"Session summary failed for {session.key}: {summary[:200]}")
+            return False
+
+        # Messages may have been added or trimmed meanwhile; re-locate the boundary
+        new_upto = next((i for i, m in enumerate(session.messages) if m is boundary), None)
+        if new_upto is None:
+            return False
+        session.metadata["summary"] = summary
+        session.metadata["summary_upto"] = new_upto
+        logger.debug(f"Summarized {end - upto} messages of {session.key}")
+        if self.on_update:
+            self.on_update(session)
+        return True
+
+
+def _format_messages(messages: list[dict[str, Any]], max_chars: int = 500) -> str:
+    """Render messages as plain text for the summarizer; tool output is abbreviated."""
+    lines = []
+    for m in messages:
+        content = m.get("content") or ""
+        if m["role"] == "tool":
+            lines.append(f"[{m.get('name', 'tool')} result] {content[:max_chars]}")
+        elif m.get("tool_calls"):
+            names = ", ".join(tc.get("function", {}).get("name", "?") for tc in m["tool_calls"])
+            lines.append(f"assistant: {content + ' ' if content else ''}[called {names}]")
+        else:
+            lines.append(f"{m['role']}: {content}")
+    return "\n".join(lines)
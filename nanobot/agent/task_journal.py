@@ -0,0 +1,84 @@
+"""Durable journal of subagent tasks, used to recover background work after a restart."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.helpers import atomic_write_text, ensure_dir
+
+# Statuses of tasks that had not finished when they were last recorded
+UNFINISHED = ("pending", "running")
+
+
+def write_checkpoint(path: Path, iteration: int, tokens: int, messages: list[dict[str, Any]]) -> None:
+    """Atomically store a task's progress and partial transcript (without the system prompt)."""
+    data = {"iteration": iteration, "tokens": tokens, "messages": messages}
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False))
+
+
+class TaskJournal:
+    """
+    One JSON file per subagent task (<id>.json) with its task, origin, status
+    and result, plus a checkpoint (<id>.checkpoint.json) holding the iteration
+    count and partial transcript after each completed iteration.
+
+    Files are replaced atomically, so a crash never leaves a half-written
+    entry. The oldest finished tasks beyond keep_finished are deleted.
+    """
+
+    def __init__(self, path: Path, keep_finished: int = 200):
+        self.path = path
+        self.keep_finished = keep_finished
+
+    def record(self, task: dict[str, Any]) -> None:
+        """Write (or replace) a task's entry."""
+        ensure_dir(self.path)
+        atomic_write_text(self.path / f"{task['id']}.json", json.dumps(task, ensure_ascii=False))
+        if task["status"] not in UNFINISHED:
+            self._prune()
+
+    def checkpoint_path(self, task_id: str) -> Path:
+        ensure_dir(self.path)
+        return self.path / f"{task_id}.checkpoint.json"
+
+    def load_checkpoint(self, task_id: str) -> dict[str, Any] | None:
+        """The last checkpoint of a task, or None if it never completed an iteration."""
+        return self._read(self.path / f"{task_id}.checkpoint.json")
+
+    def get(self, task_id: str) -> dict[str, Any] | None:
+        return self._read(self.path / f"{task_id}.json")
+
+    def entries(self) -> list[dict[str, Any]]:
+        """All recorded tasks, oldest first."""
+        if not self.path.exists():
+            return []
+        tasks = []
+        for file in self.path.glob("*.json"):
+            if file.name.endswith(".checkpoint.json"):
+                continue
+            data = self._read(file)
+            if data:
+                tasks.append(data)
+        return sorted(tasks, key=lambda t: t.get("created_at", 0))
+
+    def unfinished(self) -> list[dict[str, Any]]:
+        """Tasks that were queued or running when last recorded."""
+        return [t for t in self.entries() if t.get("status") in UNFINISHED]
+
+    def _prune(self) -> None:
+        finished = [t for t in self.entries() if t.get("status") not in UNFINISHED]
+        for task in finished[:max(0, len(finished) - self.keep_finished)]:
+            for name in (f"{task['id']}.json", f"{task['id']}.checkpoint.json"):
+                (self.path / name).unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, Any] | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Unreadable task journal entry {path.name}: {e}")
+            return None
@@ -1,7 +1,97 @@
 """Base class for agent tools."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
+
+# (value, path) -> error list
+Validator = Callable[[Any, str], list[str]]
+
+_TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+def compile_schema(schema: dict[str, Any]) -> Validator:
+    """
+    Compile a JSON schema into a validator closure.
+    
+    The schema is walked once here; validation only runs the checks that
+    apply to it. Supports type, enum, minimum/maximum, minLength/maxLength,
+    properties/required and items.
+    """
+    t = schema.get("type")
+    py_type = _TYPE_MAP.get(t)
+    checks: list[Callable[[Any, str, str, list[str]], None]] = []
+
+    if "enum" in schema:
+        enum = schema["enum"]
+        def check_enum(val, path, label, errors):
+            if val not in enum:
+                errors.append(f"{label} must be one of {enum}")
+        checks.append(check_enum)
+
+    if t in ("integer", "number"):
+        if "minimum" in schema:
+            lo = schema["minimum"]
+            def check_min(val, path, label, errors):
+                if val < lo:
+                    errors.append(f"{label} must be >= {lo}")
+            checks.append(check_min)
+        if "maximum" in schema:
+            hi = schema["maximum"]
+            def check_max(val, path, label, errors):
+                if val > hi:
+                    errors.append(f"{label} must be <= {hi}")
+            checks.append(check_max)
+
+    if t == "string":
+        if "minLength" in schema:
+            min_len = schema["minLength"]
+            def check_min_len(val, path, label, errors):
+                if len(val) < min_len:
+                    errors.append(f"{label} must be at least {min_len} chars")
+            checks.append(check_min_len)
+        if "maxLength" in schema:
+            max_len = schema["maxLength"]
+            def check_max_len(val, path, label, errors):
+                if len(val) > max_len:
+                    errors.append(f"{label} must be at most {max_len} chars")
+            checks.append(check_max_len)
+
+    if t == "object":
+        required = list(schema.get("required", []))
+        props = {k: compile_schema(v) for k, v in schema.get("properties", {}).items()}
+        def check_object(val, path, label, errors):
+            for k in required:
+                if k not in val:
+                    errors.append(f"missing required {path + '.' + k if path else k}")
+            for k, v in val.items():
+                if k in props:
+                    errors.extend(props[k](v, path + '.' + k if path else k))
+        checks.append(check_object)
+
+    if t == "array" and "items" in schema:
+        item_validator = compile_schema(schema["items"])
+        def check_items(val, path, label, errors):
+            for i, item in enumerate(val):
+                errors.extend(item_validator(item, f"{path}[{i}]" if path else f"[{i}]"))
+        checks.append(check_items)
+
+    def validate(val: Any, path: str) -> list[str]:
+        label = path or "parameter"
+        if py_type is not None and not isinstance(val, py_type):
+            return [f"{label} should be {t}"]
+        errors: list[str] = []
+        for check in checks:
+            check(val, path, label, errors)
+        return errors
+
+    return validate
 
 
 class Tool(ABC):
@@ -12,15 +102,6 @@ class Tool(ABC):
     the environment, such as reading files, executing commands, etc.
     """
     
-    _TYPE_MAP = {
-        "string": str,
-        "integer": int,
-        "number": (int, float),
-        "boolean": bool,
-        "array": list,
-        "object": dict,
-    }
-    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -54,41 +135,14 @@ class Tool(ABC):
 
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
-        schema = self.parameters or {}
-        if schema.get("type", "object") != "object":
-            raise ValueError(f"Schema must be object type, got {schema.get('type')!r}")
-        return self._validate(params, {**schema, "type": "object"}, "")
-
-    def _validate(self, val: Any, schema: dict[str, Any], path: str) -> list[str]:
-        t, label = schema.get("type"), path or "parameter"
-        if t in self._TYPE_MAP and not isinstance(val, self._TYPE_MAP[t]):
-            return [f"{label} should be {t}"]
-        
-        errors = []
-        if "enum" in schema and val not in schema["enum"]:
-            errors.append(f"{label} must be one of {schema['enum']}")
-        if t in ("integer", "number"):
-            if "minimum" in schema and val < schema["minimum"]:
-                errors.append(f"{label} must be >= {schema['minimum']}")
-            if "maximum" in schema and val > schema["maximum"]:
-                errors.append(f"{label} must be <= {schema['maximum']}")
-        if t == "string":
-            if "minLength" in schema and len(val) < schema["minLength"]:
-                errors.append(f"{label} must be at least {schema['minLength']} chars")
-            if "maxLength" in schema and len(val) > schema["maxLength"]:
-                errors.append(f"{label} must be at most {schema['maxLength']} chars")
-        if t == "object":
-            props = schema.get("properties", {})
-            for k in schema.get("required", []):
-                if k not in val:
-                    errors.append(f"missing required {path + '.' + k if path else k}")
-            for k, v in val.items():
-                if k in props:
-                    errors.extend(self._validate(v, props[k], path + '.' + k if path else k))
-        if t == "array" and "items" in schema:
-            for i, item in enumerate(val):
-                errors.extend(self._validate(item, schema["items"], f"{path}[{i}]" if path else f"[{i}]"))
-        return errors
+        # Compiled on first use; tool schemas are static once a tool is constructed
+        validator = self.__dict__.get("_param_validator")
+        if validator is None:
+            schema = self.parameters or {}
+            if schema.get("type", "object") != "object":
+                raise ValueError(f"Schema must be object type, got {schema.get('type')!r}")
+            validator = self._param_validator = compile_schema({**schema, "type": "object"})
+        return validator(params, "")
     
     def to_schema(self) -> dict[str, Any]:
         """Convert tool to OpenAI function schema format."""
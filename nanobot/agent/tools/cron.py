@@ -1,62 +1,76 @@
 """Cron tool for scheduling reminders and tasks."""
 
+from contextvars import ContextVar
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
 from nanobot.cron.service import CronService
 from nanobot.cron.types import CronSchedule
 
+# Payload kinds the agent may schedule; shell jobs can only be added from the CLI
+TOOL_PAYLOAD_KINDS = ("agent_turn", "message", "fetch")
+
 
 class CronTool(Tool):
     """Tool to schedule reminders and recurring tasks."""
     
+    name = "cron"
+    description = "Schedule reminders and recurring tasks. Actions: add, list, remove."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "enum": ["add", "list", "remove"],
+                "description": "Action to perform"
+            },
+            "message": {
+                "type": "string",
+                "description": "Reminder message (for add); the URL for kind fetch"
+            },
+            "kind": {
+                "type": "string",
+                "enum": list(TOOL_PAYLOAD_KINDS),
+                "description": (
+                    "What runs (for add): 'message' sends the text as-is, no LLM call "
+                    "(placeholders {date} {time} {weekday}); "
+                    "'fetch' sends what changed on a web page; 'agent_turn' (default) has you "
+                    "handle the message as a task. Prefer 'message' for plain reminders."
+                )
+            },
+            "every_seconds": {
+                "type": "integer",
+                "description": "Interval in seconds (for recurring tasks)"
+            },
+            "cron_expr": {
+                "type": "string",
+                "description": "Cron expression like '0 9 * * *' (for scheduled tasks)"
+            },
+            "tz": {
+                "type": "string",
+                "description": "IANA time zone for cron_expr, e.g. 'America/New_York' (default: server local time)"
+            },
+            "jitter_seconds": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Let each run start up to this many seconds late, for jobs that need not be punctual"
+            },
+            "job_id": {
+                "type": "string",
+                "description": "Job ID (for remove)"
+            }
+        },
+        "required": ["action"]
+    }
+    
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        # Per asyncio task, so concurrent turns schedule into their own chats
+        self._context: ContextVar[tuple[str, str]] = ContextVar("cron_context", default=("", ""))
     
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
-    
-    @property
-    def name(self) -> str:
-        return "cron"
-    
-    @property
-    def description(self) -> str:
-        return "Schedule reminders and recurring tasks. Actions: add, list, remove."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "action": {
-                    "type": "string",
-                    "enum": ["add", "list", "remove"],
-                    "description": "Action to perform"
-                },
-                "message": {
-                    "type": "string",
-                    "description": "Reminder message (for add)"
-                },
-                "every_seconds": {
-                    "type": "integer",
-                    "description": "Interval in seconds (for recurring tasks)"
-                },
-                "cron_expr": {
-                    "type": "string",
-                    "description": "Cron expression like '0 9 * * *' (for scheduled tasks)"
-                },
-                "job_id": {
-                    "type": "string",
-                    "description": "Job ID (for remove)"
-                }
-            },
-            "required": ["action"]
-        }
+        self._context.set((channel, chat_id))
     
     async def execute(
         self,
@@ -64,46 +78,66 @@ class CronTool(Tool):
         message: str = "",
         every_seconds: int | None = None,
         cron_expr: str | None = None,
+        tz: str | None = None,
+        jitter_seconds: int | None = None,
+        kind: str = "agent_turn",
         job_id: str | None = None,
         **kwargs: Any
     ) -> str:
         if action == "add":
-            return self._add_job(message, every_seconds, cron_expr)
+            return self._add_job(message, every_seconds, cron_expr, tz, jitter_seconds, kind)
         elif action == "list":
             return self._list_jobs()
         elif action == "remove":
             return self._remove_job(job_id)
         return f"Unknown action: {action}"
     
-    def _add_job(self, message: str, every_seconds: int | None, cron_expr: str | None) -> str:
+    def _add_job(
+        self,
+        message: str,
+        every_seconds: int | None,
+        cron_expr: str | None,
+        tz: str | None,
+        jitter_seconds: int | None,
+        kind: str,
+    ) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        if kind not in TOOL_PAYLOAD_KINDS:
+            return f"Error: kind must be one of {', '.join(TOOL_PAYLOAD_KINDS)}"
+        channel, chat_id = self._context.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         
         # Build schedule
         if every_seconds:
             schedule = CronSchedule(kind="every", every_ms=every_seconds * 1000)
         elif cron_expr:
-            schedule = CronSchedule(kind="cron", expr=cron_expr)
+            schedule = CronSchedule(kind="cron", expr=cron_expr, tz=tz)
         else:
             return "Error: either every_seconds or cron_expr is required"
+        if jitter_seconds:
+            schedule.jitter_ms = jitter_seconds * 1000
         
-        job = self._cron.add_job(
-            name=message[:30],
-            schedule=schedule,
-            message=message,
-            deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
-        )
+        try:
+            job = self._cron.add_job(
+                name=message[:30],
+                schedule=schedule,
+                message=message,
+                deliver=True,
+                channel=channel,
+                to=chat_id,
+                kind=kind,
+            )
+        except ValueError as e:
+            return f"Error: {e}"
         return f"Created job '{job.name}' (id: {job.id})"
     
     def _list_jobs(self) -> str:
         jobs = self._cron.list_jobs()
         if not jobs:
             return "No scheduled jobs."
-        lines = [f"- {j.name} (id: {j.id}, {j.schedule.kind})" for j in jobs]
+        lines = [f"- {j.name} (id: {j.id}, {j.schedule.kind}, {j.payload.kind})" for j in jobs]
         return "Scheduled jobs:\n" + "\n".join(lines)
     
     def _remove_job(self, job_id: str | None) -> str:
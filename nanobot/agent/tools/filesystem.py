@@ -17,29 +17,21 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
+    name = "read_file"
+    description = "Read the contents of a file at the given path."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "The file path to read"
+            }
+        },
+        "required": ["path"]
+    }
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
-
-    @property
-    def name(self) -> str:
-        return "read_file"
-    
-    @property
-    def description(self) -> str:
-        return "Read the contents of a file at the given path."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "path": {
-                    "type": "string",
-                    "description": "The file path to read"
-                }
-            },
-            "required": ["path"]
-        }
     
     async def execute(self, path: str, **kwargs: Any) -> str:
         try:
@@ -60,33 +52,25 @@ class ReadFileTool(Tool):
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
     
+    name = "write_file"
+    description = "Write content to a file at the given path. Creates parent directories if needed."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "The file path to write to"
+            },
+            "content": {
+                "type": "string",
+                "description": "The content to write"
+            }
+        },
+        "required": ["path", "content"]
+    }
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
-
-    @property
-    def name(self) -> str:
-        return "write_file"
-    
-    @property
-    def description(self) -> str:
-        return "Write content to a file at the given path. Creates parent directories if needed."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "path": {
-                    "type": "string",
-                    "description": "The file path to write to"
-                },
-                "content": {
-                    "type": "string",
-                    "description": "The content to write"
-                }
-            },
-            "required": ["path", "content"]
-        }
     
     async def execute(self, path: str, content: str, **kwargs: Any) -> str:
         try:
@@ -103,37 +87,29 @@ class WriteFileTool(Tool):
 class EditFileTool(Tool):
     """Tool to edit a file by replacing text."""
     
+    name = "edit_file"
+    description = "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "The file path to edit"
+            },
+            "old_text": {
+                "type": "string",
+                "description": "The exact text to find and replace"
+            },
+            "new_text": {
+                "type": "string",
+                "description": "The text to replace with"
+            }
+        },
+        "required": ["path", "old_text", "new_text"]
+    }
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
-
-    @property
-    def name(self) -> str:
-        return "edit_file"
-    
-    @property
-    def description(self) -> str:
-        return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "path": {
-                    "type": "string",
-                    "description": "The file path to edit"
-                },
-                "old_text": {
-                    "type": "string",
-                    "description": "The exact text to find and replace"
-                },
-                "new_text": {
-                    "type": "string",
-                    "description": "The text to replace with"
-                }
-            },
-            "required": ["path", "old_text", "new_text"]
-        }
     
     async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
         try:
@@ -164,29 +140,21 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
+    name = "list_dir"
+    description = "List the contents of a directory."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "The directory path to list"
+            }
+        },
+        "required": ["path"]
+    }
+    
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
-
-    @property
-    def name(self) -> str:
-        return "list_dir"
-    
-    @property
-    def description(self) -> str:
-        return "List the contents of a directory."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "path": {
-                    "type": "string",
-                    "description": "The directory path to list"
-                }
-            },
-            "required": ["path"]
-        }
     
     async def execute(self, path: str, **kwargs: Any) -> str:
         try:
@@ -0,0 +1,139 @@
+"""HTML extraction for web_fetch: Readability plus a single-pass HTML → markdown/text converter."""
+
+import re
+from html.parser import HTMLParser
+from typing import Iterator
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "main", "aside", "nav",
+    "blockquote", "table", "tr", "ul", "ol", "dl", "figure", "form",
+}
+_FEED_CHUNK = 64 * 1024
+
+
+class _Converter(HTMLParser):
+    """
+    Streaming HTML → markdown/text converter.
+
+    Output accumulates in `parts`; callers drain it between `feed` calls so
+    they can stop parsing as soon as enough text has been produced.
+    """
+
+    def __init__(self, markdown: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.markdown = markdown
+        self.parts: list[str] = []
+        self._skip = 0
+        self._pre = 0
+        self._links: list[str | None] = []
+
+    def _emit(self, s: str) -> None:
+        self.parts.append(s)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif self._skip:
+            return
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._emit(f"\n\n{'#' * int(tag[1])} " if self.markdown else "\n\n")
+        elif tag == "li":
+            self._emit("\n- " if self.markdown else "\n")
+        elif tag in ("br", "hr"):
+            self._emit("\n")
+        elif tag == "pre":
+            self._pre += 1
+            self._emit("\n\n```\n" if self.markdown else "\n\n")
+        elif tag == "code" and not self._pre and self.markdown:
+            self._emit("`")
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if not self.markdown or not href or href.startswith(("#", "javascript:")):
+                href = None
+            self._links.append(href)
+            if href:
+                self._emit("[")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif self._skip:
+            return
+        elif tag in _BLOCK_TAGS or tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._emit("\n\n")
+        elif tag == "pre":
+            self._pre = max(0, self._pre - 1)
+            self._emit("\n```\n\n" if self.markdown else "\n\n")
+        elif tag == "code" and not self._pre and self.markdown:
+            self._emit("`")
+        elif tag == "a" and self._links:
+            if href := self._links.pop():
+                self._emit(f"]({href})")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._pre:
+            self._emit(data)
+        elif data.strip():
+            self._emit(re.sub(r"\s+", " ", data))
+        elif data and self.parts and not self.parts[-1].endswith((" ", "\n")):
+            self._emit(" ")
+
+
+def iter_converted(html: str, markdown: bool = True) -> Iterator[str]:
+    """Convert HTML incrementally, yielding output chunks as the input is parsed."""
+    conv = _Converter(markdown)
+    for i in range(0, len(html), _FEED_CHUNK):
+        conv.feed(html[i:i + _FEED_CHUNK])
+        if conv.parts:
+            yield "".join(conv.parts)
+            conv.parts.clear()
+    conv.close()
+    if conv.parts:
+        yield "".join(conv.parts)
+
+
+def _normalize(text: str) -> str:
+    """Normalize whitespace."""
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def html_to_text(html: str, markdown: bool = True, max_chars: int | None = None) -> tuple[str, bool]:
+    """
+    Convert HTML to markdown (or plain text) in a single parse.
+
+    Stops parsing once max_chars of output have been produced.
+
+    Returns:
+        (text, complete) where complete is False if conversion stopped early.
+    """
+    out: list[str] = []
+    size = 0
+    for chunk in iter_converted(html, markdown):
+        out.append(chunk)
+        size += len(chunk)
+        # Leave headroom for whitespace collapsed by _normalize
+        if max_chars is not None and size > max_chars * 2:
+            return _normalize("".join(out)), False
+    return _normalize("".join(out)), True
+
+
+def extract_html(html: str, markdown: bool = True, max_chars: int | None = None) -> tuple[str, bool]:
+    """
+    Extract the main content of a page with Readability and convert it.
+
+    This is CPU-bound; web_fetch runs it in a worker pool.
+
+    Returns:
+        (text, complete) as for html_to_text.
+    """
+    from readability import Document
+
+    doc = Document(html)
+    title = doc.title()
+    content, complete = html_to_text(doc.summary(), markdown, max_chars)
+    return (f"# {title}\n\n{content}" if title else content), complete
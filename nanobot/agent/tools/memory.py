@@ -0,0 +1,41 @@
+"""Memory search tool."""
+
+from typing import Any
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.base import Tool
+
+
+class MemorySearchTool(Tool):
+    """Tool to search long-term memory and daily notes."""
+    
+    name = "memory_search"
+    description = (
+        "Search your memory files (MEMORY.md and daily notes) for relevant passages. "
+        "Use this to recall past facts, preferences, or events."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "What to look for"
+            },
+            "k": {
+                "type": "integer",
+                "description": "Maximum passages to return (default 5)",
+                "minimum": 1,
+                "maximum": 20
+            }
+        },
+        "required": ["query"]
+    }
+    
+    def __init__(self, store: MemoryStore):
+        self._store = store
+    
+    async def execute(self, query: str, k: int = 5, **kwargs: Any) -> str:
+        chunks = self._store.search(query, k)
+        if not chunks:
+            return f"No memories found for: {query}"
+        return "\n\n".join(f"[{c.source}]\n{c.text}" for c in chunks)
@@ -1,5 +1,6 @@
 """Message tool for sending messages to users."""
 
+from contextvars import ContextVar
 from typing import Any, Callable, Awaitable
 
 from nanobot.agent.tools.base import Tool
@@ -9,6 +10,27 @@ from nanobot.bus.events import OutboundMessage
 class MessageTool(Tool):
     """Tool to send messages to users on chat channels."""
     
+    name = "message"
+    description = "Send a message to the user. Use this when you want to communicate something."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "content": {
+                "type": "string",
+                "description": "The message content to send"
+            },
+            "channel": {
+                "type": "string",
+                "description": "Optional: target channel (telegram, discord, etc.)"
+            },
+            "chat_id": {
+                "type": "string",
+                "description": "Optional: target chat/user ID"
+            }
+        },
+        "required": ["content"]
+    }
+    
     def __init__(
         self, 
         send_callback: Callable[[OutboundMessage], Awaitable[None]] | None = None,
@@ -16,47 +38,19 @@ class MessageTool(Tool):
         default_chat_id: str = ""
     ):
         self._send_callback = send_callback
-        self._default_channel = default_channel
-        self._default_chat_id = default_chat_id
+        # Per asyncio task, so agent turns running concurrently keep their own chat
+        self._context: ContextVar[tuple[str, str]] = ContextVar(
+            "message_context", default=(default_channel, default_chat_id)
+        )
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
+        """Set the message context of the current turn."""
+        self._context.set((channel, chat_id))
     
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
         self._send_callback = callback
     
-    @property
-    def name(self) -> str:
-        return "message"
-    
-    @property
-    def description(self) -> str:
-        return "Send a message to the user. Use this when you want to communicate something."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "content": {
-                    "type": "string",
-                    "description": "The message content to send"
-                },
-                "channel": {
-                    "type": "string",
-                    "description": "Optional: target channel (telegram, discord, etc.)"
-                },
-                "chat_id": {
-                    "type": "string",
-                    "description": "Optional: target chat/user ID"
-                }
-            },
-            "required": ["content"]
-        }
-    
     async def execute(
         self, 
         content: str, 
@@ -64,8 +58,9 @@ class MessageTool(Tool):
         chat_id: str | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
+        default_channel, default_chat_id = self._context.get()
+        channel = channel or default_channel
+        chat_id = chat_id or default_chat_id
         
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -0,0 +1,151 @@
+"""Tool output governance: size budgets and spill-to-disk artifacts."""
+
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+from nanobot.utils.helpers import ensure_dir
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ToolOutputConfig
+
+
+@dataclass
+class OutputBudget:
+    """Characters of tool output one turn has put into context so far."""
+
+    used: int = 0
+
+
+class ToolOutputManager:
+    """
+    Keeps tool results that enter the LLM context within size budgets.
+
+    Results over the per-tool limit (or over what is left of the per-turn
+    budget) are written to workspace/artifacts/<id>.txt and replaced in
+    context by a head/tail preview plus a handle for read_artifact. The
+    manager holds only configuration; each turn tracks its own OutputBudget.
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        max_chars: int = 16000,
+        per_tool: dict[str, int] | None = None,
+        turn_budget: int = 64000,
+        preview_chars: int = 1500,
+        max_artifacts: int = 200,
+    ):
+        self.artifacts_dir = workspace / "artifacts"
+        self.max_chars = max_chars
+        self.per_tool = per_tool or {}
+        self.turn_budget = turn_budget
+        self.preview_chars = preview_chars
+        self.max_artifacts = max_artifacts
+
+    def new_budget(self) -> OutputBudget:
+        """Start the budget for a new turn."""
+        return OutputBudget()
+
+    def process(self, tool_name: str, result: str, budget: OutputBudget) -> str:
+        """Return the result to put into context, spilling it to an artifact if too large."""
+        if tool_name == ReadArtifactTool.name:
+            budget.used += len(result)
+            return result
+
+        limit = self.per_tool.get(tool_name, self.max_chars)
+        # Once the turn budget is spent, everything large becomes a preview
+        limit = min(limit, max(self.turn_budget - budget.used, 2 * self.preview_chars))
+        if len(result) <= limit:
+            budget.used += len(result)
+            return result
+
+        artifact_id = self.save(tool_name, result)
+        head = result[:self.preview_chars]
+        tail = result[-self.preview_chars // 2:]
+        omitted = len(result) - len(head) - len(tail)
+        if artifact_id:
+            note = (f"[Output of {tool_name} is {len(result)} chars; stored as artifact '{artifact_id}'. "
+                    f"Showing head and tail. Use read_artifact(id=\"{artifact_id}\", offset=..., length=...) for the rest.]")
+        else:
+            note = f"[Output of {tool_name} is {len(result)} chars; showing head and tail only.]"
+        preview = f"{note}\n\n{head}\n\n[... {omitted} chars omitted ...]\n\n{tail}"
+        budget.used += len(preview)
+        logger.debug(f"Spilled {tool_name} output ({len(result)} chars) to artifact {artifact_id}")
+        return preview
+
+    def save(self, tool_name: str, content: str) -> str | None:
+        """Store content as a new artifact. Returns its id, or None on failure."""
+        artifact_id = f"{tool_name}-{uuid.uuid4().hex[:8]}"
+        try:
+            ensure_dir(self.artifacts_dir)
+            self._path(artifact_id).write_text(content, encoding="utf-8")
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Failed to store tool output artifact: {e}")
+            return None
+        return artifact_id
+
+    def _path(self, artifact_id: str) -> Path:
+        return self.artifacts_dir / f"{artifact_id}.txt"
+
+    def read(self, artifact_id: str) -> str | None:
+        """Load an artifact's full content."""
+        # Artifact ids never contain path separators
+        if "/" in artifact_id or "\\" in artifact_id or ".." in artifact_id:
+            return None
+        path = self._path(artifact_id)
+        return path.read_text(encoding="utf-8") if path.is_file() else None
+
+    def _prune(self) -> None:
+        """Delete the oldest artifacts beyond max_artifacts."""
+        files = sorted(self.artifacts_dir.glob("*.txt"), key=lambda p: p.stat().st_mtime)
+        for p in files[:max(0, len(files) - self.max_artifacts)]:
+            p.unlink(missing_ok=True)
+
+
+class ReadArtifactTool(Tool):
+    """Tool to page through a stored tool-output artifact."""
+
+    name = "read_artifact"
+    description = (
+        "Read part of a large tool output that was stored as an artifact. "
+        "Use the artifact id from the truncated tool result."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string", "description": "Artifact id"},
+            "offset": {"type": "integer", "minimum": 0, "description": "Start character (default 0)"},
+            "length": {"type": "integer", "minimum": 1, "description": "Characters to read (default 8000)"},
+        },
+        "required": ["id"],
+    }
+
+    def __init__(self, manager: ToolOutputManager):
+        self._manager = manager
+
+    async def execute(self, id: str, offset: int = 0, length: int = 8000, **kwargs: Any) -> str:
+        content = self._manager.read(id)
+        if content is None:
+            return f"Error: Artifact not found: {id}"
+        length = min(length, self._manager.max_chars)
+        chunk = content[offset:offset + length]
+        end = offset + len(chunk)
+        more = f" More from offset {end}." if end < len(content) else ""
+        return f"[Artifact {id}: chars {offset}-{end} of {len(content)}.{more}]\n\n{chunk}"
+
+
+def make_output_manager(workspace: Path, config: "ToolOutputConfig") -> ToolOutputManager:
+    """Create the tool output manager from config."""
+    return ToolOutputManager(
+        workspace,
+        max_chars=config.max_chars,
+        per_tool=config.per_tool,
+        turn_budget=config.turn_budget,
+        preview_chars=config.preview_chars,
+    )
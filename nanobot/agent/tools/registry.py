@@ -1,6 +1,6 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+from typing import Any, Collection
 
 from nanobot.agent.tools.base import Tool
 
@@ -14,14 +14,17 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._definitions: list[dict[str, Any]] | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._definitions = None
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
-        self._tools.pop(name, None)
+        if self._tools.pop(name, None) is not None:
+            self._definitions = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -31,9 +34,18 @@ class ToolRegistry:
         """Check if a tool is registered."""
         return name in self._tools
     
-    def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+    def get_definitions(self, names: Collection[str] | None = None) -> list[dict[str, Any]]:
+        """
+        Get tool definitions in OpenAI format (built once per registry change).
+        
+        Args:
+            names: Optional subset of tools to include; all tools if None.
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        if names is None:
+            return self._definitions
+        return [d for d in self._definitions if d["function"]["name"] in names]
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
@@ -0,0 +1,205 @@
+"""Per-turn tool selection to keep the tool payload sent to the LLM small."""
+
+import json
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+# Offered on every turn
+CORE_TOOLS = ("read_file", "write_file", "edit_file", "list_dir", "exec", "read_artifact", "load_tools")
+
+# Cheap keyword routing: a tool is offered if any trigger appears in the message as
+# a whole word (plurals included). Words common in ordinary chat are left out.
+TOOL_TRIGGERS: dict[str, tuple[str, ...]] = {
+    "web_search": ("search", "google", "look up", "lookup", "news", "internet", "the web",
+                   "搜索", "查一下", "新闻"),
+    "web_fetch": ("url", "link", "website", "webpage", "web page", "fetch", "download", "链接", "网页"),
+    "cron": ("remind", "reminder", "schedule", "daily", "weekly", "hourly", "every day", "every week",
+             "every hour", "every morning", "every evening", "cron", "tomorrow", "alarm",
+             "提醒", "定时", "每天"),
+    "spawn": ("background", "subagent", "in parallel", "parallel", "research", "spawn",
+              "long-running", "后台"),
+    "subagents": ("background", "subagent", "still running", "background task", "后台"),
+    "memory_search": ("remember", "recall", "memory", "memories", "last time", "did i",
+                      "记得", "之前", "上次"),
+    "message": ("notify", "forward", "telegram", "whatsapp", "discord", "slack", "feishu", "email",
+                "message me", "text me", "发送", "通知"),
+}
+
+_URL_RE = re.compile(r"https?://|www\.", re.I)
+
+
+def _trigger_re(triggers: Iterable[str]) -> re.Pattern[str]:
+    # CJK text has no word boundaries, so those triggers match anywhere
+    words = "|".join(re.escape(t) for t in triggers if t.isascii())
+    other = [re.escape(t) for t in triggers if not t.isascii()]
+    return re.compile("|".join([rf"\b(?:{words})(?:e?s)?\b", *other]), re.I)
+
+
+_TRIGGER_RES = {tool: _trigger_re(triggers) for tool, triggers in TOOL_TRIGGERS.items()}
+
+
+@dataclass
+class ToolSelection:
+    """Tools offered during one agent turn."""
+    names: set[str]
+    requested: set[str] = field(default_factory=set)  # loaded or called outside the selection
+    used: set[str] = field(default_factory=set)
+
+    def add(self, names: Iterable[str]) -> list[str]:
+        """Offer more tools for the rest of the turn. Returns the newly added names."""
+        added = [n for n in names if n not in self.names]
+        self.names.update(added)
+        self.requested.update(added)
+        return added
+
+    def note_call(self, name: str) -> None:
+        """Record a tool call; calling a tool that was not offered counts as a miss."""
+        self.used.add(name)
+        if name not in self.names:
+            self.add([name])
+
+
+class ToolSelector:
+    """
+    Picks the subset of registered tools to send with each LLM call.
+
+    Selection is rule-based: core tools, configured always/channel tools,
+    tools pinned in session metadata, tools used on the previous turn and
+    keyword triggers. The model can pull in anything else via load_tools.
+    Each turn owns the ToolSelection returned by start_turn; the selector
+    only keeps the hit-rate and payload statistics.
+    """
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        always: Iterable[str] = (),
+        channel_tools: dict[str, list[str]] | None = None,
+    ):
+        self.registry = registry
+        self.always = set(CORE_TOOLS) | set(always)
+        self.channel_tools = channel_tools or {}
+        self._sizes: dict[str, int] = {}
+        self._stats = {
+            "turns": 0, "turns_with_miss": 0, "offered_tools": 0, "offered_used": 0,
+            "offered_bytes": 0, "full_bytes": 0,
+        }
+
+    def start_turn(
+        self,
+        message: str,
+        channel: str | None = None,
+        pinned: Iterable[str] | None = None,
+        recent: Iterable[str] | None = None,
+    ) -> ToolSelection:
+        """Select the tools to offer during a new turn."""
+        names = set(self.always)
+        names.update(self.channel_tools.get(channel or "", []))
+        names.update(pinned or [])
+        names.update(recent or [])
+        names.update(tool for tool, pattern in _TRIGGER_RES.items() if pattern.search(message))
+        if _URL_RE.search(message):
+            names.add("web_fetch")
+        return ToolSelection(names={n for n in names if n in self.registry})
+
+    def definitions(self, selection: ToolSelection) -> list[dict[str, Any]]:
+        """Definitions for a turn's selection; also records payload size."""
+        defs = self.registry.get_definitions(selection.names)
+        self._stats["offered_bytes"] += sum(self._size(d) for d in defs)
+        self._stats["full_bytes"] += sum(self._size(d) for d in self.registry.get_definitions())
+        return defs
+
+    def end_turn(self, sel: ToolSelection) -> None:
+        """Account the finished turn in the hit-rate and precision statistics."""
+        offered = sel.names - sel.requested
+        self._stats["turns"] += 1
+        if sel.requested:
+            self._stats["turns_with_miss"] += 1
+        self._stats["offered_tools"] += len(offered)
+        self._stats["offered_used"] += len(offered & sel.used)
+        stats = self.stats()
+        logger.debug(
+            f"Tool selection: offered {sorted(offered)}, "
+            f"used {sorted(sel.used)}, missed {sorted(sel.requested)} "
+            f"(hit rate {stats['hit_rate']:.0%}, precision {stats['precision']:.0%}, "
+            f"payload -{stats['payload_reduction']:.0%})"
+        )
+
+    def _size(self, definition: dict[str, Any]) -> int:
+        name = definition["function"]["name"]
+        if name not in self._sizes:
+            self._sizes[name] = len(json.dumps(definition))
+        return self._sizes[name]
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Payload reduction, hit rate and precision since startup.
+
+        hit_rate is the share of turns that needed no tool beyond the offer;
+        precision is the share of offered tools that were used.
+        """
+        s = self._stats
+        return {
+            **s,
+            "hit_rate": round(1 - s["turns_with_miss"] / s["turns"], 3) if s["turns"] else 1.0,
+            "precision": round(s["offered_used"] / s["offered_tools"], 3) if s["offered_tools"] else 0.0,
+            "payload_reduction": round(1 - s["offered_bytes"] / s["full_bytes"], 3) if s["full_bytes"] else 0.0,
+        }
+
+
+class LoadToolsTool(Tool):
+    """Tool that lets the model pull tools into the current turn on demand."""
+
+    name = "load_tools"
+    parameters = {
+        "type": "object",
+        "properties": {
+            "names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Names of the tools to load",
+            },
+        },
+        "required": ["names"],
+    }
+
+    def __init__(self, selector: ToolSelector):
+        self._selector = selector
+        self._selection: ContextVar[ToolSelection | None] = ContextVar("tool_selection", default=None)
+
+    def set_context(self, selection: ToolSelection) -> None:
+        """Set the selection of the current turn."""
+        self._selection.set(selection)
+
+    @property
+    def description(self) -> str:
+        # Built from the registry so it stays stable between turns (prompt-cache friendly)
+        catalog = ", ".join(
+            n for n in self._selector.registry.tool_names if n not in CORE_TOOLS
+        )
+        return (
+            "Load additional tools for this conversation turn when you need a capability "
+            f"that is not in your current tool list. Available: {catalog}."
+        )
+
+    async def execute(self, names: list[str], **kwargs: Any) -> str:
+        selection = self._selection.get()
+        if selection is None:
+            return "Error: No tool selection is active"
+        unknown = [n for n in names if n not in self._selector.registry]
+        added = selection.add(n for n in names if n in self._selector.registry)
+        parts = []
+        if added:
+            parts.append(f"Loaded tools: {', '.join(added)}. They are available from your next call.")
+        else:
+            parts.append("Requested tools are already available.")
+        if unknown:
+            parts.append(f"Unknown tools: {', '.join(unknown)}.")
+        return " ".join(parts)
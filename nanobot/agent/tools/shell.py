@@ -12,6 +12,23 @@ from nanobot.agent.tools.base import Tool
 class ExecTool(Tool):
     """Tool to execute shell commands."""
     
+    name = "exec"
+    description = "Execute a shell command and return its output. Use with caution."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "command": {
+                "type": "string",
+                "description": "The shell command to execute"
+            },
+            "working_dir": {
+                "type": "string",
+                "description": "Optional working directory for the command"
+            }
+        },
+        "required": ["command"]
+    }
+    
     def __init__(
         self,
         timeout: int = 60,
@@ -35,36 +52,22 @@ class ExecTool(Tool):
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
     
-    @property
-    def name(self) -> str:
-        return "exec"
-    
-    @property
-    def description(self) -> str:
-        return "Execute a shell command and return its output. Use with caution."
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "command": {
-                    "type": "string",
-                    "description": "The shell command to execute"
-                },
-                "working_dir": {
-                    "type": "string",
-                    "description": "Optional working directory for the command"
-                }
-            },
-            "required": ["command"]
-        }
-    
     async def execute(self, command: str, working_dir: str | None = None, **kwargs: Any) -> str:
+        _, result = await self.run(command, working_dir)
+        return result
+    
+    async def run(self, command: str, working_dir: str | None = None) -> tuple[int | None, str]:
+        """
+        Run a command under the safety guard and timeout.
+        
+        Returns:
+            (exit code, output); the exit code is None if the command was
+            blocked, timed out or could not be started.
+        """
         cwd = working_dir or self.working_dir or os.getcwd()
         guard_error = self._guard_command(command, cwd)
         if guard_error:
-            return guard_error
+            return None, guard_error
         
         try:
             process = await asyncio.create_subprocess_shell(
@@ -81,7 +84,7 @@ class ExecTool(Tool):
                 )
             except asyncio.TimeoutError:
                 process.kill()
-                return f"Error: Command timed out after {self.timeout} seconds"
+                return None, f"Error: Command timed out after {self.timeout} seconds"
             
             output_parts = []
             
@@ -103,10 +106,10 @@ class ExecTool(Tool):
             if len(result) > max_len:
                 result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
             
-            return result
+            return process.returncode, result
             
         except Exception as e:
-            return f"Error executing command: {str(e)}"
+            return None, f"Error executing command: {str(e)}"
 
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
@@ -1,5 +1,6 @@
 """Spawn tool for creating background subagents."""
 
+from contextvars import ContextVar
 from typing import Any, TYPE_CHECKING
 
 from nanobot.agent.tools.base import Tool
@@ -16,50 +17,138 @@ class SpawnTool(Tool):
     to the main agent when complete.
     """
     
+    name = "spawn"
+    description = (
+        "Spawn a subagent to handle a task in the background. "
+        "Use this for complex or time-consuming tasks that can run independently. "
+        "The subagent will complete the task and report back when done. "
+        "To run several independent tasks in parallel (e.g. research from different angles), "
+        "pass them as 'tasks' instead: their results are reported together in one message."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "task": {
+                "type": "string",
+                "description": "The task for the subagent to complete",
+            },
+            "label": {
+                "type": "string",
+                "description": "Optional short label for the task (for display)",
+            },
+            "tasks": {
+                "type": "array",
+                "description": "Several tasks to run in parallel as one group (instead of 'task')",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "task": {"type": "string"},
+                        "label": {"type": "string"},
+                    },
+                    "required": ["task"],
+                },
+            },
+            "wait_for": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "With 'tasks': report once this many have succeeded and cancel the rest (default: all)",
+            },
+            "timeout": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "With 'tasks': report after this many seconds with whatever has finished",
+            },
+        },
+    }
+    
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
+        self._origin: ContextVar[tuple[str, str]] = ContextVar("spawn_origin", default=("cli", "direct"))
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
-    
-    @property
-    def name(self) -> str:
-        return "spawn"
-    
-    @property
-    def description(self) -> str:
-        return (
-            "Spawn a subagent to handle a task in the background. "
-            "Use this for complex or time-consuming tasks that can run independently. "
-            "The subagent will complete the task and report back when done."
-        )
-    
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "task": {
-                    "type": "string",
-                    "description": "The task for the subagent to complete",
-                },
-                "label": {
-                    "type": "string",
-                    "description": "Optional short label for the task (for display)",
-                },
-            },
-            "required": ["task"],
-        }
+        """Set the origin context for subagent announcements (for the current turn)."""
+        self._origin.set((channel, chat_id))
     
-    async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
-        """Spawn a subagent to execute the given task."""
+    async def execute(
+        self,
+        task: str | None = None,
+        label: str | None = None,
+        tasks: list[dict[str, str]] | None = None,
+        wait_for: int | None = None,
+        timeout: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Spawn a subagent (or a group of subagents) to execute the given task(s)."""
+        origin_channel, origin_chat_id = self._origin.get()
+        if tasks:
+            return await self._manager.spawn_group(
+                tasks,
+                wait_for=wait_for,
+                timeout=timeout,
+                origin_channel=origin_channel,
+                origin_chat_id=origin_chat_id,
+            )
+        if not task:
+            return "Error: either task or tasks is required"
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=origin_channel,
+            origin_chat_id=origin_chat_id,
         )
+
+
+class SubagentsTool(Tool):
+    """
+    Tool to inspect and cancel background subagents of the current chat.
+    """
+    
+    name = "subagents"
+    description = (
+        "List, inspect or cancel background subagents started from this chat. "
+        "Use 'list' to see tasks, 'status' for one task's progress or result, 'cancel' to stop one."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "enum": ["list", "status", "cancel"],
+                "description": "What to do",
+            },
+            "task_id": {
+                "type": "string",
+                "description": "Task id (for status and cancel)",
+            },
+        },
+        "required": ["action"],
+    }
+    
+    def __init__(self, manager: "SubagentManager"):
+        self._manager = manager
+        self._origin: ContextVar[tuple[str, str]] = ContextVar("subagents_origin", default=("cli", "direct"))
+    
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Set the chat whose tasks this tool can see (for the current turn)."""
+        self._origin.set((channel, chat_id))
+    
+    async def execute(self, action: str, task_id: str | None = None, **kwargs: Any) -> str:
+        session_key = ":".join(self._origin.get())
+        if action == "list":
+            tasks = self._manager.list_tasks(session_key)
+            if not tasks:
+                return "No background tasks."
+            return "\n".join(t.describe() for t in tasks)
+        
+        if not task_id:
+            return f"Error: task_id is required for {action}"
+        if action == "cancel":
+            return self._manager.cancel(task_id, session_key=session_key)
+        
+        record = self._manager.get_task(task_id)
+        if not record or record.session_key != session_key:
+            return f"Error: no background task with id {task_id}"
+        status = record.describe()
+        if record.result:
+            status += f"\n\nResult:\n{record.result}"
+        return status
@@ -1,33 +1,77 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
+import codecs
 import json
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.html_extract import extract_html
+from nanobot.agent.tools.web_cache import CacheEntry, WebCache
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
+# One pool per worker count, shared by all WebFetchTool instances with that
+# setting so subagents can't multiply extraction threads
+_extract_pools: dict[int, ThreadPoolExecutor] = {}
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
 
+def _get_extract_pool(max_workers: int) -> ThreadPoolExecutor:
+    max_workers = max(1, max_workers)
+    if max_workers not in _extract_pools:
+        _extract_pools[max_workers] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-extract")
+    return _extract_pools[max_workers]
 
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+_TEXTUAL_TYPES = ("json", "xml", "javascript", "ecmascript", "x-www-form-urlencoded")
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.I)
+
+
+def _is_textual(ctype: str) -> bool:
+    """Whether a Content-Type is worth downloading as text (unknown types are sniffed)."""
+    mime = ctype.split(";", 1)[0].strip().lower()
+    return not mime or mime.startswith("text/") or any(t in mime for t in _TEXTUAL_TYPES)
+
+
+def _content_length(r: httpx.Response) -> int | None:
+    """Declared body size, if known (compressed bodies report the wire size, so skip them)."""
+    if r.headers.get("content-encoding", "identity") != "identity":
+        return None
+    try:
+        return int(r.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _detect_charset(ctype: str, head: bytes) -> str:
+    """Pick a charset from the Content-Type header, a BOM, or an HTML meta tag."""
+    for param in ctype.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip("\"' ")
+            break
+    else:
+        if head.startswith(b"\xef\xbb\xbf"):
+            return "utf-8-sig"
+        if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+            return "utf-16"
+        m = _META_CHARSET.search(head)
+        charset = m.group(1).decode("ascii") if m else "utf-8"
+    try:
+        codecs.lookup(charset)
+        return charset
+    except LookupError:
+        return "utf-8"
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -105,12 +149,21 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        cache: WebCache | None = None,
+        max_html_chars: int = 2_000_000,
+        extract_workers: int = 2,
+        max_bytes: int = 5_000_000,
+    ):
         self.max_chars = max_chars
+        self.cache = cache
+        self.max_html_chars = max_html_chars
+        self.extract_workers = extract_workers
+        self.max_bytes = max_bytes
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -119,45 +172,119 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
-            
-            ctype = r.headers.get("content-type", "")
+            entry = self.cache.lookup(url) if self.cache else None
+            cacheable = entry is not None
+            download: dict[str, Any] = {}
+            if entry and entry.is_fresh():
+                cache_status = "hit"
+            else:
+                headers = {"User-Agent": USER_AGENT, **(entry.validators() if entry else {})}
+                async with httpx.AsyncClient(
+                    follow_redirects=True,
+                    max_redirects=MAX_REDIRECTS,
+                    timeout=30.0
+                ) as client:
+                    async with client.stream("GET", url, headers=headers) as r:
+                        if entry and r.status_code == 304:
+                            entry, cache_status = self.cache.revalidated(entry, r.headers), "revalidated"
+                        else:
+                            r.raise_for_status()
+                            ctype = r.headers.get("content-type", "")
+                            # Refuse binary bodies before reading them
+                            if not _is_textual(ctype):
+                                return json.dumps({"error": f"Unsupported content type: {ctype}", "url": url,
+                                                   "finalUrl": str(r.url), "status": r.status_code,
+                                                   "contentLength": _content_length(r)})
+                            body, download = await self._read_body(r, ctype, max_chars)
+                            if body is None:
+                                return json.dumps({"error": "Response body looks binary", "url": url,
+                                                   "finalUrl": str(r.url), "status": r.status_code})
+                            cache_status = "miss" if self.cache else "off"
+                            # Partial downloads are never cached
+                            entry = None
+                            if self.cache and not download["aborted"]:
+                                entry = self.cache.store_response(url, str(r.url), r.status_code, r.headers, body)
+                            cacheable = entry is not None
+                            if entry is None:
+                                entry = CacheEntry(
+                                    url=url, final_url=str(r.url), status=r.status_code,
+                                    content_type=ctype, body=body,
+                                    fetched_at=time.time(), expires_at=0,
+                                )
             
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
+            cached = entry.extracted.get(extractMode)
+            if cached and (cached.get("complete", True) or len(cached["text"]) > max_chars):
+                text, extractor, complete = cached["text"], cached["extractor"], cached.get("complete", True)
             else:
-                text, extractor = r.text, "raw"
+                text, extractor, complete = await self._extract(
+                    entry.body, entry.content_type, extractMode, max_chars
+                )
+                entry.extracted[extractMode] = {"text": text, "extractor": extractor, "complete": complete}
+                if cacheable:
+                    self.cache.put(entry)
             
-            truncated = len(text) > max_chars
-            if truncated:
+            truncated = len(text) > max_chars or not complete or download.get("aborted", False)
+            if len(text) > max_chars:
                 text = text[:max_chars]
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            result = {"url": url, "finalUrl": entry.final_url, "status": entry.status,
+                      "extractor": extractor, "truncated": truncated, "length": len(text),
+                      "cache": cache_status}
+            if download:
+                result["bytesRead"] = download["bytes_read"]
+                result["bytesSkipped"] = download["bytes_skipped"]
+            return json.dumps({**result, "text": text})
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
     
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+    async def _read_body(
+        self, r: httpx.Response, ctype: str, max_chars: int
+    ) -> tuple[str | None, dict[str, Any]]:
+        """
+        Stream the response body, stopping at the byte cap.
+
+        Plain text stops as soon as enough bytes for max_chars have arrived;
+        HTML and JSON need the whole document and only stop at max_bytes.
+
+        Returns:
+            (decoded text or None if the body is binary, download stats).
+        """
+        structured = any(t in ctype for t in ("html", "json", "xml")) or not ctype
+        limit = self.max_bytes if structured else min(self.max_bytes, max_chars * 4)
+        total = _content_length(r)
+        buf = bytearray()
+        aborted = False
+        async for chunk in r.aiter_bytes():
+            buf += chunk
+            if len(buf) >= limit:
+                aborted = total is None or total > limit
+                del buf[limit:]
+                break
+        
+        charset = _detect_charset(ctype, bytes(buf[:2048]))
+        if not charset.startswith("utf-16") and b"\x00" in buf[:1024]:
+            return None, {}
+        stats = {
+            "aborted": aborted,
+            "bytes_read": len(buf),
+            "bytes_skipped": max(0, total - len(buf)) if total is not None else None,
+        }
+        return buf.decode(charset, errors="replace"), stats
+    
+    async def _extract(self, body: str, ctype: str, extract_mode: str, max_chars: int) -> tuple[str, str, bool]:
+        """Extract text from a response body. Returns (text, extractor, complete)."""
+        # JSON
+        if "application/json" in ctype:
+            try:
+                return json.dumps(json.loads(body), indent=2), "json", True
+            except ValueError:
+                return body, "raw", True
+        # HTML: Readability is CPU-bound, keep it off the event loop
+        if "text/html" in ctype or body[:256].lower().startswith(("<!doctype", "<html")):
+            complete = len(body) <= self.max_html_chars
+            text, converted_all = await asyncio.get_running_loop().run_in_executor(
+                _get_extract_pool(self.extract_workers),
+                partial(extract_html, body[:self.max_html_chars], extract_mode == "markdown", max_chars),
+            )
+            return text, "readability", complete and converted_all
+        return body, "raw", True
@@ -0,0 +1,250 @@
+"""Disk-backed HTTP cache for the web_fetch tool."""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir, get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import WebFetchConfig
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a cache key (case, default port, fragment, query order)."""
+    p = urlparse(url.strip())
+    scheme = p.scheme.lower()
+    host = (p.hostname or "").lower()
+    if p.port and p.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{p.port}"
+    if p.username:
+        host = f"{p.username}{':' + p.password if p.password else ''}@{host}"
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, p.path or "/", p.params, query, ""))
+
+
+def parse_freshness(headers: Mapping[str, str], now: float, default_ttl: float) -> tuple[bool, float]:
+    """
+    Derive cacheability and expiry from response headers.
+
+    Returns:
+        (storable, expires_at). An expiry <= now means the entry must be revalidated.
+    """
+    directives: dict[str, str | None] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    if "no-store" in directives:
+        return False, now
+    if "no-cache" in directives:
+        return True, now
+
+    age = 0.0
+    try:
+        age = max(0.0, float(headers.get("age", 0)))
+    except ValueError:
+        pass
+
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                return True, now + int(directives[name] or 0) - age
+            except ValueError:
+                break
+
+    if expires := headers.get("expires"):
+        try:
+            return True, parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return True, now  # Invalid Expires means already expired
+
+    return True, now + default_ttl
+
+
+@dataclass
+class CacheEntry:
+    """A cached response plus its per-extractMode extractions."""
+    url: str
+    final_url: str
+    status: int
+    content_type: str
+    body: str
+    fetched_at: float
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    # extractMode -> {"text": ..., "extractor": ...}
+    extracted: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WebCache:
+    """
+    Size-bounded LRU cache of fetched pages stored as one JSON file per URL.
+
+    Recency is tracked through file mtimes, so the LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 100 * 1024 * 1024, default_ttl: float = 300):
+        self.cache_dir = ensure_dir(cache_dir)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._size: int | None = None
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+        return self._size
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Look up an entry (fresh or stale) and mark it as recently used."""
+        path = self._path(url)
+        try:
+            entry = CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable web cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self._size = None
+            return None
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """Return the cached entry, possibly stale. Counts a hit only if it is fresh."""
+        entry = self.get(url)
+        self._stats["hits" if entry and entry.is_fresh() else "misses"] += 1
+        return entry
+
+    def store_response(
+        self, url: str, final_url: str, status: int, headers: Mapping[str, str], body: str
+    ) -> CacheEntry | None:
+        """Build and persist an entry from a 200 response. Returns None if not cacheable."""
+        now = time.time()
+        storable, expires_at = parse_freshness(headers, now, self.default_ttl)
+        if not storable or status != 200:
+            return None
+        entry = CacheEntry(
+            url=normalize_url(url),
+            final_url=final_url,
+            status=status,
+            content_type=headers.get("content-type", ""),
+            body=body,
+            fetched_at=now,
+            expires_at=expires_at,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        self.put(entry)
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        """Refresh an entry after a 304 Not Modified response."""
+        now = time.time()
+        _, entry.expires_at = parse_freshness(headers, now, self.default_ttl)
+        entry.fetched_at = now
+        entry.etag = headers.get("etag", entry.etag)
+        entry.last_modified = headers.get("last-modified", entry.last_modified)
+        self._stats["revalidated"] += 1
+        self.put(entry)
+        return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        """Write an entry to disk and evict least-recently-used entries if over budget."""
+        path = self._path(entry.url)
+        data = json.dumps(asdict(entry), ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        size = self._total_size()
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write web cache entry: {e}")
+            return
+        self._size = size - old_size + len(data)
+        self._stats["stores"] += 1
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        files = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+                files.append((st.st_mtime, st.st_size, p))
+            except FileNotFoundError:
+                continue
+        files.sort()
+        size = sum(s for _, s, _ in files)
+        # Evict down to 90% so we don't thrash on every subsequent put
+        target = int(self.max_bytes * 0.9)
+        for _, fsize, p in files:
+            if size <= target:
+                break
+            p.unlink(missing_ok=True)
+            size -= fsize
+            self._stats["evictions"] += 1
+        self._size = size
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process plus on-disk usage."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": sum(1 for _ in self.cache_dir.glob("*.json")),
+            "bytes": self._total_size(),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> int:
+        """Delete all entries. Returns the number removed."""
+        removed = 0
+        for p in self.cache_dir.glob("*.json"):
+            p.unlink(missing_ok=True)
+            removed += 1
+        self._size = 0
+        return removed
+
+
+def make_web_cache(config: "WebFetchConfig") -> WebCache | None:
+    """Create the web_fetch cache described by config, or None if disabled."""
+    if not config.cache_enabled:
+        return None
+    return WebCache(
+        get_data_path() / "cache" / "web",
+        max_bytes=config.cache_max_mb * 1024 * 1024,
+        default_ttl=config.cache_ttl,
+    )
@@ -34,6 +34,10 @@ class MessageBus:
         """Publish a response from the agent to channels."""
         await self.outbound.put(msg)
     
+    def publish_outbound_nowait(self, msg: OutboundMessage) -> None:
+        """Publish a response from synchronous code (the queue is unbounded)."""
+        self.outbound.put_nowait(msg)
+    
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
         return await self.outbound.get()
@@ -299,8 +299,12 @@ def gateway(
     from nanobot.channels.manager import ChannelManager
     from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
-    from nanobot.cron.types import CronJob
+    from nanobot.cron.types import CronJob, CronSchedule
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.agent.consolidation import CONSOLIDATION_EVENT, MemoryConsolidator
+    from nanobot.agent.task_journal import TaskJournal
+    from nanobot.cron.actions import DIRECT_KINDS, CronActions
+    from loguru import logger
     
     if verbose:
         import logging
@@ -315,7 +319,11 @@ def gateway(
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, config=config.cron)
+    
+    # Background tasks survive restarts through the task journal
+    subagent_config = config.agents.defaults.subagents
+    task_journal = TaskJournal(get_data_dir() / "tasks") if subagent_config.journal else None
     
     # Create agent with cron service
     agent = AgentLoop(
@@ -324,23 +332,69 @@ def gateway(
         workspace=config.workspace_path,
         model=config.agents.defaults.model,
         max_iterations=config.agents.defaults.max_tool_iterations,
+        compaction_config=config.agents.defaults.compaction,
+        history_config=config.agents.defaults.history,
+        memory_config=config.agents.defaults.memory,
+        skills_config=config.agents.defaults.skills,
+        subagent_config=subagent_config,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        tool_selection_config=config.tools.selection,
+        tool_output_config=config.tools.output,
         cron_service=cron,
+        task_journal=task_journal,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
     )
     
+    # Built-in system jobs
+    memory_config = config.agents.defaults.memory
+    consolidator = MemoryConsolidator(
+        agent.context.memory,
+        provider=provider,
+        model=memory_config.consolidation_model,
+        budget_tokens=memory_config.long_term_budget_tokens,
+        keep_days=memory_config.keep_daily_days,
+        keep_weeks=memory_config.keep_weekly_weeks,
+    )
+    if memory_config.consolidate:
+        cron.ensure_system_job(
+            "memory consolidation",
+            CronSchedule(kind="cron", expr=memory_config.consolidate_cron),
+            CONSOLIDATION_EVENT,
+        )
+    else:
+        cron.remove_system_job("memory consolidation")
+    
+    # Messages, shell commands and page watches run without the agent
+    cron_actions = CronActions(
+        config.workspace_path,
+        get_data_dir() / "cron" / "fetch",
+        exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+    )
+    
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
-        """Execute a cron job through the agent."""
-        response = await agent.process_direct(
-            job.payload.message,
-            session_key=f"cron:{job.id}",
-            channel=job.payload.channel or "cli",
-            chat_id=job.payload.to or "direct",
-        )
-        if job.payload.deliver and job.payload.to:
+        """Execute a cron job directly or through the agent."""
+        if job.payload.kind == "system_event":
+            if job.payload.message == CONSOLIDATION_EVENT:
+                report = await consolidator.run()
+                return report.render()
+            logger.warning(f"Unknown cron system event: {job.payload.message}")
+            return None
+        if job.payload.kind in DIRECT_KINDS:
+            response = await cron_actions.run(job)
+        else:
+            response = await agent.process_direct(
+                job.payload.message,
+                session_key=f"cron:{job.id}",
+                channel=job.payload.channel or "cli",
+                chat_id=job.payload.to or "direct",
+            )
+        if job.payload.deliver and job.payload.to and response is not None:
             from nanobot.bus.events import OutboundMessage
             await bus.publish_outbound(OutboundMessage(
                 channel=job.payload.channel or "cli",
@@ -380,6 +434,9 @@ def gateway(
         try:
             await cron.start()
             await heartbeat.start()
+            recovered = await agent.subagents.recover()
+            if recovered:
+                console.print(f"[green]✓[/green] Recovered {recovered} background task(s)")
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
@@ -430,6 +487,14 @@ def agent(
         workspace=config.workspace_path,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        tool_selection_config=config.tools.selection,
+        tool_output_config=config.tools.output,
+        compaction_config=config.agents.defaults.compaction,
+        history_config=config.agents.defaults.history,
+        memory_config=config.agents.defaults.memory,
+        skills_config=config.agents.defaults.skills,
+        subagent_config=config.agents.defaults.subagents,
         restrict_to_workspace=config.tools.restrict_to_workspace,
     )
     
@@ -672,6 +737,7 @@ def cron_list(
     table.add_column("Schedule")
     table.add_column("Status")
     table.add_column("Next Run")
+    table.add_column("Last Run")
     
     import time
     for job in jobs:
@@ -680,6 +746,8 @@ def cron_list(
             sched = f"every {(job.schedule.every_ms or 0) // 1000}s"
         elif job.schedule.kind == "cron":
             sched = job.schedule.expr or ""
+            if job.schedule.tz:
+                sched += f" ({job.schedule.tz})"
         else:
             sched = "one-time"
         
@@ -689,9 +757,20 @@ def cron_list(
             next_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(job.state.next_run_at_ms / 1000))
             next_run = next_time
         
+        # Last run: when it was due, and how much later it actually started
+        last_run = ""
+        state = job.state
+        if state.last_run_at_ms:
+            last_run = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(state.last_run_at_ms / 1000))
+            if state.last_lateness_ms:
+                due = time.strftime("%H:%M:%S", time.localtime(state.last_scheduled_at_ms / 1000))
+                last_run += f" (due {due}, +{state.last_lateness_ms / 1000:.0f}s)"
+            if state.last_status != "ok":
+                last_run += f" [red]{state.last_status}[/red]"
+        
         status = "[green]enabled[/green]" if job.enabled else "[dim]disabled[/dim]"
         
-        table.add_row(job.id, job.name, sched, status, next_run)
+        table.add_row(job.id, job.name, sched, status, next_run, last_run)
     
     console.print(table)
 
@@ -699,13 +778,19 @@ def cron_list(
 @cron_app.command("add")
 def cron_add(
     name: str = typer.Option(..., "--name", "-n", help="Job name"),
-    message: str = typer.Option(..., "--message", "-m", help="Message for agent"),
+    message: str = typer.Option(..., "--message", "-m", help="Prompt for the agent, or message/command/URL for --kind"),
     every: int = typer.Option(None, "--every", "-e", help="Run every N seconds"),
     cron_expr: str = typer.Option(None, "--cron", "-c", help="Cron expression (e.g. '0 9 * * *')"),
     at: str = typer.Option(None, "--at", help="Run once at time (ISO format)"),
     deliver: bool = typer.Option(False, "--deliver", "-d", help="Deliver response to channel"),
     to: str = typer.Option(None, "--to", help="Recipient for delivery"),
     channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
+    overlap: str = typer.Option("skip", "--overlap", help="If still running when due again: skip, queue or parallel"),
+    timeout: int = typer.Option(None, "--timeout", help="Seconds a run may take (default: cron.jobTimeout)"),
+    tz: str = typer.Option(None, "--tz", help="Time zone for --cron (e.g. 'Europe/Berlin'; default: local)"),
+    catch_up: str = typer.Option(None, "--catch-up", help="Runs missed while down: once, all or skip (default: cron.catchUp)"),
+    jitter: int = typer.Option(None, "--jitter", help="Spread runs up to N seconds after the scheduled time"),
+    kind: str = typer.Option("agent_turn", "--kind", "-k", help="agent_turn, or without the LLM: message (template), shell or fetch (URL diff)"),
 ):
     """Add a scheduled job."""
     from nanobot.config.loader import get_data_dir
@@ -716,7 +801,7 @@ def cron_add(
     if every:
         schedule = CronSchedule(kind="every", every_ms=every * 1000)
     elif cron_expr:
-        schedule = CronSchedule(kind="cron", expr=cron_expr)
+        schedule = CronSchedule(kind="cron", expr=cron_expr, tz=tz)
     elif at:
         import datetime
         dt = datetime.datetime.fromisoformat(at)
@@ -724,18 +809,34 @@ def cron_add(
     else:
         console.print("[red]Error: Must specify --every, --cron, or --at[/red]")
         raise typer.Exit(1)
+    if overlap not in ("skip", "queue", "parallel"):
+        console.print("[red]Error: --overlap must be skip, queue or parallel[/red]")
+        raise typer.Exit(1)
+    if catch_up not in (None, "once", "all", "skip"):
+        console.print("[red]Error: --catch-up must be once, all or skip[/red]")
+        raise typer.Exit(1)
+    if jitter:
+        schedule.jitter_ms = jitter * 1000
     
     store_path = get_data_dir() / "cron" / "jobs.json"
     service = CronService(store_path)
     
-    job = service.add_job(
-        name=name,
-        schedule=schedule,
-        message=message,
-        deliver=deliver,
-        to=to,
-        channel=channel,
-    )
+    try:
+        job = service.add_job(
+            name=name,
+            schedule=schedule,
+            message=message,
+            deliver=deliver,
+            to=to,
+            channel=channel,
+            overlap=overlap,
+            timeout_s=timeout,
+            catch_up=catch_up,
+            kind=kind,
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
     
     console.print(f"[green]✓[/green] Added job '{job.name}' ({job.id})")
 
@@ -798,6 +899,145 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Skills Commands
+# ============================================================================
+
+
+skills_app = typer.Typer(help="Manage skills")
+app.add_typer(skills_app, name="skills")
+
+
+@skills_app.command("check")
+def skills_check():
+    """Validate skill metadata and report unmet requirements."""
+    from nanobot.agent.skills import SkillsLoader
+    from nanobot.config.loader import load_config
+    
+    config = load_config()
+    loader = SkillsLoader(config.workspace_path)
+    entries = loader.entries()
+    
+    if not entries:
+        console.print("No skills found.")
+        return
+    
+    table = Table(title="Skills")
+    table.add_column("Name", style="cyan")
+    table.add_column("Source")
+    table.add_column("Status")
+    table.add_column("Details")
+    
+    invalid = 0
+    for entry in entries:
+        meta = entry.meta
+        details = []
+        if meta.errors:
+            invalid += 1
+            status = "[red]invalid[/red]"
+            details += meta.errors
+        elif loader.is_available(entry):
+            status = "[green]ok[/green]"
+        else:
+            status = "[yellow]unavailable[/yellow]"
+        
+        missing = loader.missing_requirements(entry)
+        if missing:
+            details.append(f"missing {missing}")
+            details += [f"install: {h.label or f'{h.kind} {h.package}'.strip()}" for h in meta.install]
+        if meta.always:
+            details.append("always loaded")
+        if meta.tools:
+            details.append(f"tools: {', '.join(meta.tools)}")
+        
+        table.add_row(entry.name, entry.source, status, "\n".join(details))
+    
+    console.print(table)
+    if invalid:
+        console.print(f"[red]{invalid} skill(s) with invalid metadata[/red]")
+        raise typer.Exit(1)
+
+
+# ============================================================================
+# Tasks Commands
+# ============================================================================
+
+
+@app.command()
+def tasks(
+    task_id: str = typer.Argument(None, help="Show one task in detail"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Number of recent tasks to list"),
+):
+    """Show background (subagent) tasks recorded by the gateway."""
+    import time
+    from rich.markup import escape
+    from nanobot.agent.task_journal import TaskJournal
+    from nanobot.config.loader import get_data_dir
+    
+    journal = TaskJournal(get_data_dir() / "tasks")
+    
+    def when(ts: float | None) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)) if ts else ""
+    
+    if task_id:
+        task = journal.get(task_id)
+        if not task:
+            console.print(f"[red]Task {task_id} not found[/red]")
+            raise typer.Exit(1)
+        checkpoint = journal.load_checkpoint(task_id) or {}
+        origin = task.get("origin") or {}
+        console.print(f"[cyan]{task['id']}[/cyan] {task.get('label', '')}: {task['status']}")
+        console.print(f"Origin: {origin.get('channel')}:{origin.get('chat_id')}")
+        console.print(f"Created: {when(task.get('created_at'))}  Started: {when(task.get('started_at'))}  "
+                      f"Finished: {when(task.get('finished_at'))}")
+        console.print(f"Iterations: {max(task.get('iterations', 0), checkpoint.get('iteration', 0))}  "
+                      f"Tokens: {max(task.get('tokens', 0), checkpoint.get('tokens', 0))}  "
+                      f"Resumes: {task.get('resumes', 0)}")
+        console.print(f"\n[bold]Task[/bold]\n{escape(task['task'])}")
+        messages = checkpoint.get("messages", [])
+        if messages:
+            console.print(f"\n[bold]Transcript[/bold] (last 5 of {len(messages)} messages)")
+            for message in messages[-5:]:
+                content = str(message.get("content") or "")
+                calls = [c["function"]["name"] for c in message.get("tool_calls", [])]
+                if calls:
+                    content = f"{content} [calls {', '.join(calls)}]".strip()
+                console.print(f"[dim]{message['role']}:[/dim] {escape(content[:300])}")
+        if task.get("result"):
+            console.print(f"\n[bold]Result[/bold]\n{escape(task['result'])}")
+        return
+    
+    entries = journal.entries()[-limit:]
+    if not entries:
+        console.print("No background tasks.")
+        return
+    
+    table = Table(title="Background Tasks")
+    table.add_column("ID", style="cyan")
+    table.add_column("Label")
+    table.add_column("Status")
+    table.add_column("Origin")
+    table.add_column("Iterations", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Created")
+    
+    for task in reversed(entries):
+        iterations, tokens = task.get("iterations", 0), task.get("tokens", 0)
+        if task["status"] == "running":
+            # The entry is written at start; progress lives in the checkpoint
+            checkpoint = journal.load_checkpoint(task["id"]) or {}
+            iterations = max(iterations, checkpoint.get("iteration", 0))
+            tokens = max(tokens, checkpoint.get("tokens", 0))
+        origin = task.get("origin") or {}
+        table.add_row(
+            task["id"], task.get("label", ""), task["status"],
+            f"{origin.get('channel')}:{origin.get('chat_id')}",
+            str(iterations), str(tokens), when(task.get("created_at")),
+        )
+    
+    console.print(table)
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -817,6 +1057,13 @@ def status():
     console.print(f"Config: {config_path} {'[green]✓[/green]' if config_path.exists() else '[red]✗[/red]'}")
     console.print(f"Workspace: {workspace} {'[green]✓[/green]' if workspace.exists() else '[red]✗[/red]'}")
 
+    fetch_cfg = config.tools.web.fetch
+    if fetch_cfg.cache_enabled:
+        from nanobot.agent.tools.web_cache import make_web_cache
+        stats = make_web_cache(fetch_cfg).stats()
+        console.print(f"Web cache: {stats['entries']} entries, "
+                      f"{stats['bytes'] / 1024 / 1024:.1f}/{fetch_cfg.cache_max_mb} MB")
+
     if config_path.exists():
         from nanobot.providers.registry import PROVIDERS
 
@@ -154,6 +154,67 @@ class ChannelsConfig(BaseModel):
     qq: QQConfig = Field(default_factory=QQConfig)
 
 
+class CompactionConfig(BaseModel):
+    """In-turn compaction of older tool results once the transcript grows large."""
+    enabled: bool = False  # Opt-in: rewrites older tool results the model already saw
+    budget_tokens: int = 24000  # Compact when the current turn's transcript exceeds this
+    keep_recent: int = 4  # Most recent tool results kept intact
+    summary_chars: int = 600  # Excerpt length when compacting without a model
+    model: str | None = None  # Cheap model for summaries; head excerpts if unset
+
+
+class HistoryConfig(BaseModel):
+    """Conversation history kept in sessions and replayed to the LLM."""
+    max_messages: int = 50  # Messages replayed per turn (tool calls and results not counted)
+    persist_tool_calls: bool = False  # Store tool calls/results, not just the final reply
+    tool_turns: int = 10  # Recent turns whose tool calls are kept (trimmed in batches at 2x)
+    tool_result_chars: int = 2000  # Longer stored tool results are elided
+    summarize: bool = False  # Fold older messages into a rolling per-session summary
+    summary_trigger_tokens: int = 8000  # Summarize once unsummarized history exceeds this
+    summary_keep_messages: int = 20  # Most recent messages never folded into the summary
+    summary_model: str | None = None  # Defaults to the agent model
+
+
+class MemoryConfig(BaseModel):
+    """Memory retrieval over workspace/memory/*.md."""
+    retrieval: bool = False  # Inject only the notes relevant to each message instead of today's file
+    top_k: int = 5  # Chunks injected per message
+    chunk_chars: int = 800  # Target chunk size when indexing
+    embeddings: bool = False  # Also rank by hashed character n-gram vectors (pure CPU)
+    consolidate: bool = False  # Scheduled dedupe/digest/archive of memory files (gateway)
+    consolidate_cron: str = "0 3 * * *"
+    long_term_budget_tokens: int = 2000  # MEMORY.md is kept under this (always in the prompt)
+    keep_daily_days: int = 7  # Older daily notes are rolled into weekly digests
+    keep_weekly_weeks: int = 8  # Older weekly digests are rolled into monthly digests
+    consolidation_model: str | None = None  # Model for digests/condensing; heuristic if unset
+
+
+class SkillsConfig(BaseModel):
+    """Skill listing in the prompt."""
+    routing: bool = False  # List only the skills relevant to each message
+    top_k: int = 5  # Skills listed per message
+    preload: int = 1  # Bodies of the best matches included directly
+    min_score: float = 2.0  # BM25 score a match needs to be preloaded
+
+
+class SubagentConfig(BaseModel):
+    """Limits for background subagents started with the spawn tool."""
+    max_concurrent: int = 3  # Subagents running at once; the rest wait in a queue
+    max_pending: int = 10  # Queued tasks beyond this are rejected
+    max_per_session: int = 3  # Running plus queued tasks per origin chat
+    max_iterations: int = 15  # LLM calls per task
+    timeout: int = 900  # Seconds per task once started (0 = no limit)
+    max_tokens: int = 200000  # Total prompt+completion tokens per task (0 = no limit)
+    mode: str = "inline"  # "inline" (gateway event loop) or "process" (one worker process per task)
+    worker_memory_mb: int = 2048  # Address-space limit per worker process (0 = no limit)
+    worker_cpu_seconds: int = 600  # CPU-time limit per worker process (0 = no limit)
+    delivery: str = "agent"  # "agent" (main agent rephrases the result) or "direct" (sent as-is, no LLM call)
+    progress_interval: int = 0  # Min seconds between progress updates to the origin chat (0 = off)
+    group_timeout: int = 900  # Seconds before a spawn group reports whatever has finished (0 = no limit)
+    journal: bool = True  # Persist tasks and checkpoints (gateway) so they survive restarts
+    recovery: str = "resume"  # Unfinished tasks at startup: "resume" from checkpoint or "fail" (notify)
+
+
 class AgentDefaults(BaseModel):
     """Default agent configuration."""
     workspace: str = "~/.nanobot/workspace"
@@ -161,6 +222,11 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    history: HistoryConfig = Field(default_factory=HistoryConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    skills: SkillsConfig = Field(default_factory=SkillsConfig)
+    subagents: SubagentConfig = Field(default_factory=SubagentConfig)
 
 
 class AgentsConfig(BaseModel):
@@ -214,15 +280,35 @@ class GatewayConfig(BaseModel):
     port: int = 18790
 
 
+class CronConfig(BaseModel):
+    """Scheduled job execution."""
+    max_concurrent: int = 4  # Jobs running at once; further due jobs wait for a slot
+    job_timeout: int = 600  # Default seconds a run may take (0 = no limit)
+    catch_up: str = "once"  # Default for runs missed while down: "once", "all" or "skip"
+    max_starts_per_minute: int = 0  # Space job starts evenly to stay under provider rate limits (0 = off)
+
+
 class WebSearchConfig(BaseModel):
     """Web search tool configuration."""
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
 
 
+class WebFetchConfig(BaseModel):
+    """Web fetch tool configuration."""
+    max_chars: int = 50000
+    max_bytes: int = 5_000_000  # Download cap; larger bodies are cut off
+    cache_enabled: bool = True  # Disk cache under ~/.nanobot/cache/web
+    cache_max_mb: int = 100  # LRU-evicted beyond this size
+    cache_ttl: int = 300  # Seconds a response without Cache-Control/Expires stays fresh
+    max_html_chars: int = 2_000_000  # HTML beyond this is not handed to Readability
+    extract_workers: int = 2  # Threads for HTML extraction, shared by all agents
+
+
 class WebToolsConfig(BaseModel):
     """Web tools configuration."""
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
 
 
 class ExecToolConfig(BaseModel):
@@ -230,10 +316,27 @@ class ExecToolConfig(BaseModel):
     timeout: int = 60
 
 
+class ToolSelectionConfig(BaseModel):
+    """Per-turn tool selection (send only relevant tool definitions to the LLM)."""
+    enabled: bool = False
+    always: list[str] = Field(default_factory=list)  # Tools offered on every turn
+    channels: dict[str, list[str]] = Field(default_factory=dict)  # Extra tools per channel
+
+
+class ToolOutputConfig(BaseModel):
+    """Limits on tool output kept in the LLM context (larger output goes to workspace/artifacts)."""
+    max_chars: int = 16000  # Per tool result
+    per_tool: dict[str, int] = Field(default_factory=dict)  # Overrides by tool name
+    turn_budget: int = 64000  # Total tool output per agent turn
+    preview_chars: int = 1500  # Head shown for spilled results (plus half as much tail)
+
+
 class ToolsConfig(BaseModel):
     """Tools configuration."""
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    selection: ToolSelectionConfig = Field(default_factory=ToolSelectionConfig)
+    output: ToolOutputConfig = Field(default_factory=ToolOutputConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
 
 
@@ -243,6 +346,7 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     
     @property
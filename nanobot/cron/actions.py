@@ -0,0 +1,134 @@
+"""Cron payloads that run without an agent turn."""
+
+import difflib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+
+from nanobot.cron.types import CronJob
+from nanobot.utils.helpers import atomic_write_text, ensure_dir
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, WebFetchConfig
+
+# Payload kinds executed here instead of by the agent
+DIRECT_KINDS = ("message", "shell", "fetch")
+
+# Longest diff delivered for a fetch job
+MAX_DIFF_CHARS = 4000
+
+_PLACEHOLDER_RE = re.compile(r"\{(date|time|datetime|weekday|job)\}")
+
+
+def render_template(template: str, job: CronJob, now: datetime | None = None) -> str:
+    """
+    Fill in {date}, {time}, {datetime}, {weekday} and {job}.
+
+    Times are in the job's schedule time zone (local time if it has none);
+    any other braces are left as they are.
+    """
+    if now is None:
+        now = datetime.now(ZoneInfo(job.schedule.tz)) if job.schedule.tz else datetime.now()
+    values = {
+        "date": now.strftime("%Y-%m-%d"),
+        "time": now.strftime("%H:%M"),
+        "datetime": now.strftime("%Y-%m-%d %H:%M"),
+        "weekday": now.strftime("%A"),
+        "job": job.name,
+    }
+    return _PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
+
+
+class CronActions:
+    """
+    Runs the payload kinds that need no LLM call; payload.message holds:
+
+        message  text to send, with template placeholders (see render_template)
+        shell    a shell command; its output is sent
+        fetch    a URL; a diff against the previous fetch is sent, nothing if unchanged
+
+    Shell commands go through the exec tool's safety guard and limits; a
+    non-zero exit status fails the run. Only the CLI creates shell jobs.
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        state_dir: Path,
+        exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        restrict_to_workspace: bool = False,
+    ):
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig
+        self.workspace = workspace
+        self.state_dir = state_dir
+        self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.restrict_to_workspace = restrict_to_workspace
+
+    async def run(self, job: CronJob) -> str | None:
+        """
+        Execute a job's payload.
+
+        Returns:
+            Text to deliver, or None if there is nothing to report.
+
+        Raises:
+            RuntimeError: If the command or fetch failed (recorded as the job's error).
+        """
+        kind = job.payload.kind
+        if kind == "message":
+            return render_template(job.payload.message, job)
+        if kind == "shell":
+            return await self._shell(job.payload.message)
+        if kind == "fetch":
+            return await self._fetch(job)
+        raise ValueError(f"Not a direct payload kind: {kind}")
+
+    async def _shell(self, command: str) -> str:
+        from nanobot.agent.tools.shell import ExecTool
+        tool = ExecTool(
+            working_dir=str(self.workspace),
+            timeout=self.exec_config.timeout,
+            restrict_to_workspace=self.restrict_to_workspace,
+        )
+        exit_code, output = await tool.run(command)
+        if exit_code != 0:
+            raise RuntimeError(output)
+        return output
+
+    async def _fetch(self, job: CronJob) -> str | None:
+        from nanobot.agent.tools.web import WebFetchTool
+        url = job.payload.message.strip()
+        # No cache: every run must see the live page
+        tool = WebFetchTool(
+            max_chars=self.web_fetch_config.max_chars,
+            max_html_chars=self.web_fetch_config.max_html_chars,
+            extract_workers=self.web_fetch_config.extract_workers,
+            max_bytes=self.web_fetch_config.max_bytes,
+        )
+        result = json.loads(await tool.execute(url=url, extractMode="text"))
+        if "error" in result:
+            raise RuntimeError(f"Fetching {url} failed: {result['error']}")
+        text = result["text"]
+
+        snapshot = ensure_dir(self.state_dir) / f"{job.id}.txt"
+        previous = snapshot.read_text(encoding="utf-8") if snapshot.exists() else None
+        if previous == text:
+            logger.debug(f"Cron: {url} unchanged")
+            return None
+        atomic_write_text(snapshot, text)
+        if previous is None:
+            return f"Watching {url} ({len(text)} chars); changes will be reported here."
+
+        diff = "\n".join(difflib.unified_diff(
+            previous.splitlines(), text.splitlines(), "before", "after", lineterm="", n=1,
+        ))
+        if len(diff) > MAX_DIFF_CHARS:
+            diff = diff[:MAX_DIFF_CHARS] + f"\n... ({len(diff) - MAX_DIFF_CHARS} more chars)"
+        return f"{url} changed:\n```diff\n{diff}\n```"
@@ -1,23 +1,102 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
+import hashlib
+import heapq
 import json
 import time
 import uuid
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Coroutine
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from croniter import croniter
 from loguru import logger
 
+from nanobot.config.schema import CronConfig
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils.helpers import atomic_write_text, file_lock
+
+# Log entries after which the log is folded into a new snapshot (at least one per job)
+LOG_COMPACT_MIN = 1000
+
+# Most missed runs replayed per job with the "all" catch-up policy
+MAX_CATCH_UP = 100
+
+# Payload kinds users can schedule (system events are built in)
+USER_PAYLOAD_KINDS = ("agent_turn", "message", "shell", "fetch")
+
+
+def _file_id(path: Path) -> tuple[int, int] | None:
+    """Identity of a file's current version; changes when it is replaced."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+@lru_cache(maxsize=256)
+def _zone(tz: str) -> ZoneInfo:
+    return ZoneInfo(tz)
+
+
+@lru_cache(maxsize=4096)
+def _cron_iter(expr: str, tz: str | None) -> croniter:
+    """
+    Parsed cron expression, shared by all jobs with the same schedule.
+    
+    The iterator is repositioned before every use, which is safe because the
+    service runs on a single event loop.
+    """
+    return croniter(expr, _local_time(_now_ms(), tz))
+
+
+def _local_time(ms: int, tz: str | None) -> datetime:
+    """Wall-clock time in the schedule's zone (naive local time if it has none)."""
+    return datetime.fromtimestamp(ms / 1000, _zone(tz)) if tz else datetime.fromtimestamp(ms / 1000)
+
+
+def _next_cron_ms(expr: str, tz: str | None, after_ms: int) -> int:
+    it = _cron_iter(expr, tz)
+    it.set_current(_local_time(after_ms, tz))
+    # Aware datetimes carry the zone's DST rules; naive ones are resolved as local time
+    return int(it.get_next(datetime).timestamp() * 1000)
+
+
+def validate_schedule(schedule: CronSchedule) -> None:
+    """
+    Check that a schedule can produce run times.
+    
+    Raises:
+        ValueError: On an unknown time zone, a bad cron expression or a missing field.
+    """
+    if schedule.tz:
+        try:
+            _zone(schedule.tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"unknown time zone '{schedule.tz}'")
+    if schedule.jitter_ms is not None and schedule.jitter_ms < 0:
+        raise ValueError("jitter must not be negative")
+    if schedule.kind == "cron":
+        if not schedule.expr or not croniter.is_valid(schedule.expr):
+            raise ValueError(f"invalid cron expression '{schedule.expr}'")
+    elif schedule.kind == "every":
+        if not schedule.every_ms or schedule.every_ms <= 0:
+            raise ValueError("interval must be positive")
+    elif schedule.kind == "at":
+        if not schedule.at_ms:
+            raise ValueError("run time is required")
+
+
 def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
-    """Compute next run time in ms."""
+    """Compute the first run time after now_ms, in ms."""
     if schedule.kind == "at":
         return schedule.at_ms if schedule.at_ms and schedule.at_ms > now_ms else None
     
@@ -29,127 +108,299 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
     
     if schedule.kind == "cron" and schedule.expr:
         try:
-            from croniter import croniter
-            cron = croniter(schedule.expr, time.time())
-            next_time = cron.get_next()
-            return int(next_time * 1000)
-        except Exception:
+            return _next_cron_ms(schedule.expr, schedule.tz, now_ms)
+        except (ValueError, KeyError, ZoneInfoNotFoundError) as e:
+            logger.warning(f"Cron: cannot schedule '{schedule.expr}' (tz {schedule.tz}): {e}")
             return None
     
     return None
 
 
+def _jitter_offset(job: CronJob) -> int:
+    """The job's delay within its jitter window: fixed per job, spread evenly across jobs."""
+    window = job.schedule.jitter_ms
+    if not window or window <= 0:
+        return 0
+    return int.from_bytes(hashlib.sha256(job.id.encode()).digest()[:8], "big") % window
+
+
+def _next_fire(job: CronJob, now_ms: int) -> int | None:
+    """The job's first run after now_ms, jitter included."""
+    offset = _jitter_offset(job)
+    # Shift the reference back so a run whose window is still open isn't skipped
+    nominal = _compute_next_run(job.schedule, now_ms - offset)
+    return nominal + offset if nominal is not None else None
+
+
+def _missed_runs(job: CronJob, first_ms: int, now_ms: int, limit: int) -> list[int]:
+    """Run times from first_ms up to now_ms (at most limit, the most recent ones)."""
+    runs = [first_ms]
+    while (nxt := _next_fire(job, runs[-1])) is not None and nxt <= now_ms:
+        runs.append(nxt)
+        if len(runs) > limit:
+            runs.pop(0)
+    return runs
+
+
+def _job_to_dict(j: CronJob) -> dict[str, Any]:
+    return {
+        "id": j.id,
+        "name": j.name,
+        "enabled": j.enabled,
+        "schedule": {
+            "kind": j.schedule.kind,
+            "atMs": j.schedule.at_ms,
+            "everyMs": j.schedule.every_ms,
+            "expr": j.schedule.expr,
+            "tz": j.schedule.tz,
+            "jitterMs": j.schedule.jitter_ms,
+        },
+        "payload": {
+            "kind": j.payload.kind,
+            "message": j.payload.message,
+            "deliver": j.payload.deliver,
+            "channel": j.payload.channel,
+            "to": j.payload.to,
+        },
+        "state": {
+            "nextRunAtMs": j.state.next_run_at_ms,
+            "lastRunAtMs": j.state.last_run_at_ms,
+            "lastStatus": j.state.last_status,
+            "lastError": j.state.last_error,
+            "lastScheduledAtMs": j.state.last_scheduled_at_ms,
+            "lastLatenessMs": j.state.last_lateness_ms,
+            "lastDurationMs": j.state.last_duration_ms,
+        },
+        "createdAtMs": j.created_at_ms,
+        "updatedAtMs": j.updated_at_ms,
+        "deleteAfterRun": j.delete_after_run,
+        "overlap": j.overlap,
+        "timeoutS": j.timeout_s,
+        "catchUp": j.catch_up,
+    }
+
+
+def _job_from_dict(j: dict[str, Any]) -> CronJob:
+    return CronJob(
+        id=j["id"],
+        name=j["name"],
+        enabled=j.get("enabled", True),
+        schedule=CronSchedule(
+            kind=j["schedule"]["kind"],
+            at_ms=j["schedule"].get("atMs"),
+            every_ms=j["schedule"].get("everyMs"),
+            expr=j["schedule"].get("expr"),
+            tz=j["schedule"].get("tz"),
+            jitter_ms=j["schedule"].get("jitterMs"),
+        ),
+        payload=CronPayload(
+            kind=j["payload"].get("kind", "agent_turn"),
+            message=j["payload"].get("message", ""),
+            deliver=j["payload"].get("deliver", False),
+            channel=j["payload"].get("channel"),
+            to=j["payload"].get("to"),
+        ),
+        state=CronJobState(
+            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
+            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
+            last_status=j.get("state", {}).get("lastStatus"),
+            last_error=j.get("state", {}).get("lastError"),
+            last_scheduled_at_ms=j.get("state", {}).get("lastScheduledAtMs"),
+            last_lateness_ms=j.get("state", {}).get("lastLatenessMs"),
+            last_duration_ms=j.get("state", {}).get("lastDurationMs"),
+        ),
+        created_at_ms=j.get("createdAtMs", 0),
+        updated_at_ms=j.get("updatedAtMs", 0),
+        delete_after_run=j.get("deleteAfterRun", False),
+        overlap=j.get("overlap", "skip"),
+        timeout_s=j.get("timeoutS"),
+        catch_up=j.get("catchUp"),
+    )
+
+
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+    
+    Jobs are indexed by id, and a heap of (next run, job id) entries finds
+    due jobs without scanning the store; entries made stale by a reschedule
+    or removal are discarded when they reach the top.
+    
+    Persistence is incremental: every change appends one line to a log next
+    to the store (jobs.log beside jobs.json), and the log is folded into a
+    fresh snapshot once it outgrows the job count. Writes hold a file lock and
+    first apply whatever other processes (e.g. `nanobot cron add`) wrote.
+    
+    Due jobs run concurrently, at most config.max_concurrent at a time; each
+    job's overlap policy decides what happens when it comes due while its
+    previous run is still going.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        config: CronConfig | None = None,
     ):
         self.store_path = store_path
+        self.log_path = store_path.with_suffix(".log")
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.config = config or CronConfig()
         self._store: CronStore | None = None
+        self._heap: list[tuple[int, str]] = []
+        self._snapshot_id: tuple[int, int] | None = None  # (inode, mtime) of the snapshot last read or written
+        self._log_offset = 0  # Bytes of the log already applied
+        self._log_entries = 0
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._slots = asyncio.Semaphore(max(1, self.config.max_concurrent))
+        self._active: dict[str, int] = {}  # Job id -> runs in progress
+        self._queued: dict[str, int] = {}  # Job id -> scheduled time of the run waiting for it
+        self._run_tasks: set[asyncio.Task] = set()
+        self._next_start = 0.0  # Loop time the next run may start at (see _pace)
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
+        """Load jobs from the snapshot and replay the change log."""
         if self._store:
             return self._store
         
+        self._store = CronStore(jobs={})
+        self._snapshot_id = ()  # Never matches, so _read_log loads the snapshot
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.store_path):
+            self._read_log()
+        self._rebuild_heap()
+        return self._store
+    
+    def _read_snapshot(self) -> dict[str, CronJob]:
+        jobs: dict[str, CronJob] = {}
         if self.store_path.exists():
             try:
                 data = json.loads(self.store_path.read_text())
-                jobs = []
                 for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
+                    job = _job_from_dict(j)
+                    jobs[job.id] = job
             except Exception as e:
                 logger.warning(f"Failed to load cron store: {e}")
-                self._store = CronStore()
-        else:
-            self._store = CronStore()
+        return jobs
+    
+    def _read_log(self) -> bool:
+        """
+        Pick up changes written since the last read, e.g. by `nanobot cron add`
+        in another process. Call with the store lock held.
         
-        return self._store
+        Returns:
+            True if any job changed.
+        """
+        changed = False
+        snapshot_id = _file_id(self.store_path)
+        if snapshot_id != self._snapshot_id:
+            # Another process folded the log into a new snapshot: start over from it
+            self._store.jobs = self._read_snapshot()
+            self._snapshot_id = snapshot_id
+            self._log_offset = 0
+            self._log_entries = 0
+            changed = True
+        
+        try:
+            if self.log_path.stat().st_size <= self._log_offset:
+                return changed
+        except FileNotFoundError:
+            return changed
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        self._log_offset += len(data)
+        
+        jobs = self._store.jobs
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            try:
+                entry = json.loads(line)
+                if "put" in entry:
+                    job = _job_from_dict(entry["put"])
+                    jobs[job.id] = job
+                else:
+                    jobs.pop(entry["delete"], None)
+            except Exception as e:
+                # A crash mid-append leaves at most the last line truncated
+                logger.warning(f"Skipping bad cron log entry: {e}")
+            self._log_entries += 1
+        return True
+    
+    def _apply_outside_changes(self) -> None:
+        """Read other processes' changes and reschedule. Call with the store lock held."""
+        if self._read_log():
+            self._rebuild_heap()
+            # A job added elsewhere may be due before the current timer
+            self._arm_timer()
+    
+    def _refresh(self) -> None:
+        """Pick up changes other processes have written since the last read."""
+        with file_lock(self.store_path):
+            self._apply_outside_changes()
     
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Write a full snapshot and truncate the change log."""
         if not self._store:
             return
         
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        with file_lock(self.store_path):
+            self._compact()
+    
+    def _compact(self) -> None:
+        """Fold the log into a new snapshot. Call with the store lock held."""
+        # Entries other processes appended since our last read must not be lost
+        self._apply_outside_changes()
         data = {
             "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
+            "jobs": [_job_to_dict(j) for j in self._store.jobs.values()],
         }
-        
-        self.store_path.write_text(json.dumps(data, indent=2))
+        atomic_write_text(self.store_path, json.dumps(data, ensure_ascii=False))
+        self.log_path.unlink(missing_ok=True)
+        self._snapshot_id = _file_id(self.store_path)
+        self._log_offset = 0
+        self._log_entries = 0
+    
+    def _append_log(self, entry: dict[str, Any], job: CronJob | None = None) -> None:
+        """
+        Apply a change (a put of job, or a delete) and persist it, compacting
+        the log when it grows too long.
+        """
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.store_path):
+            self._apply_outside_changes()
+            # Logged after those changes, so this one wins
+            if job:
+                self._store.jobs[job.id] = job
+                self._schedule(job)
+            else:
+                self._store.jobs.pop(entry["delete"], None)
+            with open(self.log_path, "ab") as f:
+                f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                self._log_offset = f.tell()
+            self._log_entries += 1
+            if self._log_entries > max(LOG_COMPACT_MIN, len(self._store.jobs)):
+                self._compact()
+    
+    def _put(self, job: CronJob) -> None:
+        """Store a new or changed job and (re)schedule it."""
+        self._append_log({"put": _job_to_dict(job)}, job)
+    
+    def _delete(self, job_id: str) -> bool:
+        if job_id not in self._store.jobs:
+            return False
+        self._append_log({"delete": job_id})
+        return True
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
         self._load_store()
-        self._recompute_next_runs()
+        missed = self._recompute_next_runs()
         self._save_store()
+        for job_id, runs in missed.items():
+            self._start_task(self._catch_up(self._store.jobs[job_id], runs))
         self._arm_timer()
         logger.info(f"Cron service started with {len(self._store.jobs if self._store else [])} jobs")
     
@@ -159,23 +410,83 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for task in list(self._run_tasks):
+            task.cancel()
     
-    def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
+    def _recompute_next_runs(self) -> dict[str, list[int]]:
+        """
+        Recompute next run times at startup and apply catch-up policies.
+        
+        A job whose stored next run passed while the service was down keeps
+        it with "once" (it fires right away), replays up to MAX_CATCH_UP of
+        its missed runs with "all", or just moves on with "skip".
+        
+        Returns:
+            Missed run times to replay, by id of jobs with the "all" policy.
+        """
         if not self._store:
-            return
+            return {}
         now = _now_ms()
-        for job in self._store.jobs:
-            if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+        # Jobs sharing a schedule share the result: one computation per expression
+        computed: dict[tuple, int | None] = {}
+        missed: dict[str, list[int]] = {}
+        for job in self._store.jobs.values():
+            if not job.enabled:
+                continue
+            due = job.state.next_run_at_ms
+            if due is not None and due <= now:
+                policy = job.catch_up or self.config.catch_up
+                if policy == "once":
+                    continue
+                if policy == "all":
+                    missed[job.id] = _missed_runs(job, due, now, MAX_CATCH_UP)
+                    logger.info(f"Cron: job '{job.name}' ({job.id}) catching up {len(missed[job.id])} missed run(s)")
+            
+            schedule = job.schedule
+            key = (schedule.kind, schedule.at_ms, schedule.every_ms, schedule.expr, schedule.tz, _jitter_offset(job))
+            if key not in computed:
+                computed[key] = _next_fire(job, now)
+            job.state.next_run_at_ms = computed[key]
+            if schedule.kind == "at" and job.state.next_run_at_ms is None and job.id not in missed:
+                job.enabled = False
+        self._rebuild_heap()
+        return missed
+    
+    # ---------- Scheduling heap ----------
+    
+    def _schedule(self, job: CronJob) -> None:
+        """Push the job's next run onto the heap (older entries become stale)."""
+        if job.enabled and job.state.next_run_at_ms is not None:
+            heapq.heappush(self._heap, (job.state.next_run_at_ms, job.id))
+        if len(self._heap) > 2 * len(self._store.jobs) + 64:
+            self._rebuild_heap()
+    
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (j.state.next_run_at_ms, j.id) for j in self._store.jobs.values()
+            if j.enabled and j.state.next_run_at_ms is not None
+        ]
+        heapq.heapify(self._heap)
+    
+    def _is_current(self, entry: tuple[int, str]) -> bool:
+        job = self._store.jobs.get(entry[1])
+        return bool(job and job.enabled and job.state.next_run_at_ms == entry[0])
     
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
         if not self._store:
             return None
-        times = [j.state.next_run_at_ms for j in self._store.jobs 
-                 if j.enabled and j.state.next_run_at_ms]
-        return min(times) if times else None
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+    
+    def _pop_due(self, now: int) -> list[CronJob]:
+        """Remove and return the jobs due at now, earliest first."""
+        due: dict[str, CronJob] = {}
+        while (next_wake := self._get_next_wake_ms()) is not None and next_wake <= now:
+            _, job_id = heapq.heappop(self._heap)
+            due[job_id] = self._store.jobs[job_id]
+        return list(due.values())
     
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
@@ -197,61 +508,135 @@ class CronService:
         self._timer_task = asyncio.create_task(tick())
     
     async def _on_timer(self) -> None:
-        """Handle timer tick - run due jobs."""
+        """Handle timer tick - start due jobs."""
         if not self._store:
             return
         
+        self._refresh()
         now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
-        
-        for job in due_jobs:
-            await self._execute_job(job)
+        for job in self._pop_due(now):
+            # Report lateness against the schedule itself, not the jittered time
+            scheduled_ms = job.state.next_run_at_ms - _jitter_offset(job)
+            # Advance the schedule now so a long run doesn't hold up the next one
+            if job.schedule.kind == "at":
+                job.state.next_run_at_ms = None
+            else:
+                job.state.next_run_at_ms = _next_fire(job, now)
+            self._put(job)
+            self._dispatch(job, scheduled_ms)
         
-        self._save_store()
         self._arm_timer()
     
-    async def _execute_job(self, job: CronJob) -> None:
+    def _start_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._run_tasks.add(task)
+        task.add_done_callback(self._run_tasks.discard)
+    
+    async def _catch_up(self, job: CronJob, runs: list[int]) -> None:
+        """Replay missed runs one after another."""
+        # Look jobs up by id: a change from another process replaces the object
+        for fire_ms in runs:
+            job = self._store.jobs.get(job.id) if self._running else None
+            if not job:
+                return
+            self._active[job.id] = self._active.get(job.id, 0) + 1
+            await self._run(job, fire_ms - _jitter_offset(job))
+        job = self._store.jobs.get(job.id)
+        if job and job.schedule.kind == "at":
+            job.enabled = False
+            self._put(job)
+    
+    def _dispatch(self, job: CronJob, scheduled_ms: int) -> None:
+        """Start a due run in the background, honouring the job's overlap policy."""
+        if self._active.get(job.id) and job.overlap != "parallel":
+            if job.overlap == "queue":
+                self._queued[job.id] = scheduled_ms
+                return
+            logger.info(f"Cron: skipping job '{job.name}' ({job.id}), previous run still in progress")
+            job.state.last_status = "skipped"
+            job.state.last_scheduled_at_ms = scheduled_ms
+            self._put(job)
+            return
+        
+        self._active[job.id] = self._active.get(job.id, 0) + 1
+        self._start_task(self._run(job, scheduled_ms))
+    
+    async def _pace(self) -> None:
+        """Space run starts evenly when cron.maxStartsPerMinute is set."""
+        rate = self.config.max_starts_per_minute
+        if rate <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + 60 / rate
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def _run(self, job: CronJob, scheduled_ms: int) -> None:
+        try:
+            await self._pace()
+            async with self._slots:
+                await self._execute_job(job, scheduled_ms)
+        finally:
+            remaining = self._active.pop(job.id, 1) - 1
+            if remaining:
+                self._active[job.id] = remaining
+            queued = self._queued.pop(job.id, None)
+            current = self._store.jobs.get(job.id)
+            if queued is not None and self._running and current:
+                self._dispatch(current, queued)
+    
+    async def _execute_job(self, job: CronJob, scheduled_ms: int | None = None) -> None:
         """Execute a single job."""
         start_ms = _now_ms()
-        logger.info(f"Cron: executing job '{job.name}' ({job.id})")
+        lateness_ms = max(0, start_ms - scheduled_ms) if scheduled_ms is not None else 0
+        late = f", {lateness_ms / 1000:.1f}s late" if lateness_ms >= 1000 else ""
+        logger.info(f"Cron: executing job '{job.name}' ({job.id}){late}")
+        timeout = job.timeout_s if job.timeout_s is not None else self.config.job_timeout
         
+        status, error = "ok", None
         try:
             response = None
             if self.on_job:
-                response = await self.on_job(job)
-            
-            job.state.last_status = "ok"
-            job.state.last_error = None
+                response = await asyncio.wait_for(self.on_job(job), timeout or None)
             logger.info(f"Cron: job '{job.name}' completed")
             
+        except asyncio.TimeoutError:
+            status, error = "error", f"Timed out after {timeout}s"
+            logger.error(f"Cron: job '{job.name}' timed out after {timeout}s")
         except Exception as e:
-            job.state.last_status = "error"
-            job.state.last_error = str(e)
+            status, error = "error", str(e)
             logger.error(f"Cron: job '{job.name}' failed: {e}")
         
+        # Record the run on the job as it is now: another process may have
+        # changed (and so replaced) it meanwhile
+        self._refresh()
+        job = self._store.jobs.get(job.id)
+        if not job:
+            return  # Removed while running
+        job.state.last_status = status
+        job.state.last_error = error
         job.state.last_run_at_ms = start_ms
+        job.state.last_scheduled_at_ms = scheduled_ms
+        job.state.last_lateness_ms = lateness_ms
+        job.state.last_duration_ms = _now_ms() - start_ms
         job.updated_at_ms = _now_ms()
         
         # Handle one-shot jobs
         if job.schedule.kind == "at":
             if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
-        else:
-            # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                self._delete(job.id)
+                return
+            job.enabled = False
+            job.state.next_run_at_ms = None
+        self._put(job)
     
     # ========== Public API ==========
     
     def list_jobs(self, include_disabled: bool = False) -> list[CronJob]:
         """List all jobs."""
         store = self._load_store()
-        jobs = store.jobs if include_disabled else [j for j in store.jobs if j.enabled]
+        jobs = [j for j in store.jobs.values() if include_disabled or j.enabled]
         return sorted(jobs, key=lambda j: j.state.next_run_at_ms or float('inf'))
     
     def add_job(
@@ -263,9 +648,21 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        overlap: str = "skip",
+        timeout_s: int | None = None,
+        catch_up: str | None = None,
+        kind: str = "agent_turn",
     ) -> CronJob:
-        """Add a new job."""
-        store = self._load_store()
+        """
+        Add a new job.
+        
+        Raises:
+            ValueError: If the schedule is invalid (see validate_schedule) or the payload kind is unknown.
+        """
+        validate_schedule(schedule)
+        if kind not in USER_PAYLOAD_KINDS:
+            raise ValueError(f"unknown payload kind '{kind}' (expected one of {', '.join(USER_PAYLOAD_KINDS)})")
+        self._load_store()
         now = _now_ms()
         
         job = CronJob(
@@ -274,34 +671,80 @@ class CronService:
             enabled=True,
             schedule=schedule,
             payload=CronPayload(
-                kind="agent_turn",
+                kind=kind,
                 message=message,
                 deliver=deliver,
                 channel=channel,
                 to=to,
             ),
-            state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now)),
             created_at_ms=now,
             updated_at_ms=now,
             delete_after_run=delete_after_run,
+            overlap=overlap,
+            timeout_s=timeout_s,
+            catch_up=catch_up,
         )
+        job.state.next_run_at_ms = _next_fire(job, now)
         
-        store.jobs.append(job)
-        self._save_store()
+        self._put(job)
         self._arm_timer()
         
         logger.info(f"Cron: added job '{name}' ({job.id})")
         return job
     
+    def ensure_system_job(self, name: str, schedule: CronSchedule, event: str) -> CronJob:
+        """
+        Create or update a built-in job that fires a system event.
+        
+        Jobs are matched by name, so calling this on every startup is idempotent.
+        """
+        existing = self._find_system_job(name)
+        if existing:
+            job = existing
+            if job.schedule != schedule or job.payload.message != event:
+                job.schedule = schedule
+                job.payload.message = event
+                job.updated_at_ms = _now_ms()
+                if job.enabled:
+                    job.state.next_run_at_ms = _next_fire(job, _now_ms())
+                self._put(job)
+                self._arm_timer()
+            return job
+        
+        now = _now_ms()
+        job = CronJob(
+            id=str(uuid.uuid4())[:8],
+            name=name,
+            schedule=schedule,
+            payload=CronPayload(kind="system_event", message=event),
+            created_at_ms=now,
+            updated_at_ms=now,
+        )
+        job.state.next_run_at_ms = _next_fire(job, now)
+        self._put(job)
+        self._arm_timer()
+        logger.info(f"Cron: added system job '{name}' ({job.id})")
+        return job
+    
+    def _find_system_job(self, name: str) -> CronJob | None:
+        store = self._load_store()
+        return next((j for j in store.jobs.values() if j.name == name and j.payload.kind == "system_event"), None)
+    
+    def remove_system_job(self, name: str) -> bool:
+        """Remove a built-in system-event job by name."""
+        job = self._find_system_job(name)
+        return self.remove_job(job.id) if job else False
+    
+    def get_job(self, job_id: str) -> CronJob | None:
+        """Look up a job by ID."""
+        return self._load_store().jobs.get(job_id)
+    
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        self._load_store()
+        removed = self._delete(job_id)
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info(f"Cron: removed job {job_id}")
         
@@ -309,32 +752,27 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        job = self.get_job(job_id)
+        if not job:
+            return None
+        job.enabled = enabled
+        job.updated_at_ms = _now_ms()
+        if enabled:
+            job.state.next_run_at_ms = _next_fire(job, _now_ms())
+        else:
+            job.state.next_run_at_ms = None
+        self._put(job)
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        job = self.get_job(job_id)
+        if not job or (not force and not job.enabled):
+            return False
+        await self._execute_job(job)
+        self._arm_timer()
+        return True
     
     def status(self) -> dict:
         """Get service status."""
@@ -342,5 +780,6 @@ class CronService:
         return {
             "enabled": self._running,
             "jobs": len(store.jobs),
+            "running": sum(self._active.values()),
             "next_wake_at_ms": self._get_next_wake_ms(),
         }
@@ -14,14 +14,20 @@ class CronSchedule:
     every_ms: int | None = None
     # For "cron": cron expression (e.g. "0 9 * * *")
     expr: str | None = None
-    # Timezone for cron expressions
+    # IANA time zone for cron expressions (e.g. "Europe/Berlin"); None = local time
     tz: str | None = None
+    # Spread runs over this window after the scheduled time; each job gets a
+    # fixed offset within it, so jobs sharing a round time don't fire together
+    jitter_ms: int | None = None
 
 
 @dataclass
 class CronPayload:
     """What to do when the job runs."""
-    kind: Literal["system_event", "agent_turn"] = "agent_turn"
+    # "agent_turn" asks the agent; "message", "shell" and "fetch" run without
+    # an LLM call (see nanobot.cron.actions); "system_event" is built in
+    kind: Literal["system_event", "agent_turn", "message", "shell", "fetch"] = "agent_turn"
+    # Prompt, message template, shell command or URL, depending on kind
     message: str = ""
     # Deliver response to channel
     deliver: bool = False
@@ -36,6 +42,10 @@ class CronJobState:
     last_run_at_ms: int | None = None
     last_status: Literal["ok", "error", "skipped"] | None = None
     last_error: str | None = None
+    # Timing of the last run: when it was due, how late it started, how long it took
+    last_scheduled_at_ms: int | None = None
+    last_lateness_ms: int | None = None
+    last_duration_ms: int | None = None
 
 
 @dataclass
@@ -50,10 +60,16 @@ class CronJob:
     created_at_ms: int = 0
     updated_at_ms: int = 0
     delete_after_run: bool = False
+    # When a run comes due while the previous one is still going: "skip" it,
+    # "queue" it (at most one waits), or run in "parallel"
+    overlap: Literal["skip", "queue", "parallel"] = "skip"
+    timeout_s: int | None = None  # None = the service default
+    # Runs missed while the service was down: fire "once", replay "all", or "skip"
+    catch_up: Literal["once", "all", "skip"] | None = None  # None = the service default
 
 
 @dataclass
 class CronStore:
     """Persistent store for cron jobs."""
     version: int = 1
-    jobs: list[CronJob] = field(default_factory=list)
+    jobs: dict[str, CronJob] = field(default_factory=dict)  # By job id
@@ -31,6 +31,7 @@ class LiteLLMProvider(LLMProvider):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        self.provider_name = provider_name
         
         # Detect gateway / local deployment.
         # provider_name (from config key) is the primary signal;
@@ -49,6 +50,14 @@ class LiteLLMProvider(LLMProvider):
         # Drop unsupported parameters for providers (e.g., gpt-5 rejects some params)
         litellm.drop_params = True
     
+    def __reduce__(self):
+        # Rebuild through __init__ when unpickled (e.g. in a subagent worker
+        # process) so the environment and litellm settings are applied there too
+        return (
+            LiteLLMProvider,
+            (self.api_key, self.api_base, self.default_model, self.extra_headers, self.provider_name),
+        )
+    
     def _setup_env(self, api_key: str, api_base: str | None, model: str) -> None:
         """Set environment variables based on detected provider."""
         spec = self._gateway or find_by_model(model)
@@ -36,28 +36,100 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
     
+    def add_transcript(self, messages: list[dict[str, Any]], max_result_chars: int = 2000) -> None:
+        """
+        Add the intermediate messages of an agent turn (tool calls and results).
+        
+        Tool results longer than max_result_chars are elided deterministically
+        so replaying the history is byte-stable across turns.
+        
+        Args:
+            messages: Assistant tool-call and tool-result messages, in order.
+            max_result_chars: Longest tool result stored verbatim.
+        """
+        for m in messages:
+            if m["role"] == "tool":
+                content = m["content"]
+                if len(content) > max_result_chars:
+                    content = f"{content[:max_result_chars]}\n... [{len(content) - max_result_chars} chars elided]"
+                self.add_message("tool", content, tool_call_id=m["tool_call_id"], name=m["name"])
+            elif m["role"] == "assistant":
+                extra = {k: m[k] for k in ("tool_calls", "reasoning_content") if m.get(k)}
+                self.add_message("assistant", m.get("content") or "", **extra)
+    
+    def trim_tool_history(self, keep_turns: int, high_water: int | None = None) -> None:
+        """
+        Drop tool calls and results from all but the last keep_turns turns.
+        
+        Trimming waits until tool messages span more than high_water turns
+        (default 2 * keep_turns), so the replayed history only changes near its
+        start once in a while instead of on every turn.
+        """
+        first_tool = next((i for i, m in enumerate(self.messages) if _is_tool_message(m)), None)
+        if first_tool is None:
+            return
+        user_idx = [i for i, m in enumerate(self.messages) if m["role"] == "user"]
+        # Turns from the one holding the oldest tool message to the latest
+        spanned = sum(1 for i in user_idx if i > first_tool) + 1
+        if spanned <= (2 * keep_turns if high_water is None else high_water):
+            return
+        cutoff = user_idx[-keep_turns] if keep_turns > 0 else len(self.messages)
+        upto = self.metadata.get("summary_upto", 0)
+        kept = [
+            i for i, m in enumerate(self.messages)
+            if i >= cutoff or not _is_tool_message(m)
+        ]
+        if upto:
+            # Keep the summary boundary pointing at the same message
+            self.metadata["summary_upto"] = sum(1 for i in kept if i < upto)
+        self.messages = [self.messages[i] for i in kept]
+    
     def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
         
         Args:
-            max_messages: Maximum messages to return.
+            max_messages: Maximum messages to return, not counting tool calls
+                and results (which come along with their turn).
         
         Returns:
             List of messages in LLM format.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+        # Get recent messages not yet folded into the summary
+        start, counted = len(self.messages), 0
+        upto = self.metadata.get("summary_upto", 0)
+        while start > upto and counted < max_messages:
+            start -= 1
+            if not _is_tool_message(self.messages[start]):
+                counted += 1
+        recent = self.messages[start:]
         
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        # Start at a user message so no tool result is left without its call
+        start = next((i for i, m in enumerate(recent) if m["role"] == "user"), len(recent))
+        
+        # Convert to LLM format (drop timestamps, keep tool-call fields)
+        history = []
+        for m in recent[start:]:
+            msg = {"role": m["role"], "content": m["content"]}
+            for k in ("tool_calls", "tool_call_id", "name", "reasoning_content"):
+                if k in m:
+                    msg[k] = m[k]
+            history.append(msg)
+        return history
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self.metadata.pop("summary", None)
+        self.metadata.pop("summary_upto", None)
         self.updated_at = datetime.now()
 
 
+def _is_tool_message(m: dict[str, Any]) -> bool:
+    """A tool call (assistant message with tool_calls) or a tool result."""
+    return m["role"] == "tool" or bool(m.get("tool_calls"))
+
+
 class SessionManager:
     """
     Manages conversation sessions.
@@ -0,0 +1,72 @@
+"""Markdown frontmatter parsing (YAML, as used by SKILL.md files)."""
+
+import re
+from typing import Any
+
+import yaml
+
+_FENCE_RE = re.compile(r"^---[ \t]*\r?\n(.*?)^---[ \t]*(?:\r?\n|$)", re.DOTALL | re.M)
+
+
+class FrontmatterError(ValueError):
+    """Malformed frontmatter."""
+
+    def __init__(self, message: str, line: int | None = None):
+        self.line = line
+        super().__init__(f"line {line}: {message}" if line else message)
+
+
+def split_frontmatter(content: str) -> tuple[str | None, str]:
+    """
+    Split a markdown document into its frontmatter and body.
+
+    Returns:
+        (frontmatter text or None if there is none, stripped body)
+    """
+    if not content.startswith("---"):
+        return None, content
+    match = _FENCE_RE.match(content)
+    if not match:
+        return None, content
+    return match.group(1), content[match.end():].strip()
+
+
+def parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
+    """
+    Parse a markdown document's frontmatter.
+
+    Returns:
+        (frontmatter mapping, stripped body)
+
+    Raises:
+        FrontmatterError: If the frontmatter is malformed; line numbers refer to the document.
+    """
+    raw, body = split_frontmatter(content)
+    if raw is None:
+        return {}, body
+    return parse_yaml(raw, first_line=2), body
+
+
+def parse_yaml(text: str, first_line: int = 1) -> dict[str, Any]:
+    """
+    Parse a YAML mapping with yaml.safe_load.
+
+    Raises:
+        FrontmatterError: If the text is not valid YAML or not a mapping; line
+            numbers are counted from first_line.
+    """
+    try:
+        data = yaml.safe_load(text)
+    except yaml.MarkedYAMLError as e:
+        message = f"{e.context}, {e.problem}" if e.context else str(e.problem)
+        mark = e.problem_mark or e.context_mark
+        # Errors at the end of the text are reported on its last line
+        line = min(mark.line, max(0, len(text.splitlines()) - 1)) + first_line if mark else None
+        raise FrontmatterError(message, line) from e
+    except yaml.YAMLError as e:
+        raise FrontmatterError(str(e)) from e
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise FrontmatterError(f"expected a mapping, got {type(data).__name__}", first_line)
+    return data
@@ -1,7 +1,16 @@
 """Utility functions for nanobot."""
 
+import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 def ensure_dir(path: Path) -> Path:
@@ -49,6 +58,40 @@ def get_skills_path(workspace: Path | None = None) -> Path:
     return ensure_dir(ws / "skills")
 
 
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive inter-process lock associated with path.
+    
+    Uses a sidecar ".<name>.lock" file so the target itself can be replaced
+    atomically while locked. No-op where fcntl is unavailable.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = path.with_name(f".{path.name}.lock")
+    with open(lock_path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, content: str, encoding: str = "utf-8") -> None:
+    """Write a file via a temp file and rename, so readers never see partial content."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 def today_date() -> str:
     """Get today's date in YYYY-MM-DD format."""
     return datetime.now().strftime("%Y-%m-%d")
@@ -89,3 +132,22 @@ def parse_session_key(key: str) -> tuple[str, str]:
     if len(parts) != 2:
         raise ValueError(f"Invalid session key: {key}")
     return parts[0], parts[1]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(messages: list[dict]) -> int:
+    """Rough token count of a chat message list, including tool call arguments."""
+    total = 0
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+        elif isinstance(content, list):
+            total += sum(estimate_tokens(p.get("text", "")) for p in content if isinstance(p, dict))
+        for tc in m.get("tool_calls") or []:
+            total += estimate_tokens(tc.get("function", {}).get("arguments", ""))
+    return total
@@ -0,0 +1,156 @@
+"""Small in-process text retrieval: BM25 plus an optional hashing-embedding ranker."""
+
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Hashable, Iterable
+
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_WORD_RE = re.compile(rf"[a-z0-9_\u00c0-\u024f]+|[{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; CJK runs become character unigrams and bigrams."""
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if _CJK_RE.match(word):
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 or word.isdigit():
+            tokens.append(word)
+    return tokens
+
+
+class BM25Index:
+    """
+    Incremental Okapi BM25 index.
+
+    Documents are added and removed by key; scoring only touches the
+    postings of the query terms.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[Hashable, int]] = {}
+        self._terms: dict[Hashable, list[str]] = {}
+        self._lengths: dict[Hashable, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._lengths
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index text under key, replacing any previous document with that key."""
+        if key in self._lengths:
+            self.remove(key)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[key] = tf
+        self._terms[key] = list(counts)
+        self._lengths[key] = len(tokens)
+        self._total_len += len(tokens)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a document; unknown keys are ignored."""
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_len -= length
+        for term in self._terms.pop(key):
+            docs = self._postings[term]
+            del docs[key]
+            if not docs:
+                del self._postings[term]
+
+    def search(self, query: str, k: int = 5) -> list[tuple[Hashable, float]]:
+        """Return up to k (key, score) pairs, best first."""
+        n = len(self._lengths)
+        if not n:
+            return []
+        avg_len = self._total_len / n or 1
+        scores: dict[Hashable, float] = {}
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[key] / avg_len)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+
+class HashingEmbedder:
+    """
+    Dependency-free text embedding via feature hashing.
+
+    Words and character trigrams are hashed into a fixed number of signed
+    buckets and L2-normalized. Captures lexical overlap including partial
+    words and typos; it is not a semantic model.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed(self, text: str) -> list[float]:
+        vec = [0.0] * self.dim
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    @staticmethod
+    def _features(text: str) -> Iterable[str]:
+        for token in tokenize(text):
+            yield token
+            padded = f"#{token}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3]
+
+
+class TextIndex:
+    """
+    BM25 index with an optional embedding ranker fused by reciprocal rank.
+    """
+
+    def __init__(self, embeddings: bool = False, dim: int = 256):
+        self.bm25 = BM25Index()
+        self.embedder = HashingEmbedder(dim) if embeddings else None
+        self._vectors: dict[Hashable, list[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.bm25)
+
+    def add(self, key: Hashable, text: str) -> None:
+        self.bm25.add(key, text)
+        if self.embedder:
+            self._vectors[key] = self.embedder.embed(text)
+
+    def remove(self, key: Hashable) -> None:
+        self.bm25.remove(key)
+        self._vectors.pop(key, None)
+
+    def search(self, query: str, k: int = 5) -> list[tuple[Hashable, float]]:
+        """Return up to k (key, score) pairs, best first."""
+        lexical = self.bm25.search(query, k * 4)
+        if not self.embedder:
+            return lexical[:k]
+        q = self.embedder.embed(query)
+        dense = sorted(
+            ((key, sum(a * b for a, b in zip(q, vec))) for key, vec in self._vectors.items()),
+            key=lambda kv: kv[1], reverse=True,
+        )[:k * 4]
+        # Reciprocal rank fusion; no score calibration between rankers needed
+        fused: dict[Hashable, float] = {}
+        for ranking in (lexical, [kv for kv in dense if kv[1] > 0]):
+            for rank, (key, _) in enumerate(ranking):
+                fused[key] = fused.get(key, 0.0) + 1 / (60 + rank)
+        return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)[:k]
@@ -0,0 +1,52 @@
+from nanobot.agent.compaction import COMPACTED_PREFIX, CompactionStats, TranscriptCompactor
+from nanobot.agent.tools.output import ToolOutputManager
+from nanobot.providers.base import LLMResponse
+
+
+def _transcript(n: int, size: int) -> list[dict]:
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "task"}]
+    for i in range(n):
+        messages.append({"role": "assistant", "content": "", "tool_calls": [
+            {"id": f"c{i}", "type": "function", "function": {"name": "exec", "arguments": "{}"}}
+        ]})
+        messages.append({"role": "tool", "tool_call_id": f"c{i}", "name": "exec", "content": f"{i}:" + "x" * size})
+    return messages
+
+
+async def test_under_budget_untouched() -> None:
+    messages = _transcript(3, 100)
+    compactor = TranscriptCompactor(budget_tokens=10_000)
+    assert await compactor.maybe_compact(messages, 1) == 0
+    assert all(not m["content"].startswith(COMPACTED_PREFIX) for m in messages)
+
+
+async def test_older_results_compacted_recent_kept(tmp_path) -> None:
+    messages = _transcript(6, 4000)
+    store = ToolOutputManager(tmp_path)
+    compactor = TranscriptCompactor(budget_tokens=2000, keep_recent=2, summary_chars=200, store=store)
+
+    stats = CompactionStats()
+    saved = await compactor.maybe_compact(messages, 1, stats)
+
+    tool_msgs = [m for m in messages if m["role"] == "tool"]
+    assert all(m["content"].startswith(COMPACTED_PREFIX) for m in tool_msgs[:4])
+    assert all(m["content"].startswith(("4:", "5:")) for m in tool_msgs[4:])
+    assert saved > 3000 and stats == CompactionStats(compacted=4, tokens_saved=saved)
+    artifact_id = tool_msgs[0]["content"].split("artifact '")[1].split("'")[0]
+    assert store.read(artifact_id).startswith("0:x")
+
+    # Already compacted results are left alone
+    assert await compactor.maybe_compact(messages, 1, stats) == 0
+    assert stats.compacted == 4
+
+
+async def test_model_summary_used_when_configured() -> None:
+    class Provider:
+        async def chat(self, **kwargs) -> LLMResponse:
+            return LLMResponse(content="exit 0, nothing notable")
+
+    messages = _transcript(3, 4000)
+    compactor = TranscriptCompactor(budget_tokens=1000, keep_recent=1, provider=Provider(), model="cheap")
+    await compactor.maybe_compact(messages)
+
+    assert messages[3]["content"].endswith("Summary:]\nexit 0, nothing notable")
@@ -0,0 +1,391 @@
+import asyncio
+import time
+
+from nanobot.config.schema import CronConfig
+from nanobot.cron import service as cron_service
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+
+
+def _at(delay_s: float) -> CronSchedule:
+    return CronSchedule(kind="at", at_ms=int((time.time() + delay_s) * 1000))
+
+
+def test_changes_are_appended_and_replayed(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    cron = CronService(path)
+    keep = cron.add_job("keep", CronSchedule(kind="every", every_ms=60_000), "hi")
+    gone = cron.add_job("gone", CronSchedule(kind="every", every_ms=60_000), "bye")
+    cron.enable_job(keep.id, False)
+    cron.remove_job(gone.id)
+
+    # Nothing but the log has been written
+    assert not path.exists()
+    assert len(cron.log_path.read_text().splitlines()) == 4
+
+    reloaded = CronService(path)
+    (job,) = reloaded.list_jobs(include_disabled=True)
+    assert job.id == keep.id and not job.enabled and job.state.next_run_at_ms is None
+
+
+def test_log_is_compacted_into_snapshot(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cron_service, "LOG_COMPACT_MIN", 3)
+    path = tmp_path / "jobs.json"
+    cron = CronService(path)
+    ids = [cron.add_job(f"job {i}", CronSchedule(kind="every", every_ms=60_000), "x").id for i in range(2)]
+    cron.enable_job(ids[0], False)
+    assert not path.exists()
+    cron.enable_job(ids[0], True)
+
+    assert path.exists() and not cron.log_path.exists()
+    cron.remove_job(ids[1])
+    assert [j.id for j in CronService(path).list_jobs()] == ids[:1]
+
+
+def test_compaction_keeps_changes_from_other_processes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cron_service, "LOG_COMPACT_MIN", 3)
+    path = tmp_path / "jobs.json"
+    gateway = CronService(path)
+    first = gateway.add_job("first", CronSchedule(kind="every", every_ms=60_000), "x")
+    cli = CronService(path)
+    added = cli.add_job("from cli", CronSchedule(kind="every", every_ms=60_000), "x")
+
+    # The gateway's next changes fold the log, including the CLI's entry
+    gateway.enable_job(first.id, False)
+    gateway.enable_job(first.id, True)
+    assert path.exists() and not gateway.log_path.exists()
+    assert gateway.get_job(added.id)
+    assert {j.name for j in CronService(path).list_jobs()} == {"first", "from cli"}
+
+    # And the CLI starts over from the gateway's snapshot
+    cli.remove_job(first.id)
+    assert [j.name for j in CronService(path).list_jobs()] == ["from cli"]
+
+
+def test_heap_finds_earliest_job_and_drops_stale_entries(tmp_path) -> None:
+    cron = CronService(tmp_path / "jobs.json")
+    late = cron.add_job("late", _at(300), "x")
+    early = cron.add_job("early", _at(100), "x")
+    assert cron.status()["next_wake_at_ms"] == early.state.next_run_at_ms
+
+    cron.remove_job(early.id)
+    assert cron.status()["next_wake_at_ms"] == late.state.next_run_at_ms
+    cron.enable_job(late.id, False)
+    assert cron.status()["next_wake_at_ms"] is None
+
+
+async def test_due_jobs_run_in_schedule_order(tmp_path) -> None:
+    ran = []
+
+    async def on_job(job):
+        ran.append(job.name)
+
+    cron = CronService(tmp_path / "jobs.json", on_job=on_job)
+    cron.add_job("second", _at(0.08), "x")
+    cron.add_job("first", _at(0.04), "x", delete_after_run=True)
+    cron.add_job("later", _at(60), "x")
+    await cron.start()
+    await asyncio.sleep(0.3)
+    cron.stop()
+
+    assert ran == ["first", "second"]
+    names = {j.name: j for j in CronService(tmp_path / "jobs.json").list_jobs(include_disabled=True)}
+    assert set(names) == {"second", "later"}
+    assert not names["second"].enabled and names["second"].state.last_status == "ok"
+
+
+class Jobs:
+    """on_job callback whose runs block until released."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, job):
+        self.started.append(job.name)
+        await self.release.wait()
+
+
+def _every(cron: CronService, name: str, **kwargs):
+    return cron.add_job(name, CronSchedule(kind="every", every_ms=60_000), "x", **kwargs)
+
+
+async def test_due_jobs_run_concurrently_up_to_limit(tmp_path) -> None:
+    jobs = Jobs()
+    cron = CronService(tmp_path / "jobs.json", on_job=jobs, config=CronConfig(max_concurrent=2))
+    due = int(time.time() * 1000) - 5000
+    for name in ("a", "b", "c"):
+        _every(cron, name).state.next_run_at_ms = due
+    cron._rebuild_heap()
+
+    await cron._on_timer()
+    await asyncio.sleep(0.01)
+    assert len(jobs.started) == 2 and cron.status()["running"] == 3
+
+    jobs.release.set()
+    await asyncio.sleep(0.01)
+    assert sorted(jobs.started) == ["a", "b", "c"] and cron.status()["running"] == 0
+    for job in cron.list_jobs():
+        assert job.state.last_status == "ok" and job.state.last_scheduled_at_ms == due
+        assert job.state.last_lateness_ms >= 5000 and job.state.next_run_at_ms > due
+
+
+async def test_overlap_policies(tmp_path) -> None:
+    jobs = Jobs()
+    cron = CronService(tmp_path / "jobs.json", on_job=jobs, config=CronConfig(max_concurrent=10))
+    cron._running = True
+    skip, queue, parallel = (_every(cron, p, overlap=p) for p in ("skip", "queue", "parallel"))
+    for job in (skip, queue, parallel):
+        cron._dispatch(job, 1)
+        cron._dispatch(job, 2)
+        cron._dispatch(job, 3)
+    await asyncio.sleep(0.01)
+    assert sorted(jobs.started) == ["parallel", "parallel", "parallel", "queue", "skip"]
+    assert skip.state.last_status == "skipped"
+
+    jobs.release.set()
+    await asyncio.sleep(0.01)
+    # Only the latest queued run waited
+    assert jobs.started.count("queue") == 2 and queue.state.last_scheduled_at_ms == 3
+    assert jobs.started.count("skip") == 1 and skip.state.last_status == "ok"
+
+
+async def test_runs_survive_changes_from_other_processes(tmp_path) -> None:
+    jobs = Jobs()
+    path = tmp_path / "jobs.json"
+    gateway = CronService(path, on_job=jobs)
+    once = gateway.add_job("once", _at(0.02), "x")
+    gateway._running = True
+    await asyncio.sleep(0.03)
+    await gateway._on_timer()
+    await asyncio.sleep(0.01)
+    assert jobs.started == ["once"]
+
+    # While it runs, the CLI adds a job due soon and compacts the store
+    cli = CronService(path)
+    cli.add_job("soon", _at(0.05), "x")
+    cli._save_store()
+    jobs.release.set()
+    await asyncio.sleep(0.2)
+    gateway.stop()
+
+    # The finished run is recorded on the reloaded job, and the new job ran on time
+    assert jobs.started == ["once", "soon"]
+    reloaded = {j.name: j for j in CronService(path).list_jobs(include_disabled=True)}
+    assert reloaded["once"].state.last_status == "ok" and not reloaded["once"].enabled
+    assert gateway.get_job(once.id).state.last_duration_ms is not None
+
+
+async def test_job_timeout(tmp_path) -> None:
+    cron = CronService(tmp_path / "jobs.json", on_job=Jobs())
+    job = _every(cron, "slow", timeout_s=0.01)
+    await cron.run_job(job.id)
+    assert job.state.last_status == "error" and "Timed out" in job.state.last_error
+
+
+def test_cron_schedule_uses_reference_time_and_time_zone() -> None:
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    from nanobot.cron.service import _compute_next_run
+
+    berlin = ZoneInfo("Europe/Berlin")
+    schedule = CronSchedule(kind="cron", expr="0 9 * * *", tz="Europe/Berlin")
+    # The night clocks go forward: 09:00 is still 09:00 local, now UTC+2
+    now = datetime(2025, 3, 29, 12, 0, tzinfo=berlin)
+    first = _compute_next_run(schedule, int(now.timestamp() * 1000))
+    assert datetime.fromtimestamp(first / 1000, berlin) == datetime(2025, 3, 30, 9, 0, tzinfo=berlin)
+    assert datetime.fromtimestamp(first / 1000, ZoneInfo("UTC")).hour == 7
+
+    new_york = CronSchedule(kind="cron", expr="0 9 * * *", tz="America/New_York")
+    # New York is on daylight time too (UTC-4)
+    assert _compute_next_run(new_york, first) - first == 6 * 3600 * 1000
+
+
+def test_invalid_schedules_are_rejected(tmp_path) -> None:
+    import pytest
+
+    cron = CronService(tmp_path / "jobs.json")
+    with pytest.raises(ValueError, match="time zone"):
+        cron.add_job("x", CronSchedule(kind="cron", expr="0 9 * * *", tz="Mars/Olympus"), "x")
+    with pytest.raises(ValueError, match="cron expression"):
+        cron.add_job("x", CronSchedule(kind="cron", expr="61 * * *"), "x")
+    assert cron.list_jobs() == []
+
+
+async def test_catch_up_policies_after_downtime(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    cron = CronService(path)
+    for policy in ("once", "all", "skip"):
+        job = _every(cron, policy, catch_up=policy)
+        job.schedule.every_ms = 1000
+        # Down for 3.5 intervals: four runs were missed
+        job.state.next_run_at_ms = int(time.time() * 1000) - 3500
+        cron._put(job)
+
+    ran = []
+
+    async def on_job(job):
+        ran.append(job.name)
+
+    restarted = CronService(path, on_job=on_job)
+    await restarted.start()
+    await asyncio.sleep(0.1)
+    restarted.stop()
+
+    assert sorted(ran) == ["all"] * 4 + ["once"]
+    now = int(time.time() * 1000)
+    assert all(now < j.state.next_run_at_ms <= now + 1000 for j in restarted.list_jobs())
+
+
+def test_jitter_spreads_jobs_with_the_same_schedule() -> None:
+    from datetime import datetime, timezone
+
+    from nanobot.cron.service import _jitter_offset, _next_fire
+    from nanobot.cron.types import CronJob
+
+    nine = int(datetime(2025, 6, 2, 9, 0, tzinfo=timezone.utc).timestamp() * 1000)
+    schedule = CronSchedule(kind="cron", expr="0 9 * * *", tz="UTC", jitter_ms=600_000)
+    jobs = [CronJob(id=f"job{i}", name="x", schedule=schedule) for i in range(20)]
+
+    fires = [_next_fire(job, nine - 1000) for job in jobs]
+    assert all(nine <= f < nine + 600_000 for f in fires)
+    assert len(set(fires)) == 20
+    # Offsets are stable, and a window still open at now is not skipped
+    job = max(jobs, key=_jitter_offset)
+    assert _next_fire(job, nine + 1000) == _next_fire(job, nine - 1000)
+    assert _next_fire(job, _next_fire(job, nine)) == _next_fire(job, nine) + 86_400_000
+
+
+async def test_start_smoother_spaces_due_jobs(tmp_path) -> None:
+    starts = []
+
+    async def on_job(job):
+        starts.append(time.monotonic())
+
+    cron = CronService(tmp_path / "jobs.json", on_job=on_job, config=CronConfig(max_starts_per_minute=1200))
+    due = int(time.time() * 1000) - 1000
+    for name in ("a", "b", "c"):
+        _every(cron, name).state.next_run_at_ms = due
+    cron._rebuild_heap()
+
+    await cron._on_timer()
+    await asyncio.sleep(0.3)
+    assert len(starts) == 3
+    assert all(later - earlier >= 0.04 for earlier, later in zip(starts, starts[1:]))
+    last = max(cron.list_jobs(), key=lambda j: j.state.last_run_at_ms)
+    assert last.state.last_scheduled_at_ms == due and last.state.last_lateness_ms >= 1090
+
+
+async def test_direct_payloads_run_without_the_agent(tmp_path, monkeypatch) -> None:
+    import json
+    from datetime import datetime
+
+    import pytest
+
+    from nanobot.agent.tools.web import WebFetchTool
+    from nanobot.cron.actions import CronActions, render_template
+    from nanobot.cron.types import CronJob, CronPayload
+
+    actions = CronActions(tmp_path, tmp_path / "fetch")
+
+    def job(kind: str, message: str) -> CronJob:
+        return CronJob(id=f"j-{kind}", name="standup", payload=CronPayload(kind=kind, message=message))
+
+    reminder = job("message", "{weekday}: {job} at {time} {unknown}")
+    assert render_template(reminder.payload.message, reminder, datetime(2025, 6, 2, 9, 30)) == \
+        "Monday: standup at 09:30 {unknown}"
+    assert (await actions.run(reminder)).endswith("{unknown}")
+
+    assert (await actions.run(job("shell", "echo hello"))).strip() == "hello"
+    assert (await actions.run(job("shell", "echo Error: none"))).strip() == "Error: none"
+    with pytest.raises(RuntimeError, match="safety guard"):
+        await actions.run(job("shell", "rm -rf /"))
+    with pytest.raises(RuntimeError, match="Exit code: 1"):
+        await actions.run(job("shell", "false"))
+    with pytest.raises(RuntimeError, match="Exit code: 3"):
+        await actions.run(job("shell", "echo partial; exit 3"))
+
+    pages = iter(["a\nb\nc", "a\nb\nc", "a\nB\nc"])
+
+    async def fake_fetch(self, url, **kwargs):
+        return json.dumps({"url": url, "text": next(pages)})
+
+    monkeypatch.setattr(WebFetchTool, "execute", fake_fetch)
+    watch = job("fetch", "https://example.com/status")
+    assert (await actions.run(watch)).startswith("Watching https://example.com/status")
+    assert await actions.run(watch) is None
+    diff = await actions.run(watch)
+    assert "-b\n+B" in diff
+
+
+async def test_cron_tool_schedules_payload_kinds(tmp_path) -> None:
+    from nanobot.agent.tools.cron import CronTool
+
+    cron = CronService(tmp_path / "jobs.json")
+    tool = CronTool(cron)
+    tool.set_context("telegram", "42")
+
+    assert "Created" in await tool.execute(action="add", message="Stand up!", cron_expr="0 9 * * *", kind="message")
+    (job,) = cron.list_jobs()
+    assert job.payload.kind == "message" and job.payload.to == "42"
+    assert "message)" in await tool.execute(action="list")
+    assert tool.validate_params({"action": "add", "kind": "llm"})
+    # Shell jobs are CLI-only
+    assert tool.validate_params({"action": "add", "kind": "shell"})
+    assert (await tool.execute(action="add", message="ls", every_seconds=60, kind="shell")).startswith("Error")
+    assert len(cron.list_jobs()) == 1
+
+
+async def test_agent_turn_jobs_overlap_and_keep_their_chats(tmp_path, monkeypatch) -> None:
+    from pathlib import Path
+
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    class Provider(LLMProvider):
+        """Sends a message on the first call of each turn; tracks calls in flight."""
+
+        def __init__(self):
+            super().__init__()
+            self.in_flight = self.most_in_flight = 0
+
+        async def chat(self, messages, **kwargs) -> LLMResponse:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+            await asyncio.sleep(0.02)
+            self.in_flight -= 1
+            if messages[-1]["role"] == "tool":
+                return LLMResponse(content="done")
+            return LLMResponse(content="", tool_calls=[ToolCallRequest("c1", "message", {"content": "hi"})])
+
+        def get_default_model(self) -> str:
+            return "test-model"
+
+    provider = Provider()
+    agent = AgentLoop(MessageBus(), provider, tmp_path / "ws")
+    sent = []
+
+    async def send(msg):
+        sent.append(msg)
+
+    agent.tools.get("message").set_send_callback(send)
+
+    async def on_job(job):
+        return await agent.process_direct(job.payload.message, session_key=f"cron:{job.id}",
+                                          channel="telegram", chat_id=job.payload.to)
+
+    cron = CronService(tmp_path / "jobs.json", on_job=on_job)
+    due = int(time.time() * 1000) - 1000
+    for chat in ("a", "b", "c"):
+        _every(cron, chat, deliver=True, channel="telegram", to=chat).state.next_run_at_ms = due
+    cron._rebuild_heap()
+
+    await cron._on_timer()
+    await asyncio.sleep(0.3)
+    assert provider.most_in_flight == 3
+    assert sorted(m.chat_id for m in sent) == ["a", "b", "c"]
+    assert all(j.state.last_status == "ok" for j in cron.list_jobs())
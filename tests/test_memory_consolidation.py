@@ -0,0 +1,70 @@
+from datetime import date
+
+from nanobot.agent.consolidation import CONSOLIDATION_EVENT, MemoryConsolidator, dedupe_lines
+from nanobot.agent.memory import MemoryStore
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+from nanobot.providers.base import LLMResponse
+
+
+def test_dedupe_lines() -> None:
+    text = "# Facts\n\n- Likes tea.\n* likes TEA\n- Lives in Oslo\n\n# Other\n\n- lives in oslo\n"
+    result, removed = dedupe_lines(text)
+    assert removed == 2
+    assert result == "# Facts\n\n- Likes tea.\n- Lives in Oslo\n\n# Other\n"
+
+
+async def test_consolidation_rolls_archives_and_bounds(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    mem = store.memory_dir
+    for day in ("2025-01-06", "2025-01-07", "2025-01-20", "2025-03-01"):
+        (mem / f"{day}.md").write_text(f"# {day}\n\nnote for {day}\n")
+    store.write_long_term("# Core\n\n- name: Ada\n- name: Ada\n" + "".join(f"- fact {i}\n" for i in range(200)))
+
+    report = await MemoryConsolidator(store, budget_tokens=100, keep_days=7, keep_weeks=4).run(date(2025, 3, 3))
+
+    # Daily notes older than a week rolled into weekly digests, then old weeks into a month
+    assert sorted(p.name for p in mem.glob("????-??-??.md")) == ["2025-03-01.md"]
+    assert sorted(p.name for p in (mem / "archive" / "daily").iterdir()) == [
+        "2025-01-06.md", "2025-01-07.md", "2025-01-20.md",
+    ]
+    month = (mem / "digests" / "2025-01.md").read_text()
+    assert "note for 2025-01-06" in month and "note for 2025-01-20" in month
+    assert not list((mem / "digests").glob("*-W*.md"))
+
+    # MEMORY.md deduped and within budget; overflow kept searchable
+    long_term = store.read_long_term()
+    assert long_term.count("name: Ada") == 1
+    assert report.duplicates_removed == 1
+    assert report.tokens_after <= 100 < report.tokens_before
+    assert "fact 199" in (mem / report.overflow_file).read_text()
+    assert "-- name: Ada" in (mem / "reports" / "consolidation-2025-03-03.txt").read_text()
+    assert store.search("fact 199")
+
+
+async def test_edits_made_during_consolidation_are_kept(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term("# Core\n\n" + "".join(f"- fact {i}\n" for i in range(200)))
+
+    class Provider:
+        async def chat(self, messages, **kwargs) -> LLMResponse:
+            # The agent saves a new fact while the model is condensing
+            store.write_long_term(store.read_long_term() + "- new fact\n")
+            return LLMResponse(content="# Core\n\n- facts 0-199")
+
+    await MemoryConsolidator(store, provider=Provider(), model="cheap", budget_tokens=100).run(date(2025, 3, 3))
+
+    assert store.read_long_term() == "# Core\n\n- facts 0-199\n- new fact\n"
+
+
+def test_system_job_is_idempotent(tmp_path) -> None:
+    cron = CronService(tmp_path / "jobs.json")
+    schedule = CronSchedule(kind="cron", expr="0 3 * * *")
+
+    job = cron.ensure_system_job("memory consolidation", schedule, CONSOLIDATION_EVENT)
+    again = cron.ensure_system_job("memory consolidation", schedule, CONSOLIDATION_EVENT)
+    assert again.id == job.id and job.payload.kind == "system_event"
+    assert len(CronService(tmp_path / "jobs.json").list_jobs()) == 1
+
+    assert cron.remove_system_job("memory consolidation")
+    assert cron.list_jobs() == []
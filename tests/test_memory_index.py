@@ -0,0 +1,94 @@
+import os
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.memory_index import chunk_markdown
+from nanobot.agent.tools.memory import MemorySearchTool
+from nanobot.config.schema import MemoryConfig
+from nanobot.utils.textindex import BM25Index, TextIndex
+
+
+def test_bm25_ranks_and_removes() -> None:
+    index = BM25Index()
+    index.add("a", "the user prefers dark roast coffee")
+    index.add("b", "meeting with the dentist on friday")
+    index.add("c", "coffee grinder broke, ordered a new coffee grinder")
+
+    assert [k for k, _ in index.search("coffee grinder")] == ["c", "a"]
+    index.remove("c")
+    assert [k for k, _ in index.search("coffee grinder")] == ["a"]
+    assert index.search("nothing matches") == []
+
+
+def test_embeddings_match_partial_words() -> None:
+    index = TextIndex(embeddings=True)
+    index.add(1, "vacation planning for Portugal")
+    index.add(2, "tax documents")
+    assert index.search("vacations portuguese")[0][0] == 1
+
+
+def test_chunk_markdown_splits_sections_and_paragraphs() -> None:
+    text = "# Day\n\nintro\n\n## Work\n\n" + "\n\n".join(["p" * 50] * 4) + "\n\n## Home\n\nfed cat"
+    chunks = chunk_markdown(text, max_chars=120)
+    assert chunks[0] == ("Day", "# Day\n\nintro")
+    assert [h for h, _ in chunks].count("Work") == 2
+    assert chunks[-1] == ("Home", "## Home\n\nfed cat")
+
+
+async def test_index_updates_incrementally(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    note = store.memory_dir / "2025-01-01.md"
+    note.write_text("# 2025-01-01\n\nBooked flights to Lisbon.")
+    store.write_long_term("User's name is Ada.")
+    tool = MemorySearchTool(store)
+
+    assert "Lisbon" in await tool.execute("lisbon flights")
+    assert store.index.refresh() == 0
+
+    note.write_text("# 2025-01-01\n\nBooked flights to Porto.")
+    os.utime(note, (1, 1))
+    assert store.index.refresh() == 1
+    assert "Porto" in await tool.execute("flights")
+    assert [c.path.name for c in store.search("ada", include_long_term=False)] == []
+
+    note.unlink()
+    assert "No memories found" in await tool.execute("porto")
+
+
+def test_retrieval_puts_relevant_notes_in_user_message(tmp_path) -> None:
+    ctx = ContextBuilder(tmp_path, memory_config=MemoryConfig(retrieval=True, top_k=1))
+    ctx.memory.write_long_term("User's name is Ada.")
+    ctx.memory.append_today("Dentist appointment moved to Friday.")
+    (ctx.memory.memory_dir / "2024-12-01.md").write_text("Bought a bike.")
+
+    messages = ctx.build_messages([], "when is the dentist?")
+
+    assert "Ada" in messages[0]["content"]
+    assert "Dentist" not in messages[0]["content"]
+    assert "Dentist appointment" in messages[-1]["content"]
+    assert "bike" not in messages[-1]["content"]
+    assert messages[-1]["content"].endswith("when is the dentist?")
+
+
+def test_append_today_concurrent_writers(tmp_path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = MemoryStore(tmp_path)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: MemoryStore(tmp_path).append_today(f"note {i}"), range(100)))
+
+    lines = store.read_today().splitlines()
+    assert lines[0].startswith("# ")
+    assert sorted(lines[2:]) == sorted(f"note {i}" for i in range(100))
+
+
+def test_read_today_cache_invalidated_by_append(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_today("first")
+    assert store.read_today().endswith("first")
+    store.append_today("second")
+    assert store.read_today().endswith("first\nsecond")
+
+    store.write_long_term("facts")
+    assert store.read_long_term() == "facts"
+    assert [p.name for p in store.memory_dir.iterdir() if p.name.endswith(".tmp")] == []
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import HistoryConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.session.manager import Session
+
+
+class ScriptedProvider(LLMProvider):
+    """Returns queued responses and records the messages it was sent."""
+
+    def __init__(self, responses: list[LLMResponse]):
+        super().__init__()
+        self.responses = responses
+        self.calls: list[list[dict]] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.calls.append([dict(m) for m in messages])
+        return self.responses.pop(0)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def test_history_starts_at_user_message() -> None:
+    session = Session(key="t:1")
+    session.add_message("user", "q1")
+    session.add_message("assistant", "", tool_calls=[{"id": "c1", "type": "function",
+                                                      "function": {"name": "exec", "arguments": "{}"}}])
+    session.add_message("tool", "out", tool_call_id="c1", name="exec")
+    session.add_message("assistant", "a1")
+    session.add_message("user", "q2")
+    session.add_message("assistant", "a2")
+
+    history = session.get_history(max_messages=3)
+
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    # Tool calls and results don't count toward the window
+    assert len(session.get_history(max_messages=4)) == 6
+    assert "timestamp" not in history[0]
+    assert session.get_history()[2] == {"role": "tool", "content": "out", "tool_call_id": "c1", "name": "exec"}
+
+
+def test_trim_tool_history_keeps_recent_turns() -> None:
+    session = Session(key="t:1")
+    for i in range(3):
+        session.add_message("user", f"q{i}")
+        session.add_transcript([
+            {"role": "assistant", "content": "", "tool_calls": [{"id": f"c{i}"}]},
+            {"role": "tool", "tool_call_id": f"c{i}", "name": "exec", "content": "y" * 50},
+        ], max_result_chars=10)
+        session.add_message("assistant", f"a{i}")
+
+    # Tool messages span three turns: within the high-water mark of 2 * 2
+    before = list(session.messages)
+    session.trim_tool_history(2)
+    assert session.messages == before
+
+    session.trim_tool_history(1)
+
+    assert [m["role"] for m in session.messages] == [
+        "user", "assistant", "user", "assistant", "user", "assistant", "tool", "assistant",
+    ]
+    assert session.messages[-2]["content"] == "y" * 10 + "\n... [40 chars elided]"
+
+
+async def test_tool_transcript_replayed_verbatim(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    (tmp_path / "ws").mkdir()
+    (tmp_path / "ws" / "notes.txt").write_text("hello")
+    provider = ScriptedProvider([
+        LLMResponse(content="", tool_calls=[ToolCallRequest("c1", "read_file", {"path": str(tmp_path / "ws" / "notes.txt")})],
+                    reasoning_content="need the file"),
+        LLMResponse(content="It says hello."),
+        LLMResponse(content="Yes."),
+    ])
+    agent = AgentLoop(MessageBus(), provider, tmp_path / "ws",
+                      history_config=HistoryConfig(persist_tool_calls=True))
+
+    await agent.process_direct("What is in notes.txt?")
+    await agent.process_direct("Sure?")
+
+    first_turn = provider.calls[1][1:]
+    replayed = provider.calls[2][1:]
+    assert replayed[:3] == first_turn[:3]  # user, assistant tool call, tool result
+    assert replayed[1]["reasoning_content"] == "need the file"
+    assert replayed[3] == {"role": "assistant", "content": "It says hello."}
+
+
+async def test_summarizer_folds_old_messages() -> None:
+    from nanobot.agent.summarizer import SessionSummarizer
+
+    session = Session(key="t:1")
+    for i in range(10):
+        session.add_message("user", f"question {i} " + "x" * 400)
+        session.add_message("assistant", f"answer {i}")
+    provider = ScriptedProvider([LLMResponse(content="- user asked ten questions")])
+    saved: list[Session] = []
+    summarizer = SessionSummarizer(provider, "m", trigger_tokens=500, keep_messages=4, on_update=saved.append)
+
+    task = summarizer.maybe_schedule(session)
+    assert task is not None and summarizer.maybe_schedule(session) is None  # one at a time
+    assert await task
+
+    assert session.metadata["summary"] == "- user asked ten questions"
+    assert session.metadata["summary_upto"] == 16
+    assert "question 0" in provider.calls[0][1]["content"]
+    assert [m["content"][:10] for m in session.get_history()] == ["question 8", "answer 8", "question 9", "answer 9"]
+    assert saved == [session]
+
+    # The boundary follows its message when older tool messages are trimmed
+    session.messages.insert(1, {"role": "tool", "content": "t", "tool_call_id": "c", "name": "exec"})
+    session.metadata["summary_upto"] = 17
+    session.trim_tool_history(1)
+    assert session.messages[session.metadata["summary_upto"]]["content"].startswith("question 8")
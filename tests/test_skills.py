@@ -0,0 +1,162 @@
+import os
+
+from nanobot.agent import skills as skills_mod
+from nanobot.agent.skills import SkillsLoader
+
+SKILL = """---
+name: {name}
+description: {desc}
+metadata: {{"nanobot":{{"requires":{{"bins":["{bin}"]}}}}}}
+---
+
+# {name}
+
+Body of {name}.
+"""
+
+
+def _write(root, name, desc="does things", bin="sh"):
+    d = root / name
+    d.mkdir(parents=True, exist_ok=True)
+    (d / "SKILL.md").write_text(SKILL.format(name=name, desc=desc, bin=bin))
+    return d / "SKILL.md"
+
+
+def test_index_parses_once_and_tracks_changes(tmp_path, monkeypatch) -> None:
+    builtin = tmp_path / "builtin"
+    _write(builtin, "alpha")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+
+    parses = []
+    real_parse = loader._parse
+    monkeypatch.setattr(loader, "_parse", lambda *a: parses.append(a[0]) or real_parse(*a))
+
+    loader.build_skills_summary()
+    loader.get_always_skills()
+    loader.load_skills_for_context(["alpha"])
+    assert parses == ["alpha"]
+
+    # In-place edit re-parses just that skill
+    path = _write(builtin, "alpha", desc="changed")
+    os.utime(path, ns=(1, 1))
+    assert "<description>changed</description>" in loader.build_skills_summary()
+
+    # A workspace skill shadows the built-in one
+    _write(tmp_path / "ws" / "skills", "alpha", desc="mine")
+    assert loader.get_skill_metadata("alpha")["description"] == "mine"
+    assert loader.list_skills()[0]["source"] == "workspace"
+
+
+def test_requirement_checks_cached_and_summary_reused(tmp_path, monkeypatch) -> None:
+    builtin = tmp_path / "builtin"
+    _write(builtin, "gh", bin="gh")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+    calls = []
+    monkeypatch.setattr(skills_mod.shutil, "which", lambda b: calls.append(b) or None)
+
+    first = loader.build_skills_summary()
+    assert loader.build_skills_summary() is first
+    assert "<requires>CLI: gh</requires>" in first
+    assert calls == ["gh"]
+
+    monkeypatch.setattr(skills_mod, "REQUIREMENTS_TTL", 0.0)
+    monkeypatch.setattr(skills_mod.shutil, "which", lambda b: "/usr/bin/gh")
+    assert 'available="true"' in loader.build_skills_summary()
+
+
+def test_router_lists_top_k_and_preloads_best_match(tmp_path) -> None:
+    from nanobot.agent.context import ContextBuilder
+    from nanobot.config.schema import SkillsConfig
+
+    ws = tmp_path / "ws"
+    _write(ws / "skills", "weather", desc="Get current weather and forecasts")
+    _write(ws / "skills", "github", desc="Interact with GitHub issues and pull requests")
+    _write(ws / "skills", "tmux", desc="Remote-control tmux sessions")
+    ctx = ContextBuilder(ws, skills_config=SkillsConfig(routing=True, top_k=2, preload=1, min_score=0.5))
+    ctx.skills.builtin_skills = None
+
+    messages = ctx.build_messages([], "what's the weather forecast for tomorrow?")
+
+    system, user = messages[0]["content"], messages[-1]["content"]
+    assert "- tmux: " in system and "<skills>" not in system
+    assert "<name>weather</name>" in user and "<name>tmux</name>" not in user
+    assert "### Skill: weather (already loaded" in user and "Body of weather." in user
+
+    router = ctx.skill_router
+    router.note_file_read(str(ws / "skills" / "weather" / "SKILL.md"))
+    stats = router.stats()
+    assert stats["preloaded"] == 1 and stats["skill_reads_avoidable"] == 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_frontmatter_parser_handles_nested_yaml_and_json() -> None:
+    from nanobot.utils.frontmatter import parse_frontmatter
+
+    data, body = parse_frontmatter("""---
+name: deploy  # trailing comment
+description: "Ship it: build, test, release"
+allowed-tools: exec read_file
+metadata:
+  nanobot:
+    always: true
+    os: [linux, darwin]
+    requires:
+      bins:
+        - docker
+      env: [REGISTRY_TOKEN]
+    install:
+      - kind: brew
+        formula: docker
+        label: Install Docker (brew)
+notes: |
+  line one
+  line two
+extra: {"a": [1, 2.5, null]}
+---
+
+# Deploy
+""")
+    assert body == "# Deploy"
+    assert data["description"] == "Ship it: build, test, release"
+    assert data["metadata"]["nanobot"]["requires"] == {"bins": ["docker"], "env": ["REGISTRY_TOKEN"]}
+    assert data["metadata"]["nanobot"]["install"][0]["formula"] == "docker"
+    assert data["notes"] == "line one\nline two\n"
+    assert data["extra"] == {"a": [1, 2.5, None]}
+
+
+def test_skill_meta_is_typed_and_validated_once(tmp_path, monkeypatch) -> None:
+    from nanobot.utils.frontmatter import FrontmatterError, parse_yaml
+
+    ws = tmp_path / "ws" / "skills"
+    (ws / "nested").mkdir(parents=True)
+    (ws / "nested" / "SKILL.md").write_text(
+        "---\nname: nested\ndescription: nested meta\nallowed-tools: exec, read_file\n"
+        "metadata:\n  nanobot:\n    always: true\n    os: [plan9]\n    requires:\n      bins: [sh]\n---\n\nBody\n"
+    )
+    (ws / "broken").mkdir()
+    (ws / "broken" / "SKILL.md").write_text("---\nname: broken\nmetadata: {\"nanobot\": [1,\n---\nBody\n")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=None)
+
+    meta = loader.get_entry("nested").meta
+    assert meta.always and meta.requires_bins == ["sh"] and meta.tools == ["exec", "read_file"]
+    assert meta.errors == ["metadata.nanobot.os: unknown OS 'plan9' (expected darwin, linux, win32)"]
+    # The OS requirement is enforced like bins and env
+    assert not loader.is_available(loader.get_entry("nested"))
+    assert "OS: plan9" in loader.missing_requirements(loader.get_entry("nested"))
+    assert loader.get_always_skills() == []
+
+    broken = loader.get_entry("broken")
+    assert broken.body == "Body" and broken.meta.errors[0].startswith("frontmatter: line 3")
+
+    try:
+        parse_yaml("a: 1\n  b: 2")
+    except FrontmatterError as e:
+        assert e.line == 2
+    else:
+        raise AssertionError("expected FrontmatterError")
+    try:
+        parse_yaml("- a\n- b")
+    except FrontmatterError as e:
+        assert "expected a mapping" in str(e)
+    else:
+        raise AssertionError("expected FrontmatterError")
@@ -0,0 +1,296 @@
+import asyncio
+
+from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.tools.spawn import SubagentsTool
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import SubagentConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class GatedProvider(LLMProvider):
+    """Blocks every call until released; then replies with a tool call or text."""
+
+    def __init__(self, tool_calls: bool = False, usage: int = 0):
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.tool_calls = tool_calls
+        self.usage = usage
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.calls += 1
+        await self.gate.wait()
+        calls = [ToolCallRequest(f"c{self.calls}", "list_dir", {"path": "."})] if self.tool_calls else []
+        return LLMResponse(content=f"step {self.calls}", tool_calls=calls, usage={"total_tokens": self.usage})
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _manager(tmp_path, provider, **limits) -> SubagentManager:
+    return SubagentManager(provider, tmp_path, MessageBus(), subagent_config=SubagentConfig(**limits))
+
+
+async def test_concurrency_cap_queue_and_session_limit(tmp_path) -> None:
+    provider = GatedProvider()
+    manager = _manager(tmp_path, provider, max_concurrent=2, max_pending=1, max_per_session=2)
+
+    assert "started" in await manager.spawn("a", origin_chat_id="1")
+    assert "started" in await manager.spawn("b", origin_chat_id="2")
+    assert "queued" in await manager.spawn("c", origin_chat_id="3")
+    assert "queue is full" in await manager.spawn("d", origin_chat_id="4")
+    await asyncio.sleep(0.01)
+    assert manager.get_running_count() == 2 and provider.calls == 2
+
+    # Finishing a task starts the queued one
+    provider.gate.set()
+    await asyncio.sleep(0.05)
+    assert [t.status for t in manager.list_tasks()] == ["ok", "ok", "ok"]
+    assert manager.bus.inbound_size == 3
+
+
+async def test_per_session_limit(tmp_path) -> None:
+    manager = _manager(tmp_path, GatedProvider(), max_per_session=1)
+    await manager.spawn("a", origin_chat_id="1")
+    assert (await manager.spawn("b", origin_chat_id="1")).startswith("Error")
+    assert "started" in await manager.spawn("c", origin_chat_id="2")
+
+
+async def test_cancel_and_list_through_tool(tmp_path) -> None:
+    manager = _manager(tmp_path, GatedProvider(), max_concurrent=1)
+    await manager.spawn("first", label="first")
+    await manager.spawn("second", label="second")
+    await manager.spawn("elsewhere", origin_chat_id="other")
+    await asyncio.sleep(0.01)
+    tool = SubagentsTool(manager)
+    tool.set_context("cli", "direct")
+
+    listing = await tool.execute(action="list")
+    assert "first: running" in listing and "second: queued" in listing and "elsewhere" not in listing
+
+    running, queued, other = manager.list_tasks()
+    assert (await tool.execute(action="cancel", task_id=other.id)).startswith("Error")
+    assert "Cancelled" in await tool.execute(action="cancel", task_id=queued.id)
+    assert "Cancelled" in await tool.execute(action="cancel", task_id=running.id)
+    await asyncio.sleep(0.01)
+
+    assert running.status == queued.status == "cancelled"
+    # The cancelled slot went to the next queued task
+    assert other.status == "running"
+    assert manager.bus.inbound_size == 0
+
+
+async def test_token_budget_and_timeout(tmp_path) -> None:
+    provider = GatedProvider(tool_calls=True, usage=600)
+    provider.gate.set()
+    manager = _manager(tmp_path, provider, max_tokens=1000)
+    await manager.spawn("loop forever")
+    await asyncio.sleep(0.05)
+    (record,) = manager.list_tasks()
+    assert record.status == "budget" and record.iterations == 2 and record.tokens == 1200
+    announce = await manager.bus.consume_inbound()
+    assert "stopped at its token budget" in announce.content
+
+    slow = _manager(tmp_path, GatedProvider())
+    slow.config.timeout = 0.01
+    await slow.spawn("never answers")
+    await asyncio.sleep(0.05)
+    assert slow.list_tasks()[0].status == "timeout"
+
+
+class ScriptProvider(LLMProvider):
+    """Picklable provider for worker-process tests: one tool call, then an answer."""
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        if messages[-1]["role"] == "tool":
+            return LLMResponse(content=f"saw {len(messages)} messages", usage={"total_tokens": 10})
+        if "hang" in messages[-1]["content"]:
+            while True:
+                pass
+        return LLMResponse(content="", tool_calls=[ToolCallRequest("c1", "list_dir", {"path": "."})],
+                           usage={"total_tokens": 5})
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_process_mode_runs_in_worker(tmp_path) -> None:
+    manager = _manager(tmp_path, ScriptProvider(), mode="process", timeout=60)
+    await manager.spawn("list the workspace")
+    announce = await asyncio.wait_for(manager.bus.consume_inbound(), 60)
+
+    (record,) = manager.list_tasks()
+    assert record.status == "ok" and record.result == "saw 4 messages"
+    assert record.iterations == 2 and record.tokens == 15
+    assert "completed successfully" in announce.content
+
+
+async def test_process_mode_cpu_limit_and_cancel(tmp_path) -> None:
+    manager = _manager(tmp_path, ScriptProvider(), mode="process", worker_cpu_seconds=1, timeout=60)
+    await manager.spawn("hang")
+    await asyncio.wait_for(manager.bus.consume_inbound(), 60)
+    (record,) = manager.list_tasks()
+    assert record.status == "error" and "CPU-time limit" in record.result
+
+    manager.config.worker_cpu_seconds = 0
+    await manager.spawn("hang again")
+    await asyncio.sleep(0.5)
+    running = manager.list_tasks()[-1]
+    manager.cancel(running.id)
+    await asyncio.sleep(0.2)
+    assert running.status == "cancelled" and manager.get_running_count() == 0
+
+
+async def test_progress_updates_are_throttled(tmp_path) -> None:
+    import time
+    from nanobot.agent.subagent import SubagentTask
+
+    manager = _manager(tmp_path, GatedProvider(), progress_interval=30)
+    record = SubagentTask("t1", "task", "research", {"channel": "telegram", "chat_id": "42"},
+                          status="running", started_at=time.time() - 5, iterations=2, current_tool="web_fetch")
+    manager._publish_progress(record)
+    assert manager.bus.outbound_size == 0
+
+    record.started_at -= 60
+    manager._publish_progress(record)
+    manager._publish_progress(record)
+    assert manager.bus.outbound_size == 1
+    update = await manager.bus.consume_outbound()
+    assert (update.channel, update.chat_id) == ("telegram", "42")
+    assert "step 2, running web_fetch" in update.content
+    assert update.metadata["subagent_progress"]["tool"] == "web_fetch"
+
+
+async def test_direct_delivery_skips_main_agent_llm_call(tmp_path, monkeypatch) -> None:
+    from pathlib import Path
+    from nanobot.agent.loop import AgentLoop
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    provider = GatedProvider()
+    provider.gate.set()
+    bus = MessageBus()
+    agent = AgentLoop(bus, provider, tmp_path, subagent_config=SubagentConfig(delivery="direct"))
+    await agent.subagents.spawn("look something up", label="lookup", origin_channel="telegram", origin_chat_id="42")
+    announce = await asyncio.wait_for(bus.consume_inbound(), 5)
+    calls = provider.calls
+
+    reply = await agent._process_message(announce)
+
+    assert provider.calls == calls
+    assert (reply.channel, reply.chat_id) == ("telegram", "42")
+    assert reply.content.startswith("✅ lookup completed successfully") and "step 1" in reply.content
+    history = agent.sessions.get_or_create("telegram:42").messages
+    assert history[-1]["content"] == reply.content
+
+
+class TaskEchoProvider(LLMProvider):
+    """Answers each subagent with its task text; tasks mentioning 'slow' never finish."""
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        task = messages[-1]["content"]
+        if "slow" in task:
+            await asyncio.Event().wait()
+        return LLMResponse(content=f"found: {task}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_group_results_announced_once(tmp_path) -> None:
+    manager = _manager(tmp_path, TaskEchoProvider(), max_per_session=5)
+    reply = await manager.spawn_group([{"task": "angle A", "label": "A"}, {"task": "angle B", "label": "B"}])
+    assert "group" in reply
+
+    announce = await asyncio.wait_for(manager.bus.consume_inbound(), 5)
+    await asyncio.sleep(0.01)
+    assert manager.bus.inbound_size == 0
+    assert "2/2 tasks completed" in announce.content
+    assert "found: angle A" in announce.content and "found: angle B" in announce.content
+    assert "found: angle B" in announce.metadata["subagent"]["text"]
+
+
+async def test_group_first_k_cancels_the_rest(tmp_path) -> None:
+    manager = _manager(tmp_path, TaskEchoProvider(), max_per_session=5)
+    await manager.spawn_group(
+        [{"task": "fast one"}, {"task": "slow one"}, {"task": "fast two"}], wait_for=2,
+    )
+    announce = await asyncio.wait_for(manager.bus.consume_inbound(), 5)
+
+    # The announce waits for cancelled members to stop, so it shows their final state
+    assert [t.status for t in manager.list_tasks()] == ["ok", "cancelled", "ok"]
+    assert "2/3 tasks completed" in announce.content
+    assert "(was cancelled before finishing)\nTask: slow one\n\nResult:\n(no result)" in announce.content
+    await asyncio.sleep(0.01)
+    assert manager.get_running_count() == 0
+
+
+async def test_group_join_timeout_reports_partial_results(tmp_path) -> None:
+    manager = _manager(tmp_path, TaskEchoProvider(), max_per_session=5)
+    await manager.spawn_group([{"task": "fast"}, {"task": "slow"}], timeout=1)
+    announce = await asyncio.wait_for(manager.bus.consume_inbound(), 5)
+
+    assert "1/2 tasks completed, join timed out" in announce.content
+    assert announce.metadata["subagent"]["status"] == "partial"
+    assert "found: fast" in announce.content
+
+
+async def test_group_respects_session_limit(tmp_path) -> None:
+    manager = _manager(tmp_path, TaskEchoProvider(), max_per_session=2)
+    reply = await manager.spawn_group([{"task": "a"}, {"task": "b"}, {"task": "c"}])
+    assert reply.startswith("Error") and manager.list_tasks() == []
+
+
+async def test_journal_resumes_interrupted_task_from_checkpoint(tmp_path) -> None:
+    from nanobot.agent.task_journal import TaskJournal, write_checkpoint
+
+    journal = TaskJournal(tmp_path / "tasks")
+    first = SubagentManager(GatedProvider(), tmp_path, MessageBus(), journal=journal)
+    await first.spawn("list the workspace", label="ls")
+    await asyncio.sleep(0.01)
+    (record,) = first.list_tasks()
+    assert journal.get(record.id)["status"] == "running"
+
+    # Shutdown cancels the task without finishing its journal entry
+    for task in list(first._running_tasks.values()):
+        task.cancel()
+    await asyncio.sleep(0.01)
+    assert [t["id"] for t in journal.unfinished()] == [record.id]
+    write_checkpoint(journal.checkpoint_path(record.id), 1, 5, [
+        {"role": "user", "content": "list the workspace"},
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": "c1", "type": "function", "function": {"name": "list_dir", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": "c1", "name": "list_dir", "content": "README.md"},
+    ])
+
+    second = SubagentManager(ScriptProvider(), tmp_path, MessageBus(), journal=journal)
+    assert await second.recover() == 1
+    announce = await asyncio.wait_for(second.bus.consume_inbound(), 5)
+
+    assert "completed successfully" in announce.content
+    entry = journal.get(record.id)
+    assert entry["status"] == "ok" and entry["result"] == "saw 4 messages"
+    assert entry["resumes"] == 1 and entry["iterations"] == 2 and entry["tokens"] == 15
+    assert journal.unfinished() == []
+
+
+async def test_journal_fail_policy_reports_interrupted_tasks(tmp_path) -> None:
+    from nanobot.agent.task_journal import TaskJournal
+
+    journal = TaskJournal(tmp_path / "tasks")
+    first = SubagentManager(GatedProvider(), tmp_path, MessageBus(), journal=journal)
+    await first.spawn("research", label="research", origin_channel="telegram", origin_chat_id="42")
+    await first.spawn("other")
+    first.cancel(first.list_tasks()[-1].id)
+    for task in list(first._running_tasks.values()):
+        task.cancel()
+    await asyncio.sleep(0.01)
+
+    second = SubagentManager(GatedProvider(), tmp_path, MessageBus(), journal=journal,
+                             subagent_config=SubagentConfig(recovery="fail"))
+    assert await second.recover() == 1
+    announce = await second.bus.consume_inbound()
+    assert announce.chat_id == "telegram:42" and "'research' failed" in announce.content
+    assert "interrupted by a restart" in announce.content
+    assert journal.unfinished() == [] and second.get_running_count() == 0
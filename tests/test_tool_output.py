@@ -0,0 +1,40 @@
+from nanobot.agent.tools.output import OutputBudget, ReadArtifactTool, ToolOutputManager
+
+
+def test_small_results_pass_through(tmp_path) -> None:
+    manager = ToolOutputManager(tmp_path, max_chars=100)
+    assert manager.process("exec", "ok", OutputBudget()) == "ok"
+    assert not (tmp_path / "artifacts").exists()
+
+
+async def test_large_result_spilled_and_paged(tmp_path) -> None:
+    manager = ToolOutputManager(tmp_path, max_chars=1000, preview_chars=100)
+    big = "".join(f"line {i}\n" for i in range(1000))
+
+    preview = manager.process("exec", big, OutputBudget())
+
+    assert len(preview) < 1000
+    assert preview.count("line 0\n") == 1 and "line 999" in preview
+    artifact_id = preview.split("artifact '")[1].split("'")[0]
+    assert (tmp_path / "artifacts" / f"{artifact_id}.txt").read_text() == big
+
+    tool = ReadArtifactTool(manager)
+    page = await tool.execute(id=artifact_id, offset=7, length=7)
+    assert page.endswith("\n\nline 1\n")
+    assert "More from offset 14" in page
+    assert (await tool.execute(id="../secret")).startswith("Error")
+
+
+def test_per_tool_limit_and_turn_budget(tmp_path) -> None:
+    manager = ToolOutputManager(tmp_path, max_chars=5000, per_tool={"web_fetch": 500},
+                                turn_budget=6000, preview_chars=100)
+    budget = manager.new_budget()
+
+    assert "artifact" in manager.process("web_fetch", "x" * 600, budget)
+    assert manager.process("exec", "y" * 4000, budget) == "y" * 4000
+    # Only ~2000 chars of the turn budget remain
+    assert "artifact" in manager.process("exec", "z" * 3000, budget)
+
+    # Each turn has its own budget
+    assert manager.process("exec", "z" * 3000, manager.new_budget()) == "z" * 3000
+    assert budget.used > 4000
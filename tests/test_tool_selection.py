@@ -0,0 +1,79 @@
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.selector import LoadToolsTool, ToolSelection, ToolSelector
+
+
+def _tool(tool_name: str) -> Tool:
+    class Dummy(Tool):
+        name = tool_name
+        description = f"{tool_name} tool"
+        parameters = {"type": "object", "properties": {}}
+
+        async def execute(self, **kwargs: Any) -> str:
+            return tool_name
+
+    return Dummy()
+
+
+def _registry() -> ToolRegistry:
+    reg = ToolRegistry()
+    for n in ("read_file", "exec", "web_search", "web_fetch", "cron", "spawn", "message"):
+        reg.register(_tool(n))
+    return reg
+
+
+def _offered(selector: ToolSelector, selection: ToolSelection) -> set[str]:
+    return {d["function"]["name"] for d in selector.definitions(selection)}
+
+
+def test_chitchat_gets_core_tools_only() -> None:
+    selector = ToolSelector(_registry())
+    selection = selector.start_turn("hi, how are you?")
+    assert _offered(selector, selection) == {"read_file", "exec"}
+
+
+def test_triggers_match_whole_words() -> None:
+    selector = ToolSelector(_registry())
+    for text in ("my webcam is broken", "fix the pager test", "the sender is wrong", "see you later"):
+        assert _offered(selector, selector.start_turn(text)) == {"read_file", "exec"}, text
+    assert "cron" in _offered(selector, selector.start_turn("Set two reminders"))
+    assert "web_search" in _offered(selector, selector.start_turn("搜索一下"))
+
+
+def test_keywords_urls_channel_and_pins() -> None:
+    selector = ToolSelector(_registry(), channel_tools={"telegram": ["message"]})
+
+    selection = selector.start_turn("Summarize https://example.com/post and remind me tomorrow", channel="telegram")
+    assert {"web_fetch", "cron", "message"} <= _offered(selector, selection)
+
+    selection = selector.start_turn("ok", pinned=["spawn"], recent=["web_search"])
+    assert {"spawn", "web_search"} <= _offered(selector, selection)
+
+
+async def test_load_tools_and_hit_rate() -> None:
+    reg = _registry()
+    selector = ToolSelector(reg)
+    load_tools = LoadToolsTool(selector)
+    reg.register(load_tools)
+
+    first = selector.start_turn("hello")
+    second = selector.start_turn("search the web for cats")
+    load_tools.set_context(first)
+    assert "cron" not in _offered(selector, first)
+    result = await reg.execute("load_tools", {"names": ["cron", "nope"]})
+    assert "Loaded tools: cron" in result and "Unknown tools: nope" in result
+    # Only the turn that asked gets the tool
+    assert "cron" in _offered(selector, first) and "cron" not in _offered(selector, second)
+    selector.end_turn(first)
+
+    second.note_call("web_search")
+    selector.end_turn(second)
+
+    stats = selector.stats()
+    assert stats["turns"] == 2
+    assert stats["hit_rate"] == 0.5
+    # Seven tools offered over both turns (core ones included); only web_search was used
+    assert stats["precision"] == round(1 / 7, 3)
+    assert 0 < stats["payload_reduction"] < 1
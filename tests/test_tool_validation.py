@@ -86,3 +86,31 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_validator_is_compiled_once() -> None:
+    calls = 0
+
+    class CountingTool(SampleTool):
+        @property
+        def parameters(self) -> dict[str, Any]:
+            nonlocal calls
+            calls += 1
+            return super().parameters
+
+    tool = CountingTool()
+    for _ in range(3):
+        assert tool.validate_params({"query": "hi", "count": 2}) == []
+    assert calls == 1
+
+
+def test_registry_caches_definitions_until_changed() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    first = reg.get_definitions()
+    assert reg.get_definitions() is first
+
+    reg.unregister("sample")
+    assert reg.get_definitions() == []
+    reg.register(SampleTool())
+    assert [d["function"]["name"] for d in reg.get_definitions()] == ["sample"]
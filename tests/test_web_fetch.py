@@ -0,0 +1,196 @@
+import json
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import CacheEntry, WebCache, normalize_url
+
+PAGE = "<html><head><title>Doc</title></head><body><article><h2>Intro</h2><p>Hello docs.</p></article></body></html>"
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route WebFetchTool's httpx client through a MockTransport; returns the request log."""
+    requests: list[httpx.Request] = []
+    routes: dict = {}
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return routes[str(request.url)](request)
+
+    monkeypatch.setattr(
+        "nanobot.agent.tools.web.httpx.AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    return routes, requests
+
+
+def test_normalize_url() -> None:
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1#frag") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+async def test_fresh_entry_served_from_cache(tmp_path, serve) -> None:
+    routes, requests = serve
+    routes["https://docs.example.com/page"] = lambda _: httpx.Response(
+        200, text=PAGE, headers={"content-type": "text/html", "cache-control": "max-age=600"}
+    )
+    tool = WebFetchTool(cache=WebCache(tmp_path))
+
+    first = json.loads(await tool.execute("https://docs.example.com/page"))
+    second = json.loads(await tool.execute("https://DOCS.example.com/page#top"))
+
+    assert first["cache"] == "miss"
+    assert second["cache"] == "hit"
+    assert second["text"] == first["text"]
+    assert "Hello docs." in second["text"]
+    assert len(requests) == 1
+
+
+async def test_stale_entry_revalidated_with_etag(tmp_path, serve) -> None:
+    routes, requests = serve
+
+    def page(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "max-age=60"})
+        return httpx.Response(200, text="plain body", headers={"content-type": "text/plain", "etag": '"v1"', "cache-control": "no-cache"})
+
+    routes["https://example.com/a"] = page
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    await tool.execute("https://example.com/a")
+    result = json.loads(await tool.execute("https://example.com/a"))
+
+    assert result["cache"] == "revalidated"
+    assert result["text"] == "plain body"
+    assert len(requests) == 2
+    assert cache.stats()["revalidated"] == 1
+
+
+async def test_no_store_is_not_cached(tmp_path, serve) -> None:
+    routes, requests = serve
+    routes["https://example.com/secret"] = lambda _: httpx.Response(
+        200, text="x", headers={"content-type": "text/plain", "cache-control": "no-store"}
+    )
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    await tool.execute("https://example.com/secret")
+    await tool.execute("https://example.com/secret")
+
+    assert len(requests) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path) -> None:
+    import os
+    import time
+
+    cache = WebCache(tmp_path, max_bytes=2500)
+
+    def entry(url: str) -> CacheEntry:
+        return CacheEntry(url=url, final_url=url, status=200, content_type="text/plain",
+                          body="x" * 800, fetched_at=0, expires_at=time.time() + 60)
+
+    cache.put(entry("https://a.test/"))
+    cache.put(entry("https://b.test/"))
+    # Age "b" so it is the least recently used
+    past = time.time() - 100
+    os.utime(cache._path("https://b.test/"), (past, past))
+    cache.put(entry("https://c.test/"))
+
+    assert cache.get("https://a.test/") is not None
+    assert cache.get("https://b.test/") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_html_to_markdown_single_pass() -> None:
+    from nanobot.agent.tools.html_extract import html_to_text
+
+    text, complete = html_to_text(
+        "<h2>Title &amp; more</h2><p>See <a href='https://x.test/a'>the <b>docs</b></a>.</p>"
+        "<ul><li>one</li><li>two</li></ul><script>var x = 1;</script><p>a<br>b</p>"
+    )
+    assert complete
+    assert text == "## Title & more\n\nSee [the docs](https://x.test/a).\n\n- one\n- two\n\na\nb"
+
+    plain, _ = html_to_text("<h1>T</h1><p><a href='/x'>link</a></p>", markdown=False)
+    assert plain == "T\n\nlink"
+
+
+def test_html_to_text_stops_early() -> None:
+    from nanobot.agent.tools.html_extract import html_to_text
+
+    html = "<p>" + "word " * 100_000 + "</p>" + "<p>tail</p>" * 20_000
+    text, complete = html_to_text(html, max_chars=1000)
+    assert not complete
+    assert "tail" not in text
+
+
+async def test_large_html_extraction_truncated(tmp_path, serve) -> None:
+    routes, _ = serve
+    body = "<html><body><article>" + "<p>Paragraph of text here.</p>" * 5000 + "</article></body></html>"
+    routes["https://example.com/big"] = lambda _: httpx.Response(
+        200, text=body, headers={"content-type": "text/html"}
+    )
+    tool = WebFetchTool(cache=WebCache(tmp_path), max_html_chars=50_000)
+
+    result = json.loads(await tool.execute("https://example.com/big", maxChars=500))
+
+    assert result["extractor"] == "readability"
+    assert result["truncated"] is True
+    assert result["length"] == 500
+
+
+async def test_binary_content_type_rejected_without_reading(tmp_path, serve) -> None:
+    routes, _ = serve
+    routes["https://example.com/file.zip"] = lambda _: httpx.Response(
+        200, content=b"PK\x03\x04" * 1000, headers={"content-type": "application/zip"}
+    )
+    tool = WebFetchTool(cache=WebCache(tmp_path))
+
+    result = json.loads(await tool.execute("https://example.com/file.zip"))
+
+    assert "Unsupported content type" in result["error"]
+    assert result["contentLength"] == 4000
+
+
+async def test_stream_aborts_at_byte_cap(tmp_path, serve) -> None:
+    routes, _ = serve
+    routes["https://example.com/log.txt"] = lambda _: httpx.Response(
+        200, content=b"line\n" * 200_000, headers={"content-type": "text/plain"}
+    )
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    result = json.loads(await tool.execute("https://example.com/log.txt", maxChars=1000))
+
+    assert result["truncated"] is True
+    assert result["bytesRead"] == 4000
+    assert result["bytesSkipped"] == 1_000_000 - 4000
+    assert cache.stats()["entries"] == 0  # partial bodies are not cached
+
+
+async def test_charset_from_meta_tag(tmp_path, serve) -> None:
+    routes, _ = serve
+    page = '<html><head><meta charset="gbk"><title>t</title></head><body><p>中文内容</p></body></html>'
+    routes["https://example.com/zh"] = lambda _: httpx.Response(
+        200, content=page.encode("gbk"), headers={"content-type": "text/html"}
+    )
+    tool = WebFetchTool(cache=WebCache(tmp_path))
+
+    result = json.loads(await tool.execute("https://example.com/zh", extractMode="text"))
+
+    assert "中文内容" in result["text"]
+
+
+def test_extract_pool_follows_worker_setting() -> None:
+    from nanobot.agent.tools.web import _get_extract_pool
+
+    assert _get_extract_pool(3) is _get_extract_pool(3)
+    assert _get_extract_pool(5)._max_workers == 5
+    assert _get_extract_pool(0)._max_workers == 1